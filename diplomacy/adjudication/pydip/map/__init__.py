@@ -19,5 +19,10 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from diplomacy.adjudication.pydip.map.map import Map, OwnershipMap, SupplyCenterMap
+from diplomacy.adjudication.pydip.map.artifact import load_or_build_map, read_map_artifact, shared_map, \
+    write_map_artifact
+from diplomacy.adjudication.pydip.map.compiled_map import CompiledMap
+from diplomacy.adjudication.pydip.map.map import FrozenMap, FrozenSupplyCenterMap, Map, OwnershipMap, SupplyCenterMap, \
+    map_content_hash
+from diplomacy.adjudication.pydip.map.reachability import ReachMap
 from diplomacy.adjudication.pydip.map.territory import CoastTerritory, LandTerritory, SeaTerritory
@@ -0,0 +1,141 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hashlib
+import os
+import pickle
+import tempfile
+from threading import Lock
+
+from diplomacy.adjudication.pydip.map.map import FrozenMap, map_content_hash
+
+# A map artifact is a pickled FrozenMap, stored along with the artifact format version, the map's content
+# hash, a fingerprint of the attributes a FrozenMap and its CompiledMap are built with, and a digest of the
+# pickled map. It is written once, and short-lived processes read it back on startup instead of building the
+# Map. An artifact whose version, schema, digest or hash does not match what the caller expects is rejected,
+# so a stale or damaged file is rebuilt rather than silently used. The schema catches maps pickled before an
+# attribute was added to or removed from either class, even if the version was not bumped along with it.
+
+ARTIFACT_VERSION = 2
+ARTIFACT_SUFFIX = '.pydipmap'
+
+_SHARED_MAPS = dict()
+_SHARED_MAPS_LOCK = Lock()
+_SCHEMA = None
+
+
+def artifact_schema():
+    """ String -- fingerprint of the attributes a FrozenMap and its CompiledMap are pickled with """
+    global _SCHEMA
+    if _SCHEMA is None:
+        game_map = FrozenMap([{'name': 'Schema'}], [])
+        names = ['FrozenMap.' + name for name in game_map.__getstate__()]
+        names.extend('CompiledMap.' + name for name in vars(game_map.compiled))
+        _SCHEMA = hashlib.sha256('\n'.join(sorted(names)).encode('utf-8')).hexdigest()
+    return _SCHEMA
+
+
+def write_map_artifact(game_map, path):
+    """
+    Write game_map to path. The file is written under a temporary name and moved into place, so concurrent
+    readers never see a partial artifact.
+    """
+    assert isinstance(game_map, FrozenMap)
+    map_bytes = pickle.dumps(game_map, protocol=pickle.HIGHEST_PROTOCOL)
+    payload = {
+        'version': ARTIFACT_VERSION,
+        'schema': artifact_schema(),
+        'content_hash': game_map.content_hash,
+        'digest': hashlib.sha256(map_bytes).hexdigest(),
+        'map': map_bytes,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as artifact:
+            pickle.dump(payload, artifact, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def read_map_artifact(path, content_hash=None):
+    """
+    Read the FrozenMap stored at path. Raises ValueError if the artifact was written by another format
+    version or schema, if the pickled map does not match its digest, or if content_hash is given and differs
+    from the stored map's.
+    """
+    with open(path, 'rb') as artifact:
+        payload = pickle.load(artifact)
+
+    if not isinstance(payload, dict) or payload.get('version') != ARTIFACT_VERSION:
+        raise ValueError('{} is not a version {} map artifact'.format(path, ARTIFACT_VERSION))
+    if payload.get('schema') != artifact_schema():
+        raise ValueError('{} was written with another map schema'.format(path))
+    map_bytes = payload.get('map')
+    if not isinstance(map_bytes, bytes) or hashlib.sha256(map_bytes).hexdigest() != payload.get('digest'):
+        raise ValueError('{} is corrupt: its map does not match its digest'.format(path))
+    game_map = pickle.loads(map_bytes)
+    if not isinstance(game_map, FrozenMap) or payload.get('content_hash') != game_map.content_hash:
+        raise ValueError('{} is corrupt: its content hash does not match its map'.format(path))
+    if content_hash is not None and content_hash != game_map.content_hash:
+        raise ValueError('{} holds map {}, expected {}'.format(path, game_map.content_hash, content_hash))
+    return game_map
+
+
+def load_or_build_map(path, territory_descriptors, adjacencies):
+    """
+    Return the map described by territory_descriptors and adjacencies, reading it from the artifact at path
+    when that artifact is current, and building it and (re)writing the artifact otherwise.
+    """
+    content_hash = map_content_hash(territory_descriptors, adjacencies)
+    try:
+        return read_map_artifact(path, content_hash)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        pass
+
+    game_map = FrozenMap(territory_descriptors, adjacencies)
+    write_map_artifact(game_map, path)
+    return game_map
+
+
+def shared_map(territory_descriptors, adjacencies, artifact_dir=None):
+    """
+    Return a FrozenMap for territory_descriptors and adjacencies, shared with every earlier caller in this
+    process that asked for the same content. On a miss, the map is loaded from (or written to) an artifact
+    named after its content hash in artifact_dir, if one is given.
+    """
+    content_hash = map_content_hash(territory_descriptors, adjacencies)
+    game_map = _SHARED_MAPS.get(content_hash)
+    if game_map is not None:
+        return game_map
+
+    with _SHARED_MAPS_LOCK:
+        game_map = _SHARED_MAPS.get(content_hash)
+        if game_map is None:
+            if artifact_dir is None:
+                game_map = FrozenMap(territory_descriptors, adjacencies)
+            else:
+                path = os.path.join(artifact_dir, content_hash + ARTIFACT_SUFFIX)
+                game_map = load_or_build_map(path, territory_descriptors, adjacencies)
+            _SHARED_MAPS[content_hash] = game_map
+    return game_map
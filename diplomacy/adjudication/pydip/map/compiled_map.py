@@ -0,0 +1,330 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from diplomacy.adjudication.pydip.map.territory import CoastTerritory, LandTerritory
+
+SEA = 0
+LAND = 1
+COAST = 2
+
+
+class CompiledMap:
+    """
+    Integer-indexed view of a Map, for use by the adjudicator.
+
+    Every territory (Land, Sea or Coast) receives a dense territory id, and every
+    province (a Land territory together with its Coasts, or a Sea territory)
+    receives a dense province id (the Territory.province_id assigned by the Map).
+    Ids are assigned in the order territories were added to the Map, so they are
+    stable for a given set of territory descriptors.
+    """
+
+    """ String[] -- territory names, indexed by territory id """
+    territory_names = None
+
+    """ String -> int, territory name to territory id """
+    territory_ids = None
+
+    """ int[] -- SEA, LAND or COAST, indexed by territory id """
+    territory_kinds = None
+
+    """ int[] -- province id of each territory, indexed by territory id """
+    province_of = None
+
+    """ int[][] -- adjacent territory ids, indexed by territory id """
+    adjacency = None
+
+    """ String[] -- province names (the Land or Sea territory name), indexed by province id """
+    province_names = None
+
+    """ int[] -- territory id of the Land or Sea territory of each province, indexed by province id """
+    province_territories = None
+
+    """ int[][] -- territory ids of the Coasts of each province, indexed by province id """
+    province_coasts = None
+
+    """ frozenset(int)[] -- province ids of the Seas adjacent to a Coast of each province, indexed by province id """
+    coastal_seas = None
+
+    """ int[][] -- province ids of the Seas adjacent to each Sea, indexed by province id (empty for Land) """
+    sea_adjacency = None
+
+    """ frozenset(int)[][] -- territory ids a unit can move to, indexed by UnitTypes value then territory id """
+    enterable = None
+
+    """ frozenset(int)[][] -- province ids a unit can support into, indexed by UnitTypes value then territory id """
+    supportable = None
+
+    """ bool[] -- whether an army can be convoyed from or to each territory, indexed by territory id """
+    convoy_compatible = None
+
+    """ int[] -- bitset of the adjacent territory ids, indexed by territory id """
+    adjacency_bits = None
+
+    """ int[] -- bitset of the territory ids making up each province, indexed by province id """
+    province_bits = None
+
+    # All-pairs distance matrices, built on first use by the properties below and kept with the map.
+    _army_distances = None
+    _fleet_distances = None
+    _convoy_distances = None
+    _province_distances = None
+
+    # (unit type value, convoys, steps) -> reach bitsets of every territory, built by reach_bits on first use
+    _reach_bits = None
+
+    def __init__(self, game_map):
+        territory_names = []
+        territory_kinds = []
+        province_of = []
+        province_names = []
+        province_territories = []
+        province_coasts = []
+
+        for name, territory in game_map.name_map.items():
+            territory_id = len(territory_names)
+            territory_names.append(name)
+            province_of.append(territory.province_id)
+            if isinstance(territory, CoastTerritory):
+                territory_kinds.append(COAST)
+                province_coasts[territory.province_id].append(territory_id)
+            else:
+                territory_kinds.append(LAND if isinstance(territory, LandTerritory) else SEA)
+                province_names.append(name)
+                province_territories.append(territory_id)
+                province_coasts.append([])
+
+        self.territory_names = tuple(territory_names)
+        self.territory_ids = {name: territory_id for territory_id, name in enumerate(territory_names)}
+        self.territory_kinds = tuple(territory_kinds)
+        self.province_of = tuple(province_of)
+        self.province_names = tuple(province_names)
+        self.province_territories = tuple(province_territories)
+        self.province_coasts = tuple(tuple(coasts) for coasts in province_coasts)
+        self.adjacency = tuple(
+            tuple(sorted(self.territory_ids[adjacent] for adjacent in game_map.adjacency[name]))
+            for name in territory_names
+        )
+        self.coastal_seas = tuple(
+            frozenset(
+                self.province_of[adjacent]
+                for coast in coasts
+                for adjacent in self.adjacency[coast]
+                if self.territory_kinds[adjacent] == SEA
+            )
+            for coasts in self.province_coasts
+        )
+        self.sea_adjacency = tuple(
+            tuple(
+                self.province_of[adjacent]
+                for adjacent in self.adjacency[territory]
+                if self.territory_kinds[adjacent] == SEA
+            ) if self.territory_kinds[territory] == SEA else ()
+            for territory in self.province_territories
+        )
+
+        # Troops (UnitTypes.TROOP.value == 0) enter Land, Fleets (1) enter Seas and Coasts.
+        # Being able to enter any territory of a province is what allows a unit to support into it.
+        self.enterable = tuple(
+            tuple(
+                frozenset(
+                    adjacent for adjacent in self.adjacency[territory]
+                    if (self.territory_kinds[adjacent] == LAND) == (unit_type_value == 0)
+                )
+                for territory in range(len(territory_names))
+            )
+            for unit_type_value in (0, 1)
+        )
+        self.supportable = tuple(
+            tuple(frozenset(self.province_of[adjacent] for adjacent in enterable) for enterable in type_enterable)
+            for type_enterable in self.enterable
+        )
+        self.convoy_compatible = tuple(
+            kind == LAND and len(self.province_coasts[self.province_of[territory]]) > 0
+            for territory, kind in enumerate(territory_kinds)
+        )
+
+        # Bitsets hold id i as bit (1 << i), so sets of territories or provinces combine with | & and ~
+        self.adjacency_bits = tuple(bits_of(adjacent) for adjacent in self.adjacency)
+        self.province_bits = tuple(
+            bits_of((self.province_territories[province],) + self.province_coasts[province])
+            for province in range(len(province_names))
+        )
+
+    def __deepcopy__(self, memo):
+        # nothing here is ever changed once built, so copies of a Map can share it
+        return self
+
+    @property
+    def territory_count(self):
+        return len(self.territory_names)
+
+    @property
+    def province_count(self):
+        return len(self.province_names)
+
+    def province_id(self, territory_name):
+        """ Province id of the named territory; Coasts map to the province of their parent """
+        return self.province_of[self.territory_ids[territory_name]]
+
+    @property
+    def army_distances(self):
+        """
+        int[][] -- fewest army moves between two territories, indexed by territory id then territory id.
+        None where the destination cannot be reached over land.
+        """
+        if self._army_distances is None:
+            self._army_distances = _all_pairs_distances(self.enterable[0])
+        return self._army_distances
+
+    @property
+    def fleet_distances(self):
+        """
+        int[][] -- fewest fleet moves between two territories, indexed by territory id then territory id.
+        Coasts are distinct territories, so a fleet is placed on (and measured to) a particular Coast.
+        """
+        if self._fleet_distances is None:
+            self._fleet_distances = _all_pairs_distances(self.enterable[1])
+        return self._fleet_distances
+
+    @property
+    def convoy_distances(self):
+        """
+        int[][] -- fewest army moves between two territories when any move may also be a convoy, indexed by
+        territory id then territory id. A convoy takes a single move between two coastal Land territories
+        joined by connected Seas, however many Seas it crosses.
+        """
+        if self._convoy_distances is None:
+            self._convoy_distances = _all_pairs_distances(self._convoy_neighbours())
+        return self._convoy_distances
+
+    @property
+    def province_distances(self):
+        """
+        int[][] -- fewest moves between two provinces when any unit may cross any border, indexed by province
+        id then province id. This is the distance used when removing units in civil disorder.
+        """
+        if self._province_distances is None:
+            neighbours = [set() for _ in range(self.province_count)]
+            for territory, adjacent_territories in enumerate(self.adjacency):
+                province = self.province_of[territory]
+                neighbours[province].update(self.province_of[adjacent] for adjacent in adjacent_territories)
+            self._province_distances = _all_pairs_distances(neighbours)
+        return self._province_distances
+
+    def reach_bits(self, unit_type_value, territory, steps, convoys=False):
+        """
+        int[] -- for k = 1..steps, the bitset of the province ids a unit of the given UnitTypes value on the
+        given territory id can be in after at most k moves, including the province it starts in. With convoys,
+        any army move may also be a convoy. Built for every territory on first use and kept with the map.
+        """
+        key = (unit_type_value, convoys, steps)
+        if self._reach_bits is None:
+            self._reach_bits = dict()
+        reach = self._reach_bits.get(key)
+        if reach is None:
+            if unit_type_value == 0:
+                distances = self.convoy_distances if convoys else self.army_distances
+            else:
+                distances = self.fleet_distances
+            reach = tuple(self._reach_from(row, steps) for row in distances)
+            self._reach_bits[key] = reach
+        return reach[territory]
+
+    def _reach_from(self, distances, steps):
+        by_distance = [0] * (steps + 1)
+        for territory, distance in enumerate(distances):
+            if distance is not None and distance <= steps:
+                by_distance[distance] |= 1 << self.province_of[territory]
+        reach = []
+        reached = by_distance[0]
+        for distance in range(1, steps + 1):
+            reached |= by_distance[distance]
+            reach.append(reached)
+        return tuple(reach)
+
+    def _convoy_neighbours(self):
+        # Seas reachable from one another form a component; an army can be convoyed between any two coastal
+        # Land territories that border the same component.
+        sea_component = {}
+        for sea in range(self.province_count):
+            if self.territory_kinds[self.province_territories[sea]] != SEA or sea in sea_component:
+                continue
+            sea_component[sea] = sea
+            pending = [sea]
+            while pending:
+                for adjacent in self.sea_adjacency[pending.pop()]:
+                    if adjacent not in sea_component:
+                        sea_component[adjacent] = sea
+                        pending.append(adjacent)
+
+        shores = {}
+        for territory, compatible in enumerate(self.convoy_compatible):
+            if compatible:
+                for sea in self.coastal_seas[self.province_of[territory]]:
+                    shores.setdefault(sea_component[sea], set()).add(territory)
+
+        neighbours = [set(enterable) for enterable in self.enterable[0]]
+        for shore in shores.values():
+            for territory in shore:
+                neighbours[territory].update(shore)
+                neighbours[territory].discard(territory)
+        return neighbours
+
+
+def bits_of(ids):
+    """ Bitset holding the given territory or province ids """
+    bits = 0
+    for member in ids:
+        bits |= 1 << member
+    return bits
+
+
+def ids_of(bits):
+    """ The ids held by a bitset, in increasing order """
+    ids = []
+    while bits:
+        lowest = bits & -bits
+        ids.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return ids
+
+
+def _all_pairs_distances(neighbours):
+    """ Breadth-first search from every node of a graph given as an adjacency list of node ids """
+    node_count = len(neighbours)
+    distances = []
+    for source in range(node_count):
+        row = [None] * node_count
+        row[source] = 0
+        frontier = [source]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for node in frontier:
+                for adjacent in neighbours[node]:
+                    if row[adjacent] is None:
+                        row[adjacent] = distance
+                        next_frontier.append(adjacent)
+            frontier = next_frontier
+        distances.append(tuple(row))
+    return tuple(distances)
@@ -19,7 +19,11 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from diplomacy.adjudication.pydip.map.territory import CoastTerritory, LandTerritory, SeaTerritory
+from hashlib import sha256
+from types import MappingProxyType
+
+from diplomacy.adjudication.pydip.map.compiled_map import CompiledMap
+from diplomacy.adjudication.pydip.map.territory import LandTerritory, SeaTerritory
 
 
 class Map:
@@ -29,6 +33,12 @@ class Map:
     """ String -> String{} (Adjacency List) """
     adjacency = None
 
+    """ String -> String, name of the Land or Sea territory each territory belongs to """
+    relevant_names = None
+
+    """ CompiledMap -- integer-indexed view of this map, used by the adjudicator """
+    compiled = None
+
     """
     territory_descriptors: list of structs defining new territories. Of the form:
         {
@@ -49,9 +59,12 @@ class Map:
     def __init__(self, territory_descriptors, adjacencies):
         self.name_map = dict()
         self.adjacency = dict()
+        self.relevant_names = dict()
+        self._province_count = 0
 
         self._setup_name_map(territory_descriptors)
         self._setup_adjacencies(adjacencies)
+        self.compiled = CompiledMap(self)
 
     def __str__(self):
         territories = []
@@ -60,10 +73,7 @@ class Map:
         return '\n'.join(territories)
 
     def relevant_name_for_territory(self, territory_name):
-        territory = self.name_map[territory_name]
-        if isinstance(territory, CoastTerritory):
-            territory_name = territory.parent.name
-        return territory_name
+        return self.relevant_names[territory_name]
 
     def _setup_name_map(self, territory_descriptors):
         for descriptor in territory_descriptors:
@@ -71,11 +81,17 @@ class Map:
             name = descriptor['name']
             if 'coasts' in descriptor:
                 land = LandTerritory(name, descriptor['coasts'])
-                self._add_territory(land)
-                for coast in land.coasts:
-                    self._add_territory(coast)
+                self._add_province(land, land.coasts)
             else:
-                self._add_territory(SeaTerritory(name))
+                self._add_province(SeaTerritory(name), [])
+
+    def _add_province(self, territory, coasts):
+        for member in [territory] + coasts:
+            member.game_map = self
+            member.province_id = self._province_count
+            self._add_territory(member)
+            self.relevant_names[member.name] = territory.name
+        self._province_count += 1
 
     def _add_territory(self, territory):
         self.name_map[territory.name] = territory
@@ -97,6 +113,90 @@ class Map:
             self.adjacency[name_b].add(name_a)
 
 
+class FrozenMap(Map):
+    """
+    A Map that can no longer be changed once built: its lookups are read-only views, its adjacency sets are
+    frozensets and assigning to it raises. Copies and deep copies return the map itself, and two FrozenMaps
+    built from the same territories and adjacencies are equal and hash alike, so one instance can be shared
+    between any number of games and threads.
+
+    Pickling keeps the built lookups and CompiledMap, so unpickling does not repeat the validation and
+    compilation done by the constructor.
+    """
+
+    """ String -- hex digest identifying the territories and adjacencies this map was built from """
+    content_hash = None
+
+    def __init__(self, territory_descriptors, adjacencies):
+        super().__init__(territory_descriptors, adjacencies)
+
+        descriptors, edges = _canonical_map_content(territory_descriptors, adjacencies)
+        self.name_map = MappingProxyType(self.name_map)
+        self.adjacency = MappingProxyType({name: frozenset(names) for name, names in self.adjacency.items()})
+        self.relevant_names = MappingProxyType(self.relevant_names)
+        self.content_hash = map_content_hash(territory_descriptors, adjacencies)
+        self._key = (descriptors, edges)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError('FrozenMap is immutable')
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenMap is immutable')
+
+    def __eq__(self, other):
+        return isinstance(other, FrozenMap) and self._key == other._key
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for name in _FROZEN_MAP_LOOKUPS:
+            state[name] = dict(state[name])
+        del state['_frozen']
+        return state
+
+    def __setstate__(self, state):
+        for name in _FROZEN_MAP_LOOKUPS:
+            state[name] = MappingProxyType(state[name])
+        self.__dict__.update(state)
+        self.__dict__['_frozen'] = True
+
+
+_FROZEN_MAP_LOOKUPS = ('name_map', 'adjacency', 'relevant_names')
+
+
+def _canonical_map_content(territory_descriptors, adjacencies):
+    descriptors = tuple(
+        (descriptor['name'], tuple(descriptor['coasts']) if 'coasts' in descriptor else None)
+        for descriptor in territory_descriptors
+    )
+    edges = frozenset(frozenset((name_a, name_b)) for name_a, name_b in adjacencies)
+    return descriptors, edges
+
+
+def map_content_hash(territory_descriptors, adjacencies):
+    """
+    Hex digest of the territories and adjacencies a Map is built from. Descriptor order is significant, as it
+    decides province ids; adjacency order and direction are not.
+    """
+    descriptors, edges = _canonical_map_content(territory_descriptors, adjacencies)
+    content = repr((descriptors, sorted(tuple(sorted(edge)) for edge in edges)))
+    return sha256(content.encode('utf-8')).hexdigest()
+
+
 class SupplyCenterMap:
     """ Map """
     game_map = None
@@ -114,6 +214,49 @@ class SupplyCenterMap:
         return 'Adjacencies:\n------------\n{}\n\nSCs:\n----\n{}'.format(self.game_map, self.supply_centers)
 
 
+class FrozenSupplyCenterMap(SupplyCenterMap):
+    """
+    A SupplyCenterMap over a FrozenMap whose supply centers can no longer be changed. Like FrozenMap it is
+    hashable, compares by content, and copies return the map itself.
+    """
+
+    def __init__(self, game_map, supply_centers):
+        assert isinstance(game_map, FrozenMap)
+        super().__init__(game_map, supply_centers)
+        self.supply_centers = frozenset(self.supply_centers)
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError('FrozenSupplyCenterMap is immutable')
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenSupplyCenterMap is immutable')
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, FrozenSupplyCenterMap) and
+            self.game_map == other.game_map and
+            self.supply_centers == other.supply_centers
+        )
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.game_map, self.supply_centers))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return FrozenSupplyCenterMap, (self.game_map, set(self.supply_centers))
+
+
 class OwnershipMap:
     """ SupplyCenterMap """
     supply_map = None
@@ -21,7 +21,7 @@
 
 from copy import deepcopy
 
-from diplomacy.adjudication.pydip.map.map import Map, OwnershipMap, SupplyCenterMap
+from diplomacy.adjudication.pydip.map.map import FrozenMap, FrozenSupplyCenterMap, OwnershipMap
 from diplomacy.adjudication.pydip.player.unit import Unit, UnitTypes
 
 _VANILLA_DIP_MAP_CACHE = None
@@ -374,8 +374,9 @@ def generate_map():
             ('Venice', 'Tyrolia'),
         ]
 
-        _VANILLA_DIP_MAP_CACHE = Map(territory_descriptors, adjacencies)
-    return deepcopy(_VANILLA_DIP_MAP_CACHE)
+        _VANILLA_DIP_MAP_CACHE = FrozenMap(territory_descriptors, adjacencies)
+    # the map is frozen, so every caller can share the one instance
+    return _VANILLA_DIP_MAP_CACHE
 
 
 def generate_supply_center_map():
@@ -417,8 +418,8 @@ def generate_supply_center_map():
             'Moscow',
             'Warsaw',
         }
-        _VANILLA_DIP_SUPPLY_CENTER_MAP_CACHE = SupplyCenterMap(generate_map(), supply_centers)
-    return deepcopy(_VANILLA_DIP_SUPPLY_CENTER_MAP_CACHE)
+        _VANILLA_DIP_SUPPLY_CENTER_MAP_CACHE = FrozenSupplyCenterMap(generate_map(), supply_centers)
+    return _VANILLA_DIP_SUPPLY_CENTER_MAP_CACHE
 
 
 def generate_home_territories():
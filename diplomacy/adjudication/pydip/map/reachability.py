@@ -0,0 +1,87 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from diplomacy.adjudication.pydip.map.compiled_map import ids_of
+
+
+class ReachMap:
+    """
+    How many of each player's units can get into each province within k moves, for k = 1..steps, computed for
+    a whole board in one go from the CompiledMap's reach bitsets. A unit counts for the province it stands in.
+
+    For a player, the units of every other player that can reach a province are the threat to it, and the
+    player's own units that can reach it are its defence.
+    """
+
+    """ CompiledMap """
+    compiled = None
+
+    """ int -- the largest number of moves considered """
+    steps = None
+
+    """ String -> int[][], each player's units able to reach each province, indexed by k - 1 then province id """
+    counts = None
+
+    """ int[][] -- units of all players able to reach each province, indexed by k - 1 then province id """
+    totals = None
+
+    def __init__(self, game_map, player_units, steps, convoys=False):
+        """
+        player_units is a mapping of player names to sets of Units, as used throughout pydip. With convoys,
+        army moves may also be convoys.
+        """
+        assert steps >= 1
+        compiled = game_map.compiled
+        province_count = compiled.province_count
+
+        self.compiled = compiled
+        self.steps = steps
+        self.counts = dict()
+        self.totals = [[0] * province_count for _ in range(steps)]
+
+        for player, units in player_units.items():
+            counts = [[0] * province_count for _ in range(steps)]
+            for unit in units:
+                territory = compiled.territory_ids[unit.position]
+                reach = compiled.reach_bits(unit.unit_type.value, territory, steps, convoys)
+                for k in range(steps):
+                    k_counts = counts[k]
+                    for province in ids_of(reach[k]):
+                        k_counts[province] += 1
+            self.counts[player] = counts
+
+            for k_totals, k_counts in zip(self.totals, counts):
+                for province, count in enumerate(k_counts):
+                    k_totals[province] += count
+
+    def defence(self, player, territory_name):
+        """ int[] -- for k = 1..steps, how many of the player's units can reach the territory's province """
+        province = self.compiled.province_id(territory_name)
+        counts = self.counts.get(player)
+        if counts is None:
+            return [0] * self.steps
+        return [k_counts[province] for k_counts in counts]
+
+    def threat(self, player, territory_name):
+        """ int[] -- for k = 1..steps, how many units of other players can reach the territory's province """
+        province = self.compiled.province_id(territory_name)
+        defence = self.defence(player, territory_name)
+        return [k_totals[province] - own for k_totals, own in zip(self.totals, defence)]
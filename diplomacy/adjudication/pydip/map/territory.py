@@ -2,10 +2,18 @@ class Territory:
     """ String """
     name = None
 
+    """ int -- shared by a Land territory and its Coasts; assigned by the Map that owns this territory """
+    province_id = None
+
+    """ Map -- the Map that owns this territory and assigned its province_id """
+    game_map = None
+
     def __init__(self, name):
         self.name = name
 
     def same_territory(self, other):
+        if self.game_map is not None and self.game_map is other.game_map:
+            return self.province_id == other.province_id
         return self.name == other.name
 
     def __str__(self):
@@ -22,6 +30,8 @@ class CoastTerritory(Territory):
         self.parent = parent
 
     def same_territory(self, other):
+        if self.game_map is not None and self.game_map is other.game_map:
+            return self.province_id == other.province_id
         relevant_territories = (
                 {self.parent.name} |
                 {coast.name for coast in self.parent.coasts}
@@ -60,6 +70,8 @@ class LandTerritory(Territory):
             self.coasts.append(CoastTerritory(coast_name, self))
 
     def same_territory(self, other):
+        if self.game_map is not None and self.game_map is other.game_map:
+            return self.province_id == other.province_id
         relevant_territories = (
                 {self.name} |
                 {coast.name for coast in self.coasts}
@@ -21,6 +21,7 @@
 
 from diplomacy.adjudication.pydip.player.command.adjustment_command import AdjustmentCreateCommand, \
     AdjustmentDisbandCommand
+from diplomacy.adjudication.pydip.player.command.builder import CommandBuilder
 from diplomacy.adjudication.pydip.player.command.command import ConvoyMoveCommand, ConvoyTransportCommand, HoldCommand, \
     MoveCommand, SupportCommand
 from diplomacy.adjudication.pydip.player.command.retreat_command import RetreatDisbandCommand, RetreatMoveCommand
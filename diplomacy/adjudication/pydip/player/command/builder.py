@@ -0,0 +1,145 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from diplomacy.adjudication.pydip.map.compiled_map import SEA
+from diplomacy.adjudication.pydip.player.command.command import ConvoyMoveCommand, ConvoyTransportCommand, \
+    HoldCommand, MoveCommand, SupportCommand
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+
+
+class CommandBuilder:
+    """
+    Builds the commands of a whole turn. The constructors of the Command classes
+    each look the unit up in its player's list and check legality against the
+    territories of the map, so building a turn that way takes time quadratic in
+    the number of units. The builder indexes the units once and checks each
+    command against the legality tables of the map's CompiledMap, so every
+    command takes constant time. It accepts exactly the commands the
+    constructors do, and fails with the same exception type where they would:
+    a ValueError for a position without a unit (as found by find_unit), a
+    KeyError for a convoy to an unknown territory, and an AssertionError for
+    anything else.
+
+    Commands that were already validated (e.g. when they were submitted) can be
+    built without any checks by a trusted builder.
+    """
+
+    """ Map """
+    game_map = None
+
+    """ bool -- whether commands are built without being validated """
+    trusted = False
+
+    def __init__(self, game_map, players, trusted=False):
+        self.game_map = game_map
+        self.trusted = trusted
+        self._compiled = game_map.compiled
+        self._units = dict()
+        for player in players:
+            for unit in player.units:
+                self._units[unit.position] = (player, unit)
+
+    def find_unit(self, position):
+        """ Returns the unit at the named territory, raising ValueError if there is none """
+        entry = self._units.get(position)
+        if entry is None:
+            raise ValueError("Unable to find unit with position {}".format(position))
+        return entry[1]
+
+    def move(self, player, position, destination):
+        unit = self._own_unit(player, position)
+        if not self.trusted:
+            destination_id = self._territory_id(destination)
+            assert destination == position or destination_id in self._enterable(unit), "Invalid destination for unit"
+        command = MoveCommand.__new__(MoveCommand)
+        command.player, command.unit, command.destination = player, unit, destination
+        return command
+
+    def hold(self, player, position):
+        command = HoldCommand.__new__(HoldCommand)
+        command.player, command.unit, command.destination = player, self._own_unit(player, position), position
+        return command
+
+    def support(self, player, position, supported_position, destination):
+        unit = self._own_unit(player, position)
+        supported_unit = self.find_unit(supported_position)
+        if not self.trusted:
+            compiled = self._compiled
+            destination_id = self._territory_id(destination)
+            assert (
+                    destination == supported_position or
+                    destination_id in self._enterable(supported_unit) or
+                    (supported_unit.unit_type == UnitTypes.TROOP and
+                     compiled.convoy_compatible[destination_id] and
+                     compiled.convoy_compatible[compiled.territory_ids[supported_position]])
+            )
+            supportable = compiled.supportable[unit.unit_type.value][compiled.territory_ids[position]]
+            assert compiled.province_of[destination_id] in supportable
+        command = SupportCommand.__new__(SupportCommand)
+        command.player, command.unit = player, unit
+        command.supported_unit, command.destination = supported_unit, destination
+        return command
+
+    def convoy_move(self, player, position, destination):
+        unit = self._own_unit(player, position)
+        if not self.trusted:
+            compiled = self._compiled
+            # looked up before anything is checked, as ConvoyMoveCommand does
+            destination_id = compiled.territory_ids[destination]
+            assert destination != position
+            assert unit.unit_type == UnitTypes.TROOP
+            assert compiled.convoy_compatible[compiled.territory_ids[position]]
+            assert compiled.convoy_compatible[destination_id]
+        command = ConvoyMoveCommand.__new__(ConvoyMoveCommand)
+        command.player, command.unit, command.destination = player, unit, destination
+        return command
+
+    def convoy_transport(self, player, position, transported_position, destination):
+        unit = self._own_unit(player, position)
+        transported_unit = self.find_unit(transported_position)
+        if not self.trusted:
+            compiled = self._compiled
+            assert unit.unit_type == UnitTypes.FLEET
+            # looked up before the rest is checked, as ConvoyTransportCommand does
+            destination_id = compiled.territory_ids[destination]
+            assert transported_position != destination
+            assert compiled.territory_kinds[compiled.territory_ids[position]] == SEA
+            assert transported_unit.unit_type == UnitTypes.TROOP
+            assert compiled.convoy_compatible[compiled.territory_ids[transported_position]]
+            assert compiled.convoy_compatible[destination_id]
+        command = ConvoyTransportCommand.__new__(ConvoyTransportCommand)
+        command.player, command.unit = player, unit
+        command.transported_unit, command.destination = transported_unit, destination
+        return command
+
+    def _own_unit(self, player, position):
+        unit = self.find_unit(position)
+        if not self.trusted:
+            assert self._units[position][0] is player
+        return unit
+
+    def _territory_id(self, name):
+        territory_id = self._compiled.territory_ids.get(name)
+        assert territory_id is not None
+        return territory_id
+
+    def _enterable(self, unit):
+        compiled = self._compiled
+        return compiled.enterable[unit.unit_type.value][compiled.territory_ids[unit.position]]
@@ -24,13 +24,23 @@ from diplomacy.adjudication.pydip.player.helpers import (territory_is_convoy_com
                                                          unit_can_support)
 from diplomacy.adjudication.pydip.player.unit import UnitTypes
 
+# Command kinds, which the adjudicator dispatches on (see turn.command_map)
+MOVE = 0
+CONVOY_MOVE = 1
+CONVOY_TRANSPORT = 2
+SUPPORT = 3
+
 
 class Command:
-    """ Player -- who is issuing command """
-    player = None
+    """
+    player -- Player, who is issuing command
+    unit -- Unit, unit being issued command
+    """
 
-    """ Unit -- unit being issued command """
-    unit = None
+    __slots__ = ('player', 'unit')
+
+    """ int -- MOVE, CONVOY_MOVE, CONVOY_TRANSPORT or SUPPORT, None for commands the adjudicator doesn't resolve """
+    kind = None
 
     def __init__(self, player, unit):
         assert unit in player.units
@@ -48,11 +58,14 @@ class Command:
 
 class MoveCommand(Command):
     """
-    String -- Name of territory being moved to.
+    destination -- String, name of territory being moved to.
       * Must be adjacent or equal to unit's current territory
       * Must be legal for unit to enter this territory
     """
-    destination = None
+
+    __slots__ = ('destination',)
+
+    kind = MOVE
 
     def __init__(self, player, unit, destination):
         super().__init__(player, unit)
@@ -84,6 +97,8 @@ class MoveCommand(Command):
 class HoldCommand(MoveCommand):
     """ Holding is really just moving to your current position """
 
+    __slots__ = ()
+
     def __init__(self, player, unit):
         super().__init__(player, unit, unit.position)
 
@@ -96,17 +111,18 @@ class HoldCommand(MoveCommand):
 
 
 class SupportCommand(Command):
-    """ Unit -- unit to support """
-    supported_unit = None
-
     """
-    String -- name of territory to support into.
+    supported_unit -- Unit, unit to support
+    destination -- String, name of territory to support into.
       * Must be adjacent to unit's current territory
       * Must be legal for unit to enter this territory
       * Must be adjacent or identical to supported_unit's current territory
       * Must be legal for supported_unit to support this territory
     """
-    destination = None
+
+    __slots__ = ('supported_unit', 'destination')
+
+    kind = SUPPORT
 
     def __init__(self, player, unit, supported_unit, destination):
         super().__init__(player, unit)
@@ -149,10 +165,13 @@ class SupportCommand(Command):
 
 class ConvoyMoveCommand(Command):
     """
-    String -- name of territory convoying to.
+    destination -- String, name of territory convoying to.
       * Must be LandTerritory with at least one coast
     """
-    destination = None
+
+    __slots__ = ('destination',)
+
+    kind = CONVOY_MOVE
 
     """
     Extra Assertions:
@@ -195,16 +214,15 @@ class ConvoyMoveCommand(Command):
 
 class ConvoyTransportCommand(Command):
     """
-    Unit -- unit to convoy.
+    transported_unit -- Unit, unit to convoy.
       * Must be a TROOP
-    """
-    transported_unit = None
-
-    """
-    String -- name of territory convoying to.
+    destination -- String, name of territory convoying to.
       * Must be LandTerritory with at least one coast
     """
-    destination = None
+
+    __slots__ = ('transported_unit', 'destination')
+
+    kind = CONVOY_TRANSPORT
 
     """
     Extra Assertions:
@@ -32,6 +32,8 @@ class RetreatCommand(Command):
     Commands issued that disagree with the provided retreat_map will fail.
     """
 
+    __slots__ = ()
+
     def __init__(self, retreat_map, player, unit):
         super().__init__(player, unit)
         assert unit in retreat_map[player.name]
@@ -39,6 +41,8 @@ class RetreatCommand(Command):
 
 
 class RetreatDisbandCommand(RetreatCommand):
+    __slots__ = ()
+
     def __init__(self, retreat_map, player, unit):
         super().__init__(retreat_map, player, unit)
 
@@ -59,11 +63,12 @@ class RetreatDisbandCommand(RetreatCommand):
 
 class RetreatMoveCommand(RetreatCommand):
     """
-    String -- Name of territory being retreated to.
+    destination -- String, name of territory being retreated to.
       * Must be included in retreat_map as one of the territories the unit
         is permitted to retreat to
     """
-    destination = None
+
+    __slots__ = ('destination',)
 
     def __init__(self, retreat_map, player, unit, destination):
         super().__init__(retreat_map, player, unit)
@@ -19,7 +19,6 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from diplomacy.adjudication.pydip.map.territory import CoastTerritory
 from diplomacy.adjudication.pydip.player.helpers import unit_type_can_enter
 from diplomacy.adjudication.pydip.player.unit import Unit
 
@@ -61,10 +60,9 @@ class Player:
             assert name in self.game_map.name_map.keys()
 
             territory = self.game_map.name_map[name]
-            starting_territory = territory.parent if isinstance(territory, CoastTerritory) else territory
-            assert starting_territory.name in self.game_map.name_map.keys()
-            assert starting_territory.name not in self.starting_territories
-            self.starting_territories.add(starting_territory.name)
+            starting_territory = self.game_map.relevant_name_for_territory(name)
+            assert starting_territory not in self.starting_territories
+            self.starting_territories.add(starting_territory)
 
             if unit_type is None:
                 continue
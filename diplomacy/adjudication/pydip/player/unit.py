@@ -10,15 +10,20 @@ class UnitTypes(Enum):
 
 
 class Unit:
-    """ UnitType """
-    unit_type = None
+    """
+    unit_type -- UnitType
+    position -- String, name of occupied territory
 
-    """ String -- Name of occupied territory """
-    position = None
+    Units are used as dictionary keys throughout, so their hash is computed
+    once. They must not be changed after construction.
+    """
+
+    __slots__ = ('unit_type', 'position', '_hash')
 
     def __init__(self, unit_type, position):
         self.unit_type = unit_type
         self.position = position
+        self._hash = hash((unit_type, position))
 
     def __eq__(self, other):
         return self.unit_type == other.unit_type and self.position == other.position
@@ -27,7 +32,11 @@ class Unit:
         return not self.__eq__(other)
 
     def __hash__(self):
-        return hash((self.unit_type, self.position))
+        return self._hash
+
+    def __reduce__(self):
+        # string hashes differ between interpreters, so the cached hash is recomputed rather than copied
+        return Unit, (self.unit_type, self.position)
 
     def __repr__(self):
         return '[{} -- {}]'.format(self.unit_type, self.position)
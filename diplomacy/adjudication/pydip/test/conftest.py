@@ -0,0 +1,88 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from diplomacy.adjudication.pydip.player.command.builder import CommandBuilder
+from diplomacy.adjudication.pydip.test.command_helper import CommandType
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.resolve import resolve_turn_by_bounds, resolve_turn_by_components, \
+    resolve_turn_partitioned
+
+
+@pytest.fixture(autouse=True)
+def check_alternative_resolvers(monkeypatch):
+    """ Every turn resolved in the tests must resolve the same way through each alternative resolver """
+    resolve = TurnHelper.resolve
+
+    def checked_resolve(helper, budget=None):
+        result = resolve(helper, budget)
+        assert resolve_turn_by_bounds(helper.game_map, helper.commands) == result
+        assert resolve_turn_by_components(helper.game_map, helper.commands) == result
+        assert resolve_turn_partitioned(helper.game_map, helper.commands) == result
+        return result
+
+    monkeypatch.setattr(TurnHelper, 'resolve', checked_resolve)
+
+
+@pytest.fixture(autouse=True)
+def check_command_builder(monkeypatch):
+    """ Every turn built in the tests must be built the same way by a CommandBuilder, or fail the same way """
+    build_commands = TurnHelper._build_commands
+
+    def checked_build_commands(helper, player_helpers):
+        try:
+            commands = build_commands(helper, player_helpers)
+        except (AssertionError, ValueError) as error:
+            with pytest.raises(type(error)):
+                _build_with_builder(helper, player_helpers)
+            raise
+        built = _build_with_builder(helper, player_helpers)
+        assert [_fields(command) for command in built] == [_fields(command) for command in commands]
+        return commands
+
+    monkeypatch.setattr(TurnHelper, '_build_commands', checked_build_commands)
+
+
+def _fields(command):
+    command_type = type(command)
+    return command_type, [getattr(command, slot) for cls in command_type.__mro__ for slot in getattr(cls, '__slots__', ())]
+
+
+def _build_with_builder(helper, player_helpers):
+    builder = CommandBuilder(helper.game_map, helper.players.values())
+    commands = []
+    for player_helper in player_helpers:
+        player = helper.players[player_helper.name]
+        for command in player_helper.command_helpers:
+            if command.command_type == CommandType.MOVE:
+                commands.append(builder.move(player, command.unit, command.destination))
+            elif command.command_type == CommandType.SUPPORT:
+                commands.append(builder.support(player, command.unit, command.source, command.destination))
+            elif command.command_type == CommandType.CONVOY_MOVE:
+                commands.append(builder.convoy_move(player, command.unit, command.destination))
+            elif command.command_type == CommandType.CONVOY_TRANSPORT:
+                commands.append(builder.convoy_transport(player, command.unit, command.source, command.destination))
+            elif command.command_type == CommandType.HOLD:
+                commands.append(builder.hold(player, command.unit))
+            else:
+                raise ValueError("Invalid command type: {}".format(command.command_type))
+    return commands
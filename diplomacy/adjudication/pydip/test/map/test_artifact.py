@@ -0,0 +1,129 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import os
+import pickle
+
+import pytest
+
+from diplomacy.adjudication.pydip.map.artifact import ARTIFACT_VERSION, artifact_schema, load_or_build_map, \
+    read_map_artifact, shared_map, write_map_artifact
+from diplomacy.adjudication.pydip.map.map import FrozenMap, map_content_hash
+from diplomacy.adjudication.pydip.map.predefined.vanilla_dip import generate_map
+
+TERRITORY_DESCRIPTORS = [
+    {'name': 'Bulgaria', 'coasts': ['Bulgaria North Coast', 'Bulgaria South Coast']},
+    {'name': 'Rumania', 'coasts': ['Rumania Coast']},
+    {'name': 'Black Sea'},
+]
+ADJACENCIES = [
+    ('Bulgaria', 'Rumania'),
+    ('Bulgaria North Coast', 'Black Sea'),
+    ('Rumania Coast', 'Black Sea'),
+    ('Bulgaria North Coast', 'Rumania Coast'),
+]
+
+
+def test_artifact_round_trip(tmp_path):
+    path = str(tmp_path / 'vanilla.pydipmap')
+    game_map = generate_map()
+    write_map_artifact(game_map, path)
+
+    loaded = read_map_artifact(path, game_map.content_hash)
+    assert loaded == game_map
+    assert loaded.adjacency == game_map.adjacency
+    assert loaded.compiled.adjacency == game_map.compiled.adjacency
+    assert loaded.compiled.supportable == game_map.compiled.supportable
+    with pytest.raises(AttributeError):
+        loaded.adjacency = {}
+
+
+def test_artifact_rejects_other_content_and_versions(tmp_path):
+    path = str(tmp_path / 'map.pydipmap')
+    write_map_artifact(generate_map(), path)
+    with pytest.raises(ValueError):
+        read_map_artifact(path, map_content_hash(TERRITORY_DESCRIPTORS, ADJACENCIES))
+
+    with open(path, 'wb') as artifact:
+        pickle.dump({'version': ARTIFACT_VERSION + 1, 'content_hash': None, 'map': None}, artifact)
+    with pytest.raises(ValueError):
+        read_map_artifact(path)
+
+
+def test_artifact_rejects_other_schemas(tmp_path):
+    path = str(tmp_path / 'map.pydipmap')
+    game_map = FrozenMap(TERRITORY_DESCRIPTORS, ADJACENCIES)
+    with open(path, 'wb') as artifact:
+        pickle.dump({'version': ARTIFACT_VERSION, 'schema': artifact_schema()[::-1],
+                     'content_hash': game_map.content_hash, 'map': game_map}, artifact)
+    with pytest.raises(ValueError):
+        read_map_artifact(path)
+
+
+def test_artifact_rejects_damaged_maps(tmp_path):
+    path = str(tmp_path / 'map.pydipmap')
+    write_map_artifact(FrozenMap(TERRITORY_DESCRIPTORS, ADJACENCIES), path)
+    with open(path, 'rb') as artifact:
+        payload = pickle.load(artifact)
+    # a different territory name of the same length, leaving the stored hashes intact
+    payload['map'] = payload['map'].replace(b'Rumania', b'Romania')
+    with open(path, 'wb') as artifact:
+        pickle.dump(payload, artifact)
+    with pytest.raises(ValueError):
+        read_map_artifact(path)
+
+    game_map = load_or_build_map(path, TERRITORY_DESCRIPTORS, ADJACENCIES)
+    assert 'Rumania' in game_map.name_map
+    assert 'Romania' not in read_map_artifact(path).name_map
+
+
+def test_load_or_build_map_rebuilds_artifacts_of_older_schemas(tmp_path):
+    path = str(tmp_path / 'map.pydipmap')
+    # as written before the compiled map had province bitsets
+    old_map = FrozenMap(TERRITORY_DESCRIPTORS, ADJACENCIES)
+    del old_map.compiled.province_bits
+    with open(path, 'wb') as artifact:
+        pickle.dump({'version': 1, 'content_hash': old_map.content_hash, 'map': old_map}, artifact)
+    with pytest.raises(ValueError):
+        read_map_artifact(path)
+
+    game_map = load_or_build_map(path, TERRITORY_DESCRIPTORS, ADJACENCIES)
+    assert game_map.compiled.province_bits is not None
+    assert read_map_artifact(path, game_map.content_hash).compiled.province_bits is not None
+
+
+def test_load_or_build_map_rewrites_stale_artifacts(tmp_path):
+    path = str(tmp_path / 'map.pydipmap')
+    write_map_artifact(generate_map(), path)
+
+    game_map = load_or_build_map(path, TERRITORY_DESCRIPTORS, ADJACENCIES)
+    assert game_map.content_hash == map_content_hash(TERRITORY_DESCRIPTORS, ADJACENCIES)
+    assert read_map_artifact(path) == game_map
+    assert load_or_build_map(path, TERRITORY_DESCRIPTORS, ADJACENCIES) == game_map
+
+
+def test_shared_map(tmp_path):
+    territory_descriptors = TERRITORY_DESCRIPTORS + [{'name': 'Aegean Sea'}]
+    adjacencies = ADJACENCIES + [('Black Sea', 'Aegean Sea'), ('Bulgaria South Coast', 'Aegean Sea')]
+    game_map = shared_map(territory_descriptors, adjacencies, str(tmp_path))
+    assert os.listdir(str(tmp_path)) == [game_map.content_hash + '.pydipmap']
+
+    assert shared_map(territory_descriptors, list(reversed(adjacencies))) is game_map
+    assert shared_map(territory_descriptors, adjacencies[:-1]) is not game_map
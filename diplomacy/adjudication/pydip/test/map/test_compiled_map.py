@@ -0,0 +1,150 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from diplomacy.adjudication.pydip.map.compiled_map import COAST, LAND, SEA, bits_of, ids_of
+from diplomacy.adjudication.pydip.map.map import Map
+from diplomacy.adjudication.pydip.map.predefined.vanilla_dip import generate_map
+
+
+def test_land_territories_with_lake():
+    territory_descriptors = [
+        {'name': 'Salt Lake City', 'coasts': ['Salt Lake City Coast']},
+        {'name': 'Ogden', 'coasts': ['Ogden Coast']},
+        {'name': 'Great Salt Lake'},
+    ]
+    adjacencies = [
+        ('Salt Lake City', 'Ogden'),
+        ('Salt Lake City Coast', 'Great Salt Lake'),
+        ('Salt Lake City Coast', 'Ogden Coast'),
+        ('Ogden Coast', 'Great Salt Lake'),
+    ]
+
+    compiled = Map(territory_descriptors, adjacencies).compiled
+
+    assert compiled.territory_names == (
+        'Salt Lake City', 'Salt Lake City Coast', 'Ogden', 'Ogden Coast', 'Great Salt Lake',
+    )
+    assert compiled.territory_kinds == (LAND, COAST, LAND, COAST, SEA)
+    assert compiled.province_names == ('Salt Lake City', 'Ogden', 'Great Salt Lake')
+    assert compiled.province_of == (0, 0, 1, 1, 2)
+    assert compiled.province_territories == (0, 2, 4)
+    assert compiled.province_coasts == ((1,), (3,), ())
+    assert compiled.adjacency == ((2,), (3, 4), (0,), (1, 4), (1, 3))
+    assert compiled.coastal_seas == (frozenset({2}), frozenset({2}), frozenset())
+    assert compiled.sea_adjacency == ((), (), ())
+    assert compiled.enterable == (
+        (frozenset({2}), frozenset(), frozenset({0}), frozenset(), frozenset()),
+        (frozenset(), frozenset({3, 4}), frozenset(), frozenset({1, 4}), frozenset({1, 3})),
+    )
+    assert compiled.supportable == (
+        (frozenset({1}), frozenset(), frozenset({0}), frozenset(), frozenset()),
+        (frozenset(), frozenset({1, 2}), frozenset(), frozenset({0, 2}), frozenset({0, 1})),
+    )
+    assert compiled.convoy_compatible == (True, False, True, False, False)
+
+
+def test_vanilla_provinces():
+    game_map = generate_map()
+    compiled = game_map.compiled
+
+    assert compiled.territory_count == len(game_map.name_map)
+    assert compiled.province_count == 75
+    assert compiled.province_id('Bulgaria South Coast') == compiled.province_id('Bulgaria')
+    assert compiled.province_id('Bulgaria North Coast') == compiled.province_id('Bulgaria')
+    assert compiled.province_id('Black Sea') != compiled.province_id('Bulgaria')
+    assert {
+        compiled.territory_names[coast] for coast in compiled.province_coasts[compiled.province_id('Spain')]
+    } == {'Spain North Coast', 'Spain South Coast'}
+
+
+def test_vanilla_adjacency_matches_map():
+    game_map = generate_map()
+    compiled = game_map.compiled
+
+    for name, adjacent_names in game_map.adjacency.items():
+        territory_id = compiled.territory_ids[name]
+        assert {compiled.territory_names[adjacent] for adjacent in compiled.adjacency[territory_id]} == adjacent_names
+
+
+def test_vanilla_sea_graph():
+    compiled = generate_map().compiled
+
+    def names(provinces):
+        return {compiled.province_names[province] for province in provinces}
+
+    assert names(compiled.coastal_seas[compiled.province_id('Spain')]) == {
+        'Mid-Atlantic Ocean', 'Gulf of Lyon', 'Western Mediterranean Sea',
+    }
+    assert names(compiled.coastal_seas[compiled.province_id('Munich')]) == set()
+    assert names(compiled.sea_adjacency[compiled.province_id('English Channel')]) == {
+        'Irish Sea', 'Mid-Atlantic Ocean', 'North Sea',
+    }
+    assert compiled.sea_adjacency[compiled.province_id('Spain')] == ()
+
+
+def test_vanilla_distances():
+    compiled = generate_map().compiled
+    ids = compiled.territory_ids
+
+    def army(origin, destination):
+        return compiled.army_distances[ids[origin]][ids[destination]]
+
+    def convoyed(origin, destination):
+        return compiled.convoy_distances[ids[origin]][ids[destination]]
+
+    def fleet(origin, destination):
+        return compiled.fleet_distances[ids[origin]][ids[destination]]
+
+    assert army('Paris', 'Paris') == 0
+    assert army('Paris', 'Munich') == 2
+    assert army('Paris', 'London') is None
+    assert convoyed('Paris', 'Munich') == 2
+    assert convoyed('London', 'Paris') == 2
+    assert convoyed('London', 'Syria') == 1
+    assert convoyed('Munich', 'London') == 2
+
+    assert fleet('London Coast', 'Sevastopol Coast') == 9
+    assert fleet('Spain North Coast', 'Spain South Coast') == 2
+    assert fleet('London Coast', 'Paris') is None
+
+    provinces = compiled.province_distances
+    assert provinces[compiled.province_id('Black Sea')][compiled.province_id('Edinburgh')] == 6
+    assert provinces[compiled.province_id('Spain North Coast')][compiled.province_id('Spain')] == 0
+    assert all(row[province] == provinces[province][other] for other, row in enumerate(provinces)
+               for province in range(compiled.province_count))
+
+
+def test_vanilla_bitsets():
+    compiled = generate_map().compiled
+    ids = compiled.territory_ids
+
+    assert bits_of([]) == 0
+    assert ids_of(bits_of([75, 3, 0, 64])) == [0, 3, 64, 75]
+
+    for territory, adjacent in enumerate(compiled.adjacency):
+        assert ids_of(compiled.adjacency_bits[territory]) == list(adjacent)
+
+    spain = compiled.province_bits[compiled.province_id('Spain')]
+    assert {compiled.territory_names[territory] for territory in ids_of(spain)} == {
+        'Spain', 'Spain North Coast', 'Spain South Coast',
+    }
+    assert compiled.adjacency_bits[ids['Mid-Atlantic Ocean']] & spain == \
+        bits_of([ids['Spain North Coast'], ids['Spain South Coast']])
@@ -19,7 +19,12 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from diplomacy.adjudication.pydip.map.map import Map
+import pickle
+from copy import copy, deepcopy
+
+import pytest
+
+from diplomacy.adjudication.pydip.map.map import FrozenMap, FrozenSupplyCenterMap, Map
 from diplomacy.adjudication.pydip.map.territory import LandTerritory, SeaTerritory
 
 
@@ -101,3 +106,92 @@ def test_land_territories_with_lake():
 
     assert game_map.name_map == expected_name_map
     assert game_map.adjacency == expected_adjacency
+
+
+def test_province_equivalence():
+    territory_descriptors = [
+        {'name': 'Bulgaria', 'coasts': ['Bulgaria North Coast', 'Bulgaria South Coast']},
+        {'name': 'Black Sea'},
+    ]
+    adjacencies = [
+        ('Bulgaria North Coast', 'Black Sea'),
+    ]
+
+    game_map = Map(territory_descriptors, adjacencies)
+
+    assert game_map.relevant_names == {
+        'Bulgaria': 'Bulgaria',
+        'Bulgaria North Coast': 'Bulgaria',
+        'Bulgaria South Coast': 'Bulgaria',
+        'Black Sea': 'Black Sea',
+    }
+    assert {name: territory.province_id for name, territory in game_map.name_map.items()} == {
+        'Bulgaria': 0,
+        'Bulgaria North Coast': 0,
+        'Bulgaria South Coast': 0,
+        'Black Sea': 1,
+    }
+    assert game_map.name_map['Bulgaria South Coast'].same_territory(game_map.name_map['Bulgaria North Coast'])
+    assert not game_map.name_map['Bulgaria North Coast'].same_territory(game_map.name_map['Black Sea'])
+    assert game_map.name_map['Bulgaria'].game_map is game_map
+
+
+def test_province_ids_are_not_compared_across_maps():
+    map_a = Map([{'name': 'X'}, {'name': 'Y', 'coasts': ['Y Coast']}], [('X', 'Y Coast')])
+    map_b = Map([{'name': 'P'}, {'name': 'Q', 'coasts': ['Q Coast']}], [('P', 'Q Coast')])
+
+    assert map_a.name_map['X'].province_id == map_b.name_map['P'].province_id
+    assert not map_a.name_map['X'].same_territory(map_b.name_map['P'])
+    assert not map_a.name_map['Y Coast'].same_territory(map_b.name_map['Q Coast'])
+    assert not map_a.name_map['Y Coast'].same_territory(map_b.name_map['Q'])
+
+
+def _bulgaria_and_black_sea():
+    territory_descriptors = [
+        {'name': 'Bulgaria', 'coasts': ['Bulgaria North Coast', 'Bulgaria South Coast']},
+        {'name': 'Black Sea'},
+    ]
+    adjacencies = [
+        ('Bulgaria North Coast', 'Black Sea'),
+    ]
+    return territory_descriptors, adjacencies
+
+
+def test_frozen_map():
+    game_map = FrozenMap(*_bulgaria_and_black_sea())
+
+    assert game_map.adjacency == {
+        'Bulgaria': set(),
+        'Bulgaria North Coast': {'Black Sea'},
+        'Bulgaria South Coast': set(),
+        'Black Sea': {'Bulgaria North Coast'},
+    }
+    assert game_map.compiled.province_count == 2
+
+    with pytest.raises(TypeError):
+        game_map.name_map['Aegean Sea'] = None
+    with pytest.raises(AttributeError):
+        game_map.adjacency['Black Sea'].add('Bulgaria South Coast')
+    with pytest.raises(AttributeError):
+        game_map.adjacency = {}
+
+    assert copy(game_map) is game_map
+    assert deepcopy(game_map) is game_map
+
+
+def test_frozen_maps_compare_by_content():
+    game_map = FrozenMap(*_bulgaria_and_black_sea())
+    rebuilt = pickle.loads(pickle.dumps(game_map))
+
+    assert rebuilt is not game_map
+    assert rebuilt == game_map
+    assert hash(rebuilt) == hash(game_map)
+    assert rebuilt.adjacency == game_map.adjacency
+    assert game_map != FrozenMap([{'name': 'Black Sea'}], [])
+
+    supply_map = FrozenSupplyCenterMap(game_map, {'Bulgaria'})
+    assert supply_map == FrozenSupplyCenterMap(rebuilt, {'Bulgaria'})
+    assert len({supply_map, pickle.loads(pickle.dumps(supply_map))}) == 1
+    assert deepcopy(supply_map) is supply_map
+    with pytest.raises(AttributeError):
+        supply_map.supply_centers.add('Black Sea')
@@ -0,0 +1,67 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from diplomacy.adjudication.pydip.map.predefined.vanilla_dip import generate_map, generate_starting_player_units
+from diplomacy.adjudication.pydip.map.reachability import ReachMap
+from diplomacy.adjudication.pydip.player.unit import Unit, UnitTypes
+
+
+def test_reach_bits():
+    compiled = generate_map().compiled
+    ids = compiled.territory_ids
+
+    def provinces(unit_type, territory, steps, convoys=False):
+        reach = compiled.reach_bits(unit_type.value, ids[territory], steps, convoys)
+        return [
+            {compiled.province_names[province] for province in range(compiled.province_count) if bits >> province & 1}
+            for bits in reach
+        ]
+
+    assert provinces(UnitTypes.TROOP, 'Spain', 1) == [{'Spain', 'Portugal', 'Gascony', 'Marseilles'}]
+    assert provinces(UnitTypes.FLEET, 'Spain North Coast', 1) == [{
+        'Spain', 'Portugal', 'Gascony', 'Mid-Atlantic Ocean',
+    }]
+    assert 'Paris' not in provinces(UnitTypes.TROOP, 'London', 2)[1]
+    assert 'Paris' in provinces(UnitTypes.TROOP, 'London', 2, convoys=True)[1]
+
+    first, second = provinces(UnitTypes.TROOP, 'Munich', 2)
+    assert first < second
+
+
+def test_starting_threats():
+    reach_map = ReachMap(generate_map(), generate_starting_player_units(), 2)
+
+    assert reach_map.defence('England', 'London') == [1, 3]
+    assert reach_map.threat('England', 'London') == [0, 1]
+    assert reach_map.defence('Germany', 'Munich') == [2, 2]
+    assert reach_map.threat('Germany', 'Munich') == [0, 5]
+    assert reach_map.threat('Germany', 'Kiel Coast') == reach_map.threat('Germany', 'Kiel')
+    assert reach_map.defence('Nobody', 'Munich') == [0, 0]
+    assert reach_map.threat('Nobody', 'Munich') == [2, 7]
+
+
+def test_convoyed_threats():
+    player_units = {
+        'England': {Unit(UnitTypes.TROOP, 'London'), Unit(UnitTypes.FLEET, 'English Channel')},
+        'France': {Unit(UnitTypes.TROOP, 'Paris')},
+    }
+
+    assert ReachMap(generate_map(), player_units, 1).threat('France', 'Brest') == [1]
+    assert ReachMap(generate_map(), player_units, 1, convoys=True).threat('France', 'Brest') == [2]
@@ -36,3 +36,30 @@ def test_coast_needs_land_parent():
 
     """ expect this to create a coast without AssertionError """
     CoastTerritory('Test Success Coast', good_parent)
+
+
+def test_same_territory_without_map():
+    bulgaria = LandTerritory('Bulgaria', ['Bulgaria North Coast', 'Bulgaria South Coast'])
+    black_sea = SeaTerritory('Black Sea')
+
+    assert bulgaria.same_territory(bulgaria.coasts[0])
+    assert bulgaria.coasts[0].same_territory(bulgaria.coasts[1])
+    assert not bulgaria.same_territory(black_sea)
+    assert not black_sea.same_territory(bulgaria.coasts[1])
+
+
+def test_same_territory_uses_province_id():
+    bulgaria = LandTerritory('Bulgaria', ['Bulgaria North Coast', 'Bulgaria South Coast'])
+    rumania = LandTerritory('Rumania', ['Rumania Coast'])
+    game_map = object()
+    for territory in [bulgaria] + bulgaria.coasts:
+        territory.game_map = game_map
+        territory.province_id = 0
+    for territory in [rumania] + rumania.coasts:
+        territory.game_map = game_map
+        territory.province_id = 1
+
+    assert bulgaria.same_territory(bulgaria.coasts[1])
+    assert bulgaria.coasts[0].same_territory(bulgaria.coasts[1])
+    assert not bulgaria.coasts[0].same_territory(rumania.coasts[0])
+    assert not rumania.same_territory(bulgaria)
@@ -0,0 +1,138 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import pytest
+
+from diplomacy.adjudication.pydip.map.predefined.vanilla_dip import generate_map
+from diplomacy.adjudication.pydip.player.command.builder import CommandBuilder
+from diplomacy.adjudication.pydip.player.command.command import ConvoyMoveCommand, ConvoyTransportCommand, \
+    HoldCommand, MoveCommand, SupportCommand
+from diplomacy.adjudication.pydip.player.player import Player
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+
+
+def _players(game_map):
+    england = Player("England", game_map, [
+        {'territory_name': 'London', 'unit_type': UnitTypes.TROOP},
+        {'territory_name': 'North Sea', 'unit_type': UnitTypes.FLEET},
+        {'territory_name': 'Yorkshire', 'unit_type': UnitTypes.TROOP},
+    ])
+    france = Player("France", game_map, [
+        {'territory_name': 'Spain North Coast', 'unit_type': UnitTypes.FLEET},
+        {'territory_name': 'Gascony', 'unit_type': UnitTypes.TROOP},
+    ])
+    return england, france
+
+
+def test_builds_same_commands_as_constructors():
+    game_map = generate_map()
+    england, france = _players(game_map)
+    london, north_sea, yorkshire = england.units
+    spain, gascony = france.units
+    builder = CommandBuilder(game_map, [england, france])
+
+    move = builder.move(france, 'Spain North Coast', 'Portugal Coast')
+    assert move == MoveCommand(france, spain, 'Portugal Coast')
+    assert type(move) is MoveCommand
+
+    hold = builder.hold(france, 'Gascony')
+    assert hold == HoldCommand(france, gascony)
+    assert type(hold) is HoldCommand
+
+    support = builder.support(england, 'Yorkshire', 'London', 'Wales')
+    assert type(support) is SupportCommand
+    assert (support.player, support.unit, support.supported_unit, support.destination) == \
+           (england, yorkshire, london, 'Wales')
+
+    convoy_move = builder.convoy_move(england, 'London', 'Norway')
+    assert convoy_move == ConvoyMoveCommand(england, london, 'Norway')
+
+    transport = builder.convoy_transport(england, 'North Sea', 'London', 'Norway')
+    assert type(transport) is ConvoyTransportCommand
+    assert (transport.player, transport.unit, transport.transported_unit, transport.destination) == \
+           (england, north_sea, london, 'Norway')
+
+
+def test_rejects_what_constructors_reject():
+    game_map = generate_map()
+    england, france = _players(game_map)
+    builder = CommandBuilder(game_map, [england, france])
+
+    with pytest.raises(AssertionError):
+        builder.move(england, 'London', 'Edinburgh')
+    with pytest.raises(AssertionError):
+        builder.move(england, 'London', 'English Channel')
+    with pytest.raises(AssertionError):
+        builder.move(england, 'London', 'Atlantis')
+    with pytest.raises(AssertionError):
+        builder.move(france, 'London', 'Wales')
+    with pytest.raises(AssertionError):
+        builder.move(france, 'Spain North Coast', 'Spain South Coast')
+    with pytest.raises(AssertionError):
+        builder.support(france, 'Gascony', 'Spain North Coast', 'Western Mediterranean')
+    with pytest.raises(AssertionError):
+        builder.convoy_move(england, 'Yorkshire', 'Yorkshire')
+    with pytest.raises(AssertionError):
+        builder.convoy_transport(france, 'Spain North Coast', 'Gascony', 'London')
+    with pytest.raises(ValueError):
+        builder.hold(england, 'Wales')
+
+
+def test_trusted_builder_skips_validation():
+    game_map = generate_map()
+    england, france = _players(game_map)
+    builder = CommandBuilder(game_map, [england, france], trusted=True)
+
+    move = builder.move(england, 'London', 'Edinburgh')
+    assert move.destination == 'Edinburgh'
+    with pytest.raises(ValueError):
+        builder.move(england, 'Wales', 'London')
+
+
+def test_fails_like_constructors():
+    game_map = generate_map()
+    players = _players(game_map)
+    builder = CommandBuilder(game_map, players)
+    units = [(player, unit) for player in players for unit in player.units]
+
+    def outcome(build):
+        try:
+            build()
+        except (AssertionError, KeyError, ValueError) as error:
+            return type(error)
+        return None
+
+    for destination in sorted(game_map.name_map) + ['Atlantis']:
+        for player, unit in units:
+            position = unit.position
+            assert outcome(lambda: builder.move(player, position, destination)) == \
+                outcome(lambda: MoveCommand(player, unit, destination))
+            assert outcome(lambda: builder.convoy_move(player, position, destination)) == \
+                outcome(lambda: ConvoyMoveCommand(player, unit, destination))
+            for other in (other for _, other in units if other is not unit):
+                assert outcome(lambda: builder.support(player, position, other.position, destination)) == \
+                    outcome(lambda: SupportCommand(player, unit, other, destination))
+                assert outcome(lambda: builder.convoy_transport(player, position, other.position, destination)) == \
+                    outcome(lambda: ConvoyTransportCommand(player, unit, other, destination))
+
+    with pytest.raises(KeyError):
+        builder.convoy_move(players[0], 'London', 'Atlantis')
+    with pytest.raises(KeyError):
+        builder.convoy_transport(players[0], 'North Sea', 'London', 'Atlantis')
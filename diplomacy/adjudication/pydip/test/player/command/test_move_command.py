@@ -22,7 +22,7 @@
 import pytest
 
 from diplomacy.adjudication.pydip.map.predefined.vanilla_dip import generate_map
-from diplomacy.adjudication.pydip.player.command.command import HoldCommand, MoveCommand
+from diplomacy.adjudication.pydip.player.command.command import MOVE, HoldCommand, MoveCommand
 from diplomacy.adjudication.pydip.player.player import Player
 from diplomacy.adjudication.pydip.player.unit import UnitTypes
 
@@ -112,3 +112,4 @@ def test_hold():
 
     assert command.unit.position == 'Trieste'
     assert command.destination == 'Trieste'
+    assert command.kind == MOVE
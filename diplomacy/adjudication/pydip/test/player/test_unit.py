@@ -19,6 +19,9 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import pickle
+from copy import deepcopy
+
 from diplomacy.adjudication.pydip.player.unit import Unit, UnitTypes
 
 
@@ -52,3 +55,20 @@ def test_different_position_and_type_are_not_equal():
 
     assert not unit_a == unit_b
     assert unit_a != unit_b
+
+
+def test_equal_units_hash_equal():
+    unit_a = Unit(UnitTypes.TROOP, 'Trieste')
+    unit_b = Unit(UnitTypes.TROOP, 'Trieste')
+
+    assert hash(unit_a) == hash(unit_b)
+    assert {unit_a: 1}[unit_b] == 1
+
+
+def test_copied_units_are_equal():
+    unit = Unit(UnitTypes.FLEET, 'Finland Coast')
+
+    for copied in (deepcopy(unit), pickle.loads(pickle.dumps(unit))):
+        assert copied == unit
+        assert hash(copied) == hash(unit)
+        assert copied.unit_type == UnitTypes.FLEET
@@ -0,0 +1,61 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+
+
+def rotation_helper(supported=False):
+    """
+    Three armies moving in a circle, Galicia -> Bohemia -> Vienna -> Galicia. With supported, each move is
+    supported by a unit of the same country and a French army holds in Paris, away from the rotation.
+    """
+    germany = [CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Galicia', 'Bohemia')]
+    austria = [CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Bohemia', 'Vienna')]
+    turkey = [CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Vienna', 'Galicia')]
+    player_helpers = [PlayerHelper('Germany', germany), PlayerHelper('Austria', austria), PlayerHelper('Turkey', turkey)]
+
+    if supported:
+        germany.append(CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Silesia', 'Galicia', 'Bohemia'))
+        austria.append(CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Tyrolia', 'Bohemia', 'Vienna'))
+        turkey.append(CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Budapest', 'Vienna', 'Galicia'))
+        player_helpers.append(PlayerHelper('France', [CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Paris')]))
+
+    return TurnHelper(player_helpers)
+
+
+def pandins_paradox_helper():
+    """ Pandin's paradox (DATC 6.F.16): a convoy whose success decides whether its own supported attacker wins """
+    return TurnHelper([
+        PlayerHelper('England', [
+            CommandHelper(CommandType.MOVE, UnitTypes.FLEET, 'Wales Coast', 'English Channel'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.FLEET, 'London Coast', 'Wales Coast', 'English Channel'),
+        ]),
+        PlayerHelper('France', [
+            CommandHelper(CommandType.CONVOY_MOVE, UnitTypes.TROOP, 'Brest', 'London'),
+            CommandHelper(CommandType.CONVOY_TRANSPORT, UnitTypes.FLEET, 'English Channel', 'Brest', 'London'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.MOVE, UnitTypes.FLEET, 'Belgium Coast', 'English Channel'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.FLEET, 'North Sea', 'Belgium Coast', 'English Channel'),
+        ]),
+    ])
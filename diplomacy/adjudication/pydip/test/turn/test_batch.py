@@ -0,0 +1,92 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from concurrent.futures import ProcessPoolExecutor
+
+from diplomacy.adjudication.pydip.player.command.command import HoldCommand, MoveCommand, SupportCommand
+from diplomacy.adjudication.pydip.player.unit import Unit, UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.resolve import resolve_turn, resolve_turns_batch
+
+
+def _base_helper():
+    return TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Kiel'),
+        ]),
+    ])
+
+
+def _variants(helper):
+    france = helper.players['France']
+    germany = helper.players['Germany']
+
+    def unit(player, position):
+        return next(unit for unit in player.units if unit.position == position)
+
+    return [
+        [],
+        [MoveCommand(germany, unit(germany, 'Kiel'), 'Ruhr')],
+        [SupportCommand(germany, unit(germany, 'Kiel'), unit(germany, 'Munich'), 'Munich')],
+        [HoldCommand(france, unit(france, 'Burgundy')), MoveCommand(germany, unit(germany, 'Munich'), 'Burgundy')],
+    ]
+
+
+def _replaced(commands, variant):
+    replacements = {command.unit.position: command for command in variant}
+    return [replacements.get(command.unit.position, command) for command in commands]
+
+
+def test_variants_resolve_as_full_turns():
+    helper = _base_helper()
+    variants = _variants(helper)
+
+    results = resolve_turns_batch(helper.game_map, helper.commands, variants)
+    assert results == [
+        resolve_turn(helper.game_map, _replaced(helper.commands, variant)) for variant in variants
+    ]
+    assert results[0]['Germany'][Unit(UnitTypes.TROOP, 'Munich')] == {'Berlin', 'Silesia', 'Bohemia', 'Tyrolia'}
+    assert results[1]['Germany'][Unit(UnitTypes.TROOP, 'Munich')] is None
+    assert results[2]['France'][Unit(UnitTypes.TROOP, 'Burgundy')] is None
+    assert results[3]['Germany'][Unit(UnitTypes.TROOP, 'Munich')] is None
+
+
+def test_variants_do_not_affect_each_other():
+    helper = _base_helper()
+    variants = _variants(helper)
+
+    results = resolve_turns_batch(helper.game_map, helper.commands, variants[1:] + variants[:1])
+    assert results[-1] == helper.resolve()
+
+
+def test_variants_can_be_resolved_on_a_process_pool():
+    helper = _base_helper()
+    variants = _variants(helper)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = resolve_turns_batch(helper.game_map, helper.commands, variants, executor, chunk_size=3)
+    assert results == resolve_turns_batch(helper.game_map, helper.commands, variants)
@@ -0,0 +1,96 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import pytest
+
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.bounds import propagate_bounds
+from diplomacy.adjudication.pydip.turn.command_map import CommandMap
+from diplomacy.adjudication.pydip.turn.resolve import resolve_turn_by_bounds
+
+
+def _bounds(helper):
+    command_map = CommandMap(helper.game_map, helper.commands)
+    resolutions = propagate_bounds(command_map)
+    return {
+        helper.game_map.compiled.province_names[order]: resolutions[order] for order in command_map.orders
+    }
+
+
+def test_supported_attack_dislodges_and_cuts_support():
+    helper = TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Munich', 'Kiel', 'Kiel'),
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Kiel'),
+        ]),
+    ])
+
+    assert _bounds(helper) == {'Burgundy': True, 'Ruhr': True, 'Munich': False, 'Kiel': False}
+
+
+def test_hold_support_prevents_dislodgement():
+    helper = TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Kiel', 'Munich', 'Munich'),
+        ]),
+    ])
+
+    assert _bounds(helper) == {'Burgundy': False, 'Ruhr': True, 'Munich': False, 'Kiel': True}
+
+
+def test_circular_movement_is_left_undecided():
+    helper = TurnHelper([
+        PlayerHelper('Austria', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Galicia', 'Bohemia'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Bohemia', 'Vienna'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Vienna', 'Galicia'),
+        ]),
+        PlayerHelper('Russia', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Warsaw'),
+        ]),
+    ])
+
+    assert _bounds(helper) == {'Galicia': None, 'Bohemia': None, 'Vienna': None, 'Warsaw': False}
+    assert resolve_turn_by_bounds(helper.game_map, helper.commands) == helper.resolve()
+
+
+def test_convoys_are_not_supported():
+    helper = TurnHelper([
+        PlayerHelper('England', [
+            CommandHelper(CommandType.CONVOY_MOVE, UnitTypes.TROOP, 'London', 'Belgium'),
+            CommandHelper(CommandType.CONVOY_TRANSPORT, UnitTypes.FLEET, 'North Sea', 'London', 'Belgium'),
+        ]),
+    ])
+
+    with pytest.raises(AssertionError):
+        propagate_bounds(CommandMap(helper.game_map, helper.commands))
+    assert resolve_turn_by_bounds(helper.game_map, helper.commands) == helper.resolve()
@@ -0,0 +1,114 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.cluster_cache import ClusterCache, cluster_key
+from diplomacy.adjudication.pydip.turn.command_map import CommandMap
+from diplomacy.adjudication.pydip.turn.partition import partition_orders
+from diplomacy.adjudication.pydip.turn.resolve import resolve_turn, resolve_turn_partitioned
+
+
+def _keys(helper):
+    command_map = CommandMap(helper.game_map, helper.commands)
+    return [cluster_key(helper.game_map, command_map, cluster) for cluster in partition_orders(command_map)]
+
+
+def _bounce_helper(first, second, first_source, second_source, destination):
+    return TurnHelper([
+        PlayerHelper(first, [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, first_source, destination),
+        ]),
+        PlayerHelper(second, [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, second_source, destination),
+        ]),
+    ])
+
+
+def test_same_fight_elsewhere_has_same_key():
+    keys = _keys(_bounce_helper('Austria', 'Russia', 'Vienna', 'Galicia', 'Bohemia'))
+    assert keys == _keys(_bounce_helper('France', 'Germany', 'Burgundy', 'Ruhr', 'Munich'))
+
+
+def test_owners_are_part_of_the_key():
+    helper = TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Ruhr', 'Munich'),
+        ]),
+    ])
+    assert _keys(helper) != _keys(_bounce_helper('France', 'Germany', 'Burgundy', 'Ruhr', 'Munich'))
+
+
+def test_convoy_clusters_keep_their_territories():
+    def convoy_helper(source, destination):
+        return TurnHelper([
+            PlayerHelper('England', [
+                CommandHelper(CommandType.CONVOY_MOVE, UnitTypes.TROOP, source, destination),
+                CommandHelper(CommandType.CONVOY_TRANSPORT, UnitTypes.FLEET, 'North Sea', source, destination),
+            ]),
+        ])
+
+    assert _keys(convoy_helper('London', 'Belgium')) != _keys(convoy_helper('Yorkshire', 'Holland'))
+    assert _keys(convoy_helper('London', 'Belgium')) == _keys(convoy_helper('London', 'Belgium'))
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ClusterCache(max_size=2)
+    cache.put('a', (True,))
+    cache.put('b', (False,))
+    assert cache.get('a') == (True,)
+    cache.put('c', (True, True))
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == (True, True)
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.hit_rate == 2 / 3
+
+
+def test_cached_resolution_matches_resolve_turn():
+    cache = ClusterCache()
+    helper = TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Piedmont', 'Tyrolia'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+        ]),
+        PlayerHelper('Austria', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Vienna', 'Bohemia'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Trieste', 'Tyrolia'),
+        ]),
+        PlayerHelper('Russia', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Galicia', 'Bohemia'),
+        ]),
+    ])
+
+    expected = resolve_turn(helper.game_map, helper.commands)
+    assert resolve_turn_partitioned(helper.game_map, helper.commands, cache=cache) == expected
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert resolve_turn_partitioned(helper.game_map, helper.commands, cache=cache) == expected
+    assert (cache.hits, cache.misses) == (3, 2)
@@ -32,7 +32,25 @@ from diplomacy.adjudication.pydip.player.unit import UnitTypes
 from diplomacy.adjudication.pydip.turn.command_map import CommandMap
 
 
-# noinspection PyProtectedMember
+def _named_home_map(game_map, command_map):
+    names = game_map.compiled.province_names
+    return {names[order]: command_map.commands[order] for order in command_map.orders}
+
+
+def _named(game_map, command_map, index):
+    """ Translates a province-indexed list, or a (source, dest)-indexed dict, back to territory names """
+    names = game_map.compiled.province_names
+    if isinstance(index, dict):
+        return {
+            (names[source], names[dest]): [command_map.commands[order] for order in orders]
+            for (source, dest), orders in index.items()
+        }
+    return {
+        names[province]: [command_map.commands[order] for order in orders]
+        for province, orders in enumerate(index) if len(orders) > 0
+    }
+
+
 def test__move_command():
     game_map = generate_map()
     starting_configuration = [
@@ -42,14 +60,13 @@ def test__move_command():
     command = MoveCommand(player, player.units[0], 'Ankara')
     command_map = CommandMap(game_map, [command])
 
-    assert command_map._home_map == {'Smyrna': command}
-    assert command_map._attacker_map == {'Ankara': [command]}
-    assert command_map._convoy_attacker_map == dict()
-    assert command_map._transport_map == dict()
-    assert command_map._support_map == dict()
+    assert _named_home_map(game_map, command_map) == {'Smyrna': command}
+    assert _named(game_map, command_map, command_map.attackers) == {'Ankara': [command]}
+    assert _named(game_map, command_map, command_map.convoy_attackers) == dict()
+    assert _named(game_map, command_map, command_map.transports) == dict()
+    assert _named(game_map, command_map, command_map.supports) == dict()
 
 
-# noinspection PyProtectedMember
 def test__hold_command():
     game_map = generate_map()
     starting_configuration = [
@@ -59,14 +76,13 @@ def test__hold_command():
     command = HoldCommand(player, player.units[0])
     command_map = CommandMap(game_map, [command])
 
-    assert command_map._home_map == {'Smyrna': command}
-    assert command_map._attacker_map == {'Smyrna': [command]}
-    assert command_map._convoy_attacker_map == dict()
-    assert command_map._transport_map == dict()
-    assert command_map._support_map == dict()
+    assert _named_home_map(game_map, command_map) == {'Smyrna': command}
+    assert _named(game_map, command_map, command_map.attackers) == {'Smyrna': [command]}
+    assert _named(game_map, command_map, command_map.convoy_attackers) == dict()
+    assert _named(game_map, command_map, command_map.transports) == dict()
+    assert _named(game_map, command_map, command_map.supports) == dict()
 
 
-# noinspection PyProtectedMember
 def test__support_command():
     game_map = generate_map()
     starting_configuration = [
@@ -82,25 +98,24 @@ def test__support_command():
     support_command_2 = SupportCommand(player, player.units[3], player.units[2], 'Serbia')
     command_map = CommandMap(game_map, [move_command, support_command_1, hold_command, support_command_2])
 
-    assert command_map._home_map == {
+    assert _named_home_map(game_map, command_map) == {
         'Smyrna': move_command,
         'Armenia': support_command_1,
         'Serbia': hold_command,
         'Greece': support_command_2,
     }
-    assert command_map._attacker_map == {
+    assert _named(game_map, command_map, command_map.attackers) == {
         'Ankara': [move_command],
         'Serbia': [hold_command],
     }
-    assert command_map._convoy_attacker_map == dict()
-    assert command_map._transport_map == dict()
-    assert command_map._support_map == {
+    assert _named(game_map, command_map, command_map.convoy_attackers) == dict()
+    assert _named(game_map, command_map, command_map.transports) == dict()
+    assert _named(game_map, command_map, command_map.supports) == {
         ('Smyrna', 'Ankara'): [support_command_1],
         ('Serbia', 'Serbia'): [support_command_2],
     }
 
 
-# noinspection PyProtectedMember
 def test__convoy_move_command():
     game_map = generate_map()
     starting_configuration = [
@@ -110,14 +125,13 @@ def test__convoy_move_command():
     command = ConvoyMoveCommand(player, player.units[0], 'Sevastopol')
     command_map = CommandMap(game_map, [command])
 
-    assert command_map._home_map == {'Ankara': command}
-    assert command_map._attacker_map == dict()
-    assert command_map._convoy_attacker_map == {'Sevastopol': [command]}
-    assert command_map._transport_map == dict()
-    assert command_map._support_map == dict()
+    assert _named_home_map(game_map, command_map) == {'Ankara': command}
+    assert _named(game_map, command_map, command_map.attackers) == dict()
+    assert _named(game_map, command_map, command_map.convoy_attackers) == {'Sevastopol': [command]}
+    assert _named(game_map, command_map, command_map.transports) == dict()
+    assert _named(game_map, command_map, command_map.supports) == dict()
 
 
-# noinspection PyProtectedMember
 def test__convoy_transport_command():
     game_map = generate_map()
     starting_configuration = [
@@ -129,14 +143,13 @@ def test__convoy_transport_command():
     transport_command = ConvoyTransportCommand(player, player.units[1], player.units[0], 'Sevastopol')
     command_map = CommandMap(game_map, [move_command, transport_command])
 
-    assert command_map._home_map == {'Ankara': move_command, 'Black Sea': transport_command}
-    assert command_map._attacker_map == dict()
-    assert command_map._convoy_attacker_map == {'Sevastopol': [move_command]}
-    assert command_map._transport_map == {('Ankara', 'Sevastopol'): [transport_command]}
-    assert command_map._support_map == dict()
+    assert _named_home_map(game_map, command_map) == {'Ankara': move_command, 'Black Sea': transport_command}
+    assert _named(game_map, command_map, command_map.attackers) == dict()
+    assert _named(game_map, command_map, command_map.convoy_attackers) == {'Sevastopol': [move_command]}
+    assert _named(game_map, command_map, command_map.transports) == {('Ankara', 'Sevastopol'): [transport_command]}
+    assert _named(game_map, command_map, command_map.supports) == dict()
 
 
-# noinspection PyProtectedMember
 def test__several_commands():
     game_map = generate_map()
     starting_configuration = [
@@ -159,7 +172,7 @@ def test__several_commands():
     ]
     command_map = CommandMap(game_map, commands)
 
-    assert command_map._home_map == {
+    assert _named_home_map(game_map, command_map) == {
         'Ankara': commands[0],
         'Black Sea': commands[1],
         'Budapest': commands[2],
@@ -167,16 +180,63 @@ def test__several_commands():
         'Ukraine': commands[4],
         'Moscow': commands[5],
     }
-    assert command_map._attacker_map == {
+    assert _named(game_map, command_map, command_map.attackers) == {
         'Rumania': [commands[2]],
         'Sevastopol': [commands[3], commands[5]],
     }
-    assert command_map._convoy_attacker_map == {
+    assert _named(game_map, command_map, command_map.convoy_attackers) == {
         'Sevastopol': [commands[0]],
     }
-    assert command_map._transport_map == {
+    assert _named(game_map, command_map, command_map.transports) == {
         ('Ankara', 'Sevastopol'): [commands[1]],
     }
-    assert command_map._support_map == {
+    assert _named(game_map, command_map, command_map.supports) == {
         ('Rumania', 'Sevastopol'): [commands[4]],
     }
+    assert _named(game_map, command_map, command_map.combatants) == {
+        'Rumania': [commands[2]],
+        'Sevastopol': [commands[0], commands[3], commands[5]],
+    }
+
+
+def test__head_to_head_and_owner_supports():
+    game_map = generate_map()
+    names = game_map.compiled.province_names
+    austria = Player("Austria", game_map, [
+        {'territory_name': 'Vienna', 'unit_type': UnitTypes.TROOP},
+        {'territory_name': 'Tyrolia', 'unit_type': UnitTypes.TROOP},
+        {'territory_name': 'Galicia', 'unit_type': UnitTypes.TROOP},
+    ])
+    germany = Player("Germany", game_map, [
+        {'territory_name': 'Bohemia', 'unit_type': UnitTypes.TROOP},
+        {'territory_name': 'Silesia', 'unit_type': UnitTypes.TROOP},
+        {'territory_name': 'Munich', 'unit_type': UnitTypes.TROOP},
+    ])
+    vienna, tyrolia, galicia = austria.units
+    bohemia, silesia, munich = germany.units
+    commands = [
+        MoveCommand(austria, vienna, 'Bohemia'),
+        SupportCommand(austria, tyrolia, vienna, 'Bohemia'),
+        SupportCommand(germany, munich, vienna, 'Bohemia'),
+        SupportCommand(austria, galicia, vienna, 'Bohemia'),
+        MoveCommand(germany, bohemia, 'Vienna'),
+        HoldCommand(germany, silesia),
+    ]
+    command_map = CommandMap(game_map, commands)
+    province = game_map.compiled.province_id
+
+    assert names[command_map.head_to_head[province('Vienna')]] == 'Bohemia'
+    assert names[command_map.head_to_head[province('Bohemia')]] == 'Vienna'
+    assert names[command_map.head_to_head[province('Silesia')]] == 'Silesia'
+    assert command_map.head_to_head[province('Tyrolia')] is None
+    assert {
+        owner: [names[order] for order in orders]
+        for owner, orders in command_map.owner_supports[(province('Vienna'), province('Bohemia'))].items()
+    } == {'Austria': ['Tyrolia', 'Galicia'], 'Germany': ['Munich']}
+
+    changed = command_map.with_commands([HoldCommand(germany, bohemia)], removed=['Munich'])
+    assert changed.head_to_head[province('Vienna')] is None
+    assert names[changed.head_to_head[province('Bohemia')]] == 'Bohemia'
+    assert list(changed.owner_supports[(province('Vienna'), province('Bohemia'))]) == ['Austria']
+    assert names[command_map.head_to_head[province('Vienna')]] == 'Bohemia'
+    assert len(command_map.owner_supports[(province('Vienna'), province('Bohemia'))]) == 2
@@ -0,0 +1,113 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.command_map import CommandMap
+from diplomacy.adjudication.pydip.turn.dependency_graph import build_dependency_graph, is_cyclic, \
+    strongly_connected_components
+
+
+def _graph(helper):
+    command_map = CommandMap(helper.game_map, helper.commands)
+    compiled = helper.game_map.compiled
+    graph = build_dependency_graph(command_map)
+    components = strongly_connected_components(graph, command_map.orders)
+    return compiled, graph, components
+
+
+def _names(compiled, orders):
+    return {compiled.province_names[order] for order in orders}
+
+
+def test_hold_does_not_depend_on_itself():
+    helper = TurnHelper([
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+        ]),
+    ])
+    compiled, graph, components = _graph(helper)
+    munich = compiled.province_id('Munich')
+
+    assert graph[munich] == []
+    assert components == [[munich]]
+    assert not is_cyclic(graph, components[0])
+
+
+def test_components_are_listed_after_their_dependencies():
+    helper = TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Kiel', 'Ruhr'),
+        ]),
+    ])
+    compiled, graph, components = _graph(helper)
+
+    assert _names(compiled, graph[compiled.province_id('Burgundy')]) == {'Ruhr', 'Munich'}
+    assert _names(compiled, graph[compiled.province_id('Ruhr')]) == {'Kiel'}
+    assert not any(is_cyclic(graph, component) for component in components)
+    order = [compiled.province_names[component[0]] for component in components]
+    assert order.index('Kiel') < order.index('Ruhr') < order.index('Burgundy')
+    assert order.index('Munich') < order.index('Burgundy')
+
+
+def test_rotation_is_a_single_cyclic_component():
+    helper = TurnHelper([
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Galicia', 'Bohemia'),
+        ]),
+        PlayerHelper('Austria', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Bohemia', 'Vienna'),
+        ]),
+        PlayerHelper('Turkey', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Vienna', 'Galicia'),
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Serbia'),
+        ]),
+    ])
+    compiled, graph, components = _graph(helper)
+
+    cyclic = [component for component in components if is_cyclic(graph, component)]
+    assert len(cyclic) == 1
+    assert _names(compiled, cyclic[0]) == {'Galicia', 'Bohemia', 'Vienna'}
+    assert len(components) == 2
+
+
+def test_convoy_depends_on_its_transports():
+    helper = TurnHelper([
+        PlayerHelper('England', [
+            CommandHelper(CommandType.CONVOY_MOVE, UnitTypes.TROOP, 'London', 'Belgium'),
+            CommandHelper(CommandType.CONVOY_TRANSPORT, UnitTypes.FLEET, 'North Sea', 'London', 'Belgium'),
+        ]),
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.FLEET, 'English Channel', 'North Sea'),
+        ]),
+    ])
+    compiled, graph, components = _graph(helper)
+
+    assert _names(compiled, graph[compiled.province_id('London')]) == {'North Sea'}
+    assert _names(compiled, graph[compiled.province_id('North Sea')]) == {'English Channel'}
+    assert not any(is_cyclic(graph, component) for component in components)
@@ -0,0 +1,113 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from diplomacy.adjudication.pydip.map.predefined.vanilla_dip import generate_map
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.turn.command_map import CONVOY_MOVE, CONVOY_TRANSPORT, MOVE, SUPPORT
+from diplomacy.adjudication.pydip.turn.resolve import ResolutionBudget, ResolutionBudgetExceeded, resolve_turns_lockstep
+
+ENGLAND = 0
+FRANCE = 1
+GERMANY = 2
+
+
+def _game(compiled, units):
+    """ units: (owner, unit type, position, kind, target, source) tuples """
+    arrays = [[None] * compiled.territory_count for _ in range(5)]
+    for owner, unit_type, position, kind, target, source in units:
+        territory = compiled.territory_ids[position]
+        arrays[0][territory] = owner
+        arrays[1][territory] = unit_type
+        arrays[2][territory] = kind
+        arrays[3][territory] = None if target is None else compiled.territory_ids[target]
+        arrays[4][territory] = None if source is None else compiled.territory_ids[source]
+    return arrays
+
+
+def _games(compiled):
+    return [
+        _game(compiled, [
+            (FRANCE, UnitTypes.TROOP, 'Burgundy', MOVE, 'Munich', None),
+            (FRANCE, UnitTypes.TROOP, 'Ruhr', SUPPORT, 'Munich', 'Burgundy'),
+            (GERMANY, UnitTypes.TROOP, 'Munich', None, None, None),
+            (GERMANY, UnitTypes.TROOP, 'Kiel', None, None, None),
+        ]),
+        _game(compiled, [
+            (ENGLAND, UnitTypes.TROOP, 'London', CONVOY_MOVE, 'Belgium', None),
+            (ENGLAND, UnitTypes.FLEET, 'North Sea', CONVOY_TRANSPORT, 'Belgium', 'London'),
+            (FRANCE, UnitTypes.TROOP, 'Burgundy', MOVE, 'Belgium', None),
+        ]),
+        _game(compiled, []),
+    ]
+
+
+def _stack(games):
+    return [[game[index] for game in games] for index in range(5)]
+
+
+def test_games_resolve_independently():
+    game_map = generate_map()
+    compiled = game_map.compiled
+    territory = compiled.territory_ids
+
+    destinations, dislodged, retreats = resolve_turns_lockstep(game_map, *_stack(_games(compiled)))
+
+    assert destinations[0][territory['Burgundy']] == territory['Munich']
+    assert destinations[0][territory['Munich']] == territory['Munich']
+    assert destinations[0][territory['Kiel']] == territory['Kiel']
+    assert dislodged[0][territory['Munich']]
+    assert not dislodged[0][territory['Kiel']]
+    assert {compiled.territory_names[option] for option in retreats[0][territory['Munich']]} == {
+        'Berlin', 'Silesia', 'Bohemia', 'Tyrolia',
+    }
+    assert retreats[0][territory['Kiel']] is None
+
+    assert destinations[1][territory['London']] == territory['London']
+    assert destinations[1][territory['Burgundy']] == territory['Burgundy']
+    assert destinations[1][territory['North Sea']] == territory['North Sea']
+    assert not any(dislodged[1])
+
+    assert destinations[2] == [None] * compiled.territory_count
+    assert retreats[2] == [None] * compiled.territory_count
+
+
+def test_games_can_be_resolved_on_a_process_pool():
+    game_map = generate_map()
+    arrays = _stack(_games(game_map.compiled) * 3)
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = resolve_turns_lockstep(game_map, *arrays, executor=executor, chunk_size=2)
+    assert results == resolve_turns_lockstep(game_map, *arrays)
+
+
+def test_budget_limits_each_game():
+    game_map = generate_map()
+    arrays = _stack(_games(game_map.compiled))
+
+    with pytest.raises(ResolutionBudgetExceeded):
+        resolve_turns_lockstep(game_map, *arrays, budget=ResolutionBudget(max_resolve_calls=0))
+    with ProcessPoolExecutor(max_workers=1) as executor, pytest.raises(ResolutionBudgetExceeded):
+        resolve_turns_lockstep(game_map, *arrays, executor=executor, budget=ResolutionBudget(max_resolve_calls=0))
+    assert resolve_turns_lockstep(game_map, *arrays, budget=ResolutionBudget(max_resolve_calls=100)) == \
+        resolve_turns_lockstep(game_map, *arrays)
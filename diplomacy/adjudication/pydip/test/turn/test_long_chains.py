@@ -0,0 +1,87 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from diplomacy.adjudication.pydip.map.map import Map
+from diplomacy.adjudication.pydip.player.unit import Unit, UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+
+# Far deeper than the default recursion limit would allow a recursive resolver to follow
+CHAIN_LENGTH = 1500
+
+
+def _line_map(length, closed):
+    territory_descriptors = [{'name': 'P{}'.format(index), 'coasts': []} for index in range(length)]
+    adjacencies = [('P{}'.format(index), 'P{}'.format(index + 1)) for index in range(length - 1)]
+    if closed:
+        adjacencies.append(('P{}'.format(length - 1), 'P0'))
+    return Map(territory_descriptors, adjacencies)
+
+
+def test_long_chain_of_moves():
+    game_map = _line_map(CHAIN_LENGTH + 1, closed=False)
+    helper = TurnHelper([
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'P{}'.format(index), 'P{}'.format(index + 1))
+            for index in range(CHAIN_LENGTH)
+        ]),
+    ], game_map=game_map)
+
+    result = helper.resolve()
+    assert result == {
+        'Germany': {Unit(UnitTypes.TROOP, 'P{}'.format(index + 1)): None for index in range(CHAIN_LENGTH)},
+    }
+
+
+def test_long_chain_of_moves_blocked_at_the_end():
+    game_map = _line_map(CHAIN_LENGTH + 1, closed=False)
+    helper = TurnHelper([
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'P{}'.format(index), 'P{}'.format(index + 1))
+            for index in range(CHAIN_LENGTH)
+        ]),
+        PlayerHelper('France', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'P{}'.format(CHAIN_LENGTH)),
+        ]),
+    ], game_map=game_map)
+
+    result = helper.resolve()
+    assert result == {
+        'Germany': {Unit(UnitTypes.TROOP, 'P{}'.format(index)): None for index in range(CHAIN_LENGTH)},
+        'France': {Unit(UnitTypes.TROOP, 'P{}'.format(CHAIN_LENGTH)): None},
+    }
+
+
+def test_long_circular_movement():
+    game_map = _line_map(CHAIN_LENGTH, closed=True)
+    helper = TurnHelper([
+        PlayerHelper('Germany', [
+            CommandHelper(
+                CommandType.MOVE, UnitTypes.TROOP, 'P{}'.format(index), 'P{}'.format((index + 1) % CHAIN_LENGTH))
+            for index in range(CHAIN_LENGTH)
+        ]),
+    ], game_map=game_map)
+
+    result = helper.resolve()
+    assert result == {
+        'Germany': {Unit(UnitTypes.TROOP, 'P{}'.format(index)): None for index in range(CHAIN_LENGTH)},
+    }
@@ -0,0 +1,145 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.scenario_helper import pandins_paradox_helper, rotation_helper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.resolve import ResolutionBudget, ResolutionStats, resolve_turn
+
+
+def _outcomes(helper):
+    outcomes = list()
+    result = resolve_turn(helper.game_map, helper.commands, outcomes=outcomes)
+    assert result == helper.resolve()
+    assert [outcome.territory for outcome in outcomes] == [command.unit.position for command in helper.commands]
+    return {outcome.territory: outcome for outcome in outcomes}
+
+
+def test_bounces_and_cut_support():
+    helper = TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Picardy', 'Belgium'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Kiel', 'Munich', 'Munich'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Holland', 'Belgium'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Silesia', 'Berlin', 'Berlin'),
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Berlin'),
+        ]),
+        PlayerHelper('Russia', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Warsaw', 'Silesia'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Prussia', 'Berlin'),
+        ]),
+    ])
+
+    outcomes = _outcomes(helper)
+    burgundy = outcomes['Burgundy']
+    assert not burgundy.succeeded
+    assert burgundy.strength == 2
+    assert burgundy.bounced_with == ('Munich',)
+    assert outcomes['Munich'].succeeded
+    assert outcomes['Munich'].strength == 2
+    assert outcomes['Picardy'].bounced_with == ('Holland',)
+    assert outcomes['Holland'].bounced_with == ('Picardy',)
+
+    silesia = outcomes['Silesia']
+    assert not silesia.succeeded
+    assert silesia.cut_by == 'Warsaw'
+    assert silesia.dislodged_by is None
+    assert outcomes['Warsaw'].bounced_with == ('Silesia',)
+    assert outcomes['Berlin'].strength == 1
+    assert outcomes['Prussia'].bounced_with == ('Berlin',)
+    assert outcomes['Kiel'].cut_by is None
+
+
+def test_dislodged_units():
+    helper = TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Munich', 'Silesia', 'Berlin'),
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Silesia', 'Berlin'),
+        ]),
+    ])
+
+    outcomes = _outcomes(helper)
+    assert outcomes['Burgundy'].succeeded
+    assert outcomes['Burgundy'].strength == 2
+    assert outcomes['Burgundy'].bounced_with == ()
+
+    munich = outcomes['Munich']
+    assert not munich.succeeded
+    assert munich.cut_by == 'Burgundy'
+    assert munich.dislodged_by == 'Burgundy'
+    assert outcomes['Silesia'].succeeded
+    assert outcomes['Silesia'].strength == 1
+
+
+def test_disrupted_convoy_bounces_against_nothing():
+    helper = TurnHelper([
+        PlayerHelper('England', [
+            CommandHelper(CommandType.CONVOY_MOVE, UnitTypes.TROOP, 'London', 'Belgium'),
+            CommandHelper(CommandType.CONVOY_TRANSPORT, UnitTypes.FLEET, 'North Sea', 'London', 'Belgium'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.MOVE, UnitTypes.FLEET, 'Helgoland Bight', 'North Sea'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.FLEET, 'Skagerrak', 'Helgoland Bight', 'North Sea'),
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Belgium'),
+        ]),
+    ])
+
+    outcomes = _outcomes(helper)
+    assert outcomes['North Sea'].dislodged_by == 'Helgoland Bight'
+    assert not outcomes['London'].succeeded
+    assert outcomes['London'].strength == 0
+    assert outcomes['London'].bounced_with == ()
+    assert outcomes['Belgium'].succeeded
+
+
+def test_outcomes_need_no_adjudication():
+    helper = rotation_helper()
+    stats = ResolutionStats()
+    resolve_turn(helper.game_map, helper.commands, stats)
+    with_outcomes = ResolutionStats()
+
+    outcomes = list()
+    resolve_turn(helper.game_map, helper.commands, with_outcomes, outcomes=outcomes)
+    assert with_outcomes.adjudications == stats.adjudications
+    assert with_outcomes.guesses == stats.guesses
+    assert with_outcomes.resolve_calls == stats.resolve_calls
+    assert all(outcome.succeeded for outcome in outcomes)
+
+
+def test_outcomes_are_not_charged_to_the_budget():
+    for helper in (rotation_helper(), pandins_paradox_helper()):
+        stats = ResolutionStats()
+        expected = resolve_turn(helper.game_map, helper.commands, stats)
+
+        outcomes = list()
+        budget = ResolutionBudget(max_resolve_calls=stats.resolve_calls + stats.path_searches)
+        assert resolve_turn(helper.game_map, helper.commands, budget=budget, outcomes=outcomes) == expected
+        assert len(outcomes) == len(helper.commands)
@@ -0,0 +1,110 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from concurrent.futures import ProcessPoolExecutor
+
+from diplomacy.adjudication.pydip.player.unit import Unit, UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.partition import partition_commands
+from diplomacy.adjudication.pydip.turn.resolve import resolve_turn_partitioned
+
+
+def _positions(clusters):
+    return [[command.unit.position for command in cluster] for cluster in clusters]
+
+
+def _dislodgement_helper():
+    return TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+        ]),
+        PlayerHelper('Austria', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Vienna', 'Bohemia'),
+        ]),
+        PlayerHelper('Russia', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Galicia', 'Bohemia'),
+        ]),
+    ])
+
+
+def test_separate_fights_form_separate_clusters():
+    helper = _dislodgement_helper()
+
+    clusters = partition_commands(helper.game_map, helper.commands)
+    assert _positions(clusters) == [
+        ['Burgundy', 'Ruhr', 'Munich'],
+        ['Vienna', 'Galicia'],
+    ]
+
+
+def test_convoys_join_their_convoyed_unit():
+    helper = TurnHelper([
+        PlayerHelper('England', [
+            CommandHelper(CommandType.CONVOY_MOVE, UnitTypes.TROOP, 'London', 'Belgium'),
+            CommandHelper(CommandType.CONVOY_TRANSPORT, UnitTypes.FLEET, 'North Sea', 'London', 'Belgium'),
+            CommandHelper(CommandType.HOLD, UnitTypes.FLEET, 'Edinburgh Coast'),
+        ]),
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.FLEET, 'English Channel', 'North Sea'),
+        ]),
+    ])
+
+    clusters = partition_commands(helper.game_map, helper.commands)
+    assert _positions(clusters) == [
+        ['London', 'North Sea', 'English Channel'],
+        ['Edinburgh Coast'],
+    ]
+
+
+def test_retreats_account_for_other_clusters():
+    helper = _dislodgement_helper()
+
+    result = resolve_turn_partitioned(helper.game_map, helper.commands)
+    assert result == {
+        'France': {
+            Unit(UnitTypes.TROOP, 'Munich'): None,
+            Unit(UnitTypes.TROOP, 'Ruhr'): None,
+        },
+        'Germany': {
+            Unit(UnitTypes.TROOP, 'Munich'): {'Kiel', 'Berlin', 'Silesia', 'Tyrolia'},
+        },
+        'Austria': {
+            Unit(UnitTypes.TROOP, 'Vienna'): None,
+        },
+        'Russia': {
+            Unit(UnitTypes.TROOP, 'Galicia'): None,
+        },
+    }
+    assert result == helper.resolve()
+
+
+def test_clusters_can_be_resolved_on_a_process_pool():
+    helper = _dislodgement_helper()
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = resolve_turn_partitioned(helper.game_map, helper.commands, executor)
+    assert result == helper.resolve()
@@ -0,0 +1,144 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from diplomacy.adjudication.pydip.test.scenario_helper import rotation_helper
+from diplomacy.adjudication.pydip.turn.resolve import ResolutionBudget, ResolutionBudgetExceeded, \
+    ResolutionStats, ResolverSession, resolve_turn, resolve_turn_by_bounds, resolve_turn_by_components, \
+    resolve_turn_partitioned, resolve_turns_batch
+
+
+def test_turn_within_budget():
+    helper = rotation_helper(supported=True)
+    stats = ResolutionStats()
+    expected = resolve_turn(helper.game_map, helper.commands, stats)
+
+    calls = stats.resolve_calls + stats.path_searches
+    budget = ResolutionBudget(max_resolve_calls=calls, time_limit=60)
+    assert resolve_turn(helper.game_map, helper.commands, budget=budget) == expected
+    # the budget limits every turn on its own
+    assert resolve_turn(helper.game_map, helper.commands, budget=budget) == expected
+
+    with pytest.raises(ResolutionBudgetExceeded) as exceeded:
+        resolve_turn(helper.game_map, helper.commands, budget=ResolutionBudget(max_resolve_calls=calls - 1))
+    assert exceeded.value.resolve_calls == calls
+
+
+def test_exceeded_budget_names_cycle():
+    helper = rotation_helper()
+
+    for resolver in (resolve_turn, resolve_turn_by_components, resolve_turn_by_bounds):
+        with pytest.raises(ResolutionBudgetExceeded) as exceeded:
+            resolver(helper.game_map, helper.commands, budget=ResolutionBudget(max_resolve_calls=3))
+        assert exceeded.value.cycle == ['Bohemia', 'Galicia', 'Vienna']
+        assert exceeded.value.resolve_calls == 4
+
+
+def test_exceeded_budget_outside_of_cycle():
+    helper = rotation_helper(supported=True)
+
+    with pytest.raises(ResolutionBudgetExceeded) as exceeded:
+        resolve_turn(helper.game_map, helper.commands, budget=ResolutionBudget(max_resolve_calls=0))
+    assert exceeded.value.cycle is None
+    assert 'outside of any dependency cycle' in str(exceeded.value)
+
+
+def test_exceeded_time_limit():
+    helper = rotation_helper(supported=True)
+
+    with pytest.raises(ResolutionBudgetExceeded):
+        resolve_turn(helper.game_map, helper.commands, budget=ResolutionBudget(time_limit=0))
+
+
+def test_budget_through_turn_helper():
+    helper = rotation_helper()
+
+    with pytest.raises(ResolutionBudgetExceeded) as exceeded:
+        helper.resolve(budget=ResolutionBudget(max_resolve_calls=3))
+    assert exceeded.value.cycle == ['Bohemia', 'Galicia', 'Vienna']
+
+
+def test_budget_limits_each_cluster_and_variant():
+    helper = rotation_helper(supported=True)
+    stats = ResolutionStats()
+    expected = resolve_turn(helper.game_map, helper.commands, stats)
+    # the French hold is a cluster of its own, and a variant of the turn
+    budget = ResolutionBudget(max_resolve_calls=stats.resolve_calls + stats.path_searches)
+    hold = [command for command in helper.commands if command.unit.position == 'Paris']
+
+    assert resolve_turn_partitioned(helper.game_map, helper.commands, budget=budget) == expected
+    assert resolve_turns_batch(helper.game_map, helper.commands, [[], hold], budget=budget) == [expected, expected]
+
+    budget = ResolutionBudget(max_resolve_calls=3)
+    with pytest.raises(ResolutionBudgetExceeded):
+        resolve_turn_partitioned(helper.game_map, helper.commands, budget=budget)
+    with pytest.raises(ResolutionBudgetExceeded):
+        resolve_turns_batch(helper.game_map, helper.commands, [[]], budget=budget)
+
+
+def test_budget_limits_variants_resolved_at_the_same_time():
+    helper = rotation_helper(supported=True)
+    stats = ResolutionStats()
+    expected = resolve_turn(helper.game_map, helper.commands, stats)
+    budget = ResolutionBudget(max_resolve_calls=stats.resolve_calls + stats.path_searches)
+
+    # switch threads as often as possible, so that variants interleave
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = resolve_turns_batch(helper.game_map, helper.commands, [[]] * 200, executor=executor,
+                                          chunk_size=1, budget=budget)
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert results == [expected] * 200
+
+
+def test_exceeded_budget_leaves_session_unchanged():
+    helper = rotation_helper()
+    galicia = next(command for command in helper.commands if command.unit.position == 'Galicia')
+    others = [command for command in helper.commands if command is not galicia]
+    stats = ResolutionStats()
+    resolve_turn(helper.game_map, others, stats)
+    # enough for the turn without the rotation, but not for the rotation
+    session = ResolverSession(helper.game_map, others, budget=ResolutionBudget(max_resolve_calls=stats.resolve_calls))
+    result = session.resolve()
+
+    with pytest.raises(ResolutionBudgetExceeded):
+        session.set_command(galicia)
+    assert session.commands == others
+    assert session.resolve() == result
+
+    session.budget = None
+    session.set_command(galicia)
+    assert session.resolve() == helper.resolve()
+
+
+def test_exceeded_budget_survives_pickling():
+    exceeded = ResolutionBudgetExceeded(['Bohemia', 'Galicia', 'Vienna'], 4)
+    unpickled = pickle.loads(pickle.dumps(exceeded))
+    assert unpickled.cycle == exceeded.cycle
+    assert unpickled.resolve_calls == 4
+    assert str(unpickled) == str(exceeded)
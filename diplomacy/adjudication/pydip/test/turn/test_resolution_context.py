@@ -0,0 +1,86 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from concurrent.futures import ThreadPoolExecutor
+
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.scenario_helper import rotation_helper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.command_map import CommandMap
+from diplomacy.adjudication.pydip.turn.resolve import ResolutionContext, ResolutionState, _resolve
+
+
+def _bounce_helper():
+    return TurnHelper([
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Berlin', 'Silesia'),
+        ]),
+        PlayerHelper('Russia', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Warsaw', 'Silesia'),
+        ]),
+    ])
+
+
+def _convoy_paradox_helper():
+    return TurnHelper([
+        PlayerHelper('England', [
+            CommandHelper(CommandType.MOVE, UnitTypes.FLEET, 'Edinburgh Coast', 'North Sea'),
+            CommandHelper(CommandType.MOVE, UnitTypes.FLEET, 'London Coast', 'English Channel'),
+        ]),
+        PlayerHelper('France', [
+            CommandHelper(CommandType.CONVOY_MOVE, UnitTypes.TROOP, 'Brest', 'London'),
+            CommandHelper(CommandType.CONVOY_TRANSPORT, UnitTypes.FLEET, 'English Channel', 'Brest', 'London'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.FLEET, 'Belgium Coast', 'English Channel', 'English Channel'),
+        ]),
+    ])
+
+
+def test_contexts_do_not_share_state():
+    helper_a = rotation_helper()
+    helper_b = _bounce_helper()
+    context_a = ResolutionContext(helper_a.game_map, CommandMap(helper_a.game_map, helper_a.commands))
+    context_b = ResolutionContext(helper_b.game_map, CommandMap(helper_b.game_map, helper_b.commands))
+
+    orders_a = context_a.command_map.orders
+    orders_b = context_b.command_map.orders
+    assert _resolve(context_a, orders_a[0])
+    assert not _resolve(context_b, orders_b[0])
+    assert _resolve(context_a, orders_a[1])
+    assert not _resolve(context_b, orders_b[1])
+
+    assert all(context_a.states[order] == ResolutionState.RESOLVED for order in orders_a)
+    assert all(context_b.states[order] == ResolutionState.RESOLVED for order in orders_b)
+    assert context_a.resolutions[orders_a[2]]
+    assert not any(context_b.resolutions)
+    assert context_a.dependency_list == []
+    assert context_b.dependency_list == []
+
+
+def test_concurrent_resolution_matches_sequential():
+    helpers = [rotation_helper(), _bounce_helper(), _convoy_paradox_helper()] * 20
+    expected = [helper.resolve() for helper in helpers]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda helper: helper.resolve(), helpers))
+
+    assert results == expected
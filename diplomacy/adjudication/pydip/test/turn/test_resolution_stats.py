@@ -0,0 +1,87 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.scenario_helper import pandins_paradox_helper, rotation_helper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.command_map import CONVOY_MOVE, CONVOY_TRANSPORT, MOVE, SUPPORT
+from diplomacy.adjudication.pydip.turn.resolve import ResolutionStats, resolve_turn
+
+
+def _supported_attack_helper():
+    return TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+        ]),
+    ])
+
+
+def test_turn_without_cycles():
+    helper = _supported_attack_helper()
+    stats = ResolutionStats()
+
+    assert resolve_turn(helper.game_map, helper.commands, stats) == helper.resolve()
+    assert stats.adjudications[MOVE] == 2
+    assert stats.adjudications[SUPPORT] == 1
+    assert stats.adjudications[CONVOY_MOVE] == stats.adjudications[CONVOY_TRANSPORT] == 0
+    assert stats.guesses == 3
+    assert stats.max_dependency_depth == 0
+    assert stats.resolve_calls >= len(helper.commands)
+    assert stats.path_searches == 0
+    assert stats.paradoxes == []
+    assert stats.wall_time > 0
+
+
+def test_circular_movement_is_reported():
+    helper = rotation_helper()
+    stats = ResolutionStats()
+
+    resolve_turn(helper.game_map, helper.commands, stats)
+    assert stats.circular_movement_rules == 1
+    assert stats.szykman_rules == 0
+    assert stats.paradoxes == [['Bohemia', 'Galicia', 'Vienna']]
+    assert stats.max_dependency_depth == 3
+
+
+def test_pandins_paradox_is_reported():
+    helper = pandins_paradox_helper()
+    stats = ResolutionStats()
+
+    resolve_turn(helper.game_map, helper.commands, stats)
+    assert stats.szykman_rules == 1
+    assert stats.circular_movement_rules == 0
+    assert len(stats.paradoxes) == 1
+    assert 'English Channel' in stats.paradoxes[0]
+    assert stats.path_searches > 0
+
+
+def test_stats_total_many_turns():
+    stats = ResolutionStats()
+    for helper in (_supported_attack_helper(), rotation_helper()):
+        resolve_turn(helper.game_map, helper.commands, stats)
+
+    assert sum(stats.adjudications) >= 6
+    assert stats.circular_movement_rules == 1
@@ -0,0 +1,100 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from diplomacy.adjudication.pydip.player.command.command import HoldCommand, MoveCommand, SupportCommand
+from diplomacy.adjudication.pydip.player.unit import Unit, UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.resolve import ResolverSession, resolve_turn
+
+
+def _helper():
+    return TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Ruhr'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Kiel'),
+        ]),
+        PlayerHelper('Austria', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Vienna', 'Bohemia'),
+        ]),
+        PlayerHelper('Russia', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Galicia', 'Bohemia'),
+        ]),
+    ])
+
+
+def _unit(helper, player_name, position):
+    return next(unit for unit in helper.players[player_name].units if unit.position == position)
+
+
+def test_session_matches_resolve_turn():
+    helper = _helper()
+
+    session = ResolverSession(helper.game_map, helper.commands)
+    assert session.resolve() == helper.resolve()
+    assert session.last_resolved == 6
+
+
+def test_changed_command_only_resolves_its_fight():
+    helper = _helper()
+    france = helper.players['France']
+    session = ResolverSession(helper.game_map, helper.commands)
+
+    session.set_command(SupportCommand(france, _unit(helper, 'France', 'Ruhr'), _unit(helper, 'France', 'Burgundy'),
+                                       'Munich'))
+    result = session.resolve()
+    assert result['France'][Unit(UnitTypes.TROOP, 'Munich')] is None
+    assert result['Germany'][Unit(UnitTypes.TROOP, 'Munich')] == {'Berlin', 'Silesia', 'Tyrolia'}
+    assert result == resolve_turn(helper.game_map, session.commands)
+    assert session.last_resolved == 3
+
+    session.set_command(MoveCommand(helper.players['Germany'], _unit(helper, 'Germany', 'Kiel'), 'Ruhr'))
+    result = session.resolve()
+    assert result['Germany'][Unit(UnitTypes.TROOP, 'Munich')] is None
+    assert result == resolve_turn(helper.game_map, session.commands)
+    assert session.last_resolved == 4
+
+
+def test_added_and_removed_commands():
+    helper = _helper()
+    germany = helper.players['Germany']
+    session = ResolverSession(helper.game_map, helper.commands)
+
+    session.remove_command('Galicia')
+    result = session.resolve()
+    assert result['Austria'] == {Unit(UnitTypes.TROOP, 'Bohemia'): None}
+    assert 'Russia' not in result
+    assert result == resolve_turn(helper.game_map, session.commands)
+    assert session.last_resolved == 1
+
+    session.set_command(HoldCommand(helper.players['Russia'], _unit(helper, 'Russia', 'Galicia')))
+    assert session.resolve() == resolve_turn(helper.game_map, session.commands)
+    assert len(session.commands) == 6
+
+    session.set_command(SupportCommand(germany, _unit(helper, 'Germany', 'Kiel'), _unit(helper, 'Germany', 'Munich'),
+                                       'Munich'))
+    session.remove_command('Munich')
+    assert session.resolve() == resolve_turn(helper.game_map, session.commands)
+    assert session.resolve()['France'][Unit(UnitTypes.TROOP, 'Munich')] is None
@@ -0,0 +1,100 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from diplomacy.adjudication.pydip.player.unit import UnitTypes
+from diplomacy.adjudication.pydip.test.command_helper import CommandHelper, CommandType
+from diplomacy.adjudication.pydip.test.player_helper import PlayerHelper
+from diplomacy.adjudication.pydip.test.scenario_helper import pandins_paradox_helper
+from diplomacy.adjudication.pydip.test.turn_helper import TurnHelper
+from diplomacy.adjudication.pydip.turn.command_map import CommandMap
+from diplomacy.adjudication.pydip.turn.resolve import ResolutionContext, ResolutionState, \
+    _cached_attack_strength, _resolve, _run
+
+
+def _context(helper):
+    return ResolutionContext(helper.game_map, CommandMap(helper.game_map, helper.commands))
+
+
+def _supported_attack_context():
+    helper = TurnHelper([
+        PlayerHelper('France', [
+            CommandHelper(CommandType.MOVE, UnitTypes.TROOP, 'Burgundy', 'Munich'),
+            CommandHelper(CommandType.SUPPORT, UnitTypes.TROOP, 'Ruhr', 'Burgundy', 'Munich'),
+        ]),
+        PlayerHelper('Germany', [
+            CommandHelper(CommandType.HOLD, UnitTypes.TROOP, 'Munich'),
+        ]),
+    ])
+    context = _context(helper)
+    compiled = helper.game_map.compiled
+    return context, compiled.province_id('Burgundy'), compiled.province_id('Ruhr')
+
+
+def test_pandins_paradox_uses_cache_while_guessing():
+    helper = pandins_paradox_helper()
+    context = _context(helper)
+
+    results = [_resolve(context, order) for order in context.command_map.orders]
+    assert results == [False, True, False, False, False, True]
+    assert context.strength_cache.misses > 0
+
+
+def test_settled_strength_is_reused():
+    context, attack, _ = _supported_attack_context()
+    for order in context.command_map.orders:
+        _resolve(context, order)
+
+    assert _run(context, _cached_attack_strength(context, attack)) == 2
+    assert _run(context, _cached_attack_strength(context, attack)) == 2
+    assert context.strength_cache.misses == 1
+    assert context.strength_cache.hits == 1
+
+
+def test_guessed_strength_is_dropped_when_generation_changes():
+    context, attack, support = _supported_attack_context()
+    context.states[support] = ResolutionState.GUESSING
+    context.resolutions[support] = True
+    context.dependency_list.append(support)
+
+    assert _run(context, _cached_attack_strength(context, attack)) == 2
+    misses = context.strength_cache.misses
+    assert _run(context, _cached_attack_strength(context, attack)) == 2
+    assert context.strength_cache.hits == 1
+    assert context.strength_cache.misses == misses
+
+    context.resolutions[support] = False
+    context.generation += 1
+
+    assert _run(context, _cached_attack_strength(context, attack)) == 1
+    assert context.strength_cache.misses > misses
+
+
+def test_clear_forgets_settled_strengths():
+    context, attack, _ = _supported_attack_context()
+    for order in context.command_map.orders:
+        _resolve(context, order)
+
+    _run(context, _cached_attack_strength(context, attack))
+    context.strength_cache.clear()
+    _run(context, _cached_attack_strength(context, attack))
+
+    assert context.strength_cache.hits == 0
+    assert context.strength_cache.misses == 2
@@ -41,8 +41,8 @@ class TurnHelper:
         }
         self.commands = self._build_commands(player_helpers)
 
-    def resolve(self):
-        return resolve_turn(self.game_map, self.commands)
+    def resolve(self, budget=None):
+        return resolve_turn(self.game_map, self.commands, budget=budget)
 
     def _build_commands(self, player_helpers):
         commands = []
@@ -20,5 +20,9 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from diplomacy.adjudication.pydip.turn.adjustment import resolve_adjustment
-from diplomacy.adjudication.pydip.turn.resolve import resolve_turn
+from diplomacy.adjudication.pydip.turn.cluster_cache import ClusterCache
+from diplomacy.adjudication.pydip.turn.partition import partition_commands
+from diplomacy.adjudication.pydip.turn.resolve import OrderOutcome, ResolutionBudget, ResolutionBudgetExceeded, \
+    ResolutionStats, ResolverSession, resolve_turn, resolve_turn_by_bounds, resolve_turn_by_components, \
+    resolve_turn_partitioned, resolve_turns_batch, resolve_turns_lockstep
 from diplomacy.adjudication.pydip.turn.retreat import resolve_retreats
@@ -21,6 +21,7 @@
 
 from copy import deepcopy
 
+from diplomacy.adjudication.pydip.map.compiled_map import bits_of, ids_of
 from diplomacy.adjudication.pydip.map.map import OwnershipMap
 from diplomacy.adjudication.pydip.player.command.adjustment_command import AdjustmentCommand, AdjustmentCreateCommand, \
     AdjustmentDisbandCommand
@@ -46,25 +47,26 @@ def calculate_adjustments(ownership_map, player_units):
     player must disband units this turn.
     """
     all_players = ownership_map.owned_territories.keys()
-    new_owned_territories = {player: set() for player in all_players}
+    compiled = ownership_map.supply_map.game_map.compiled
+    province_names = compiled.province_names
 
+    # Sets of provinces are held as bitsets over province ids, see CompiledMap
+    supply_centers = _province_bits(compiled, ownership_map.supply_map.supply_centers)
+    occupied = {
+        player: bits_of(compiled.province_id(unit.position) for unit in player_units[player])
+        for player in all_players
+    }
+
+    new_owned_territories = dict()
     for player in all_players:
-        other_player_positions = set()
+        other_player_positions = 0
         for other_player in all_players:
             if other_player != player:
-                other_player_positions |= {
-                    ownership_map.supply_map.game_map.relevant_name_for_territory(unit.position)
-                    for unit in player_units[other_player]
-                }
+                other_player_positions |= occupied[other_player]
 
-        for territory in ownership_map.owned_territories[player]:
-            if (territory not in other_player_positions) and (territory in ownership_map.supply_map.supply_centers):
-                new_owned_territories[player].add(territory)
-
-        for unit in player_units[player]:
-            relevant_territory = ownership_map.supply_map.game_map.relevant_name_for_territory(unit.position)
-            if relevant_territory in ownership_map.supply_map.supply_centers:
-                new_owned_territories[player].add(relevant_territory)
+        owned = _province_bits(compiled, ownership_map.owned_territories[player])
+        owned = (owned & ~other_player_positions & supply_centers) | (occupied[player] & supply_centers)
+        new_owned_territories[player] = {province_names[province] for province in ids_of(owned)}
 
     new_ownership_map = OwnershipMap(
         ownership_map.supply_map,
@@ -79,6 +81,13 @@ def calculate_adjustments(ownership_map, player_units):
     return new_ownership_map, adjustment_counts
 
 
+def _province_bits(compiled, province_names):
+    """ Bitset of the province ids of the given province names """
+    territory_ids = compiled.territory_ids
+    province_of = compiled.province_of
+    return bits_of(province_of[territory_ids[name]] for name in province_names)
+
+
 def resolve_adjustment__validated(ownership_map, adjustment_counts, player_units, commands):
     """
     Given an OwnershipMap representing the current board state, a mapping of adjustment expectations
@@ -0,0 +1,190 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from diplomacy.adjudication.pydip.turn.command_map import CONVOY_MOVE, CONVOY_TRANSPORT, MOVE, SUPPORT
+
+
+def propagate_bounds(command_map):
+    """
+    Returns province -> bool (None where undecided), resolving the orders of a
+    turn without convoys by propagating bounds on their strengths to a fixed
+    point.
+
+    Every strength of resolve.py is evaluated as a range, counting undecided
+    orders as both failing and succeeding. An order is decided as soon as its
+    ranges leave a single outcome, and the orders whose strengths may have
+    been waiting on it are evaluated again. Orders still undecided at the
+    fixed point are in a cycle (e.g. circular movement), and are left to the
+    guessing and backup rules of resolve.py.
+
+    The orders evaluated again are found from the command map, rather than by
+    building the dependency graph. Missing one would only leave it undecided,
+    and so to resolve.py, which is why bounds never need to be exact.
+    """
+    kinds = command_map.kinds
+    attackers = command_map.attackers
+    assert all(kinds[order] != CONVOY_MOVE and kinds[order] != CONVOY_TRANSPORT for order in command_map.orders)
+
+    resolutions = [None] * len(kinds)
+    to_visit = list(reversed(command_map.orders))
+    queued = [False] * len(kinds)
+    for order in to_visit:
+        queued[order] = True
+    while len(to_visit) > 0:
+        order = to_visit.pop()
+        queued[order] = False
+        if kinds[order] == MOVE and command_map.destinations[order] == order:
+            # a hold is a move to its own province, which never succeeds
+            resolution = False
+        elif kinds[order] == MOVE:
+            resolution = _move_bounds(command_map, resolutions, order)
+        elif kinds[order] == SUPPORT:
+            resolution = _support_bounds(command_map, resolutions, order)
+        else:
+            raise ValueError("Command unexpected type")
+        if resolution is None:
+            continue
+        resolutions[order] = resolution
+
+        # evaluate again the orders whose strengths may have been waiting on this one
+        if kinds[order] == MOVE:
+            destination = command_map.destinations[order]
+            dependents = attackers[order] + attackers[destination] + [destination]
+        else:
+            destination = command_map.destinations[order]
+            dependents = attackers[destination] + [destination, command_map.sources[order]]
+        for dependent in dependents:
+            if resolutions[dependent] is None and not queued[dependent] and kinds[dependent] is not None:
+                queued[dependent] = True
+                to_visit.append(dependent)
+    return resolutions
+
+
+def _move_bounds(command_map, resolutions, order):
+    attack_low, attack_high = _attack_bounds(command_map, resolutions, order)
+
+    prevent_low = prevent_high = 0
+    destination = command_map.destinations[order]
+    for combatant in command_map.attackers[destination]:
+        if combatant == order:
+            continue
+        low, high = _prevent_bounds(command_map, resolutions, combatant)
+        prevent_low = max(prevent_low, low)
+        prevent_high = max(prevent_high, high)
+    if attack_high <= prevent_low:
+        return False
+
+    head_to_head_combatant = command_map.head_to_head[order]
+    if head_to_head_combatant is not None:
+        defenders = _move_supporters(command_map, head_to_head_combatant)
+        opposing_low, opposing_high = _count_bounds(command_map, resolutions, defenders)
+    else:
+        opposing_low, opposing_high = _hold_bounds(command_map, resolutions, destination)
+    if attack_high <= opposing_low:
+        return False
+    if attack_low > prevent_high and attack_low > opposing_high:
+        return True
+    return None
+
+
+def _attack_bounds(command_map, resolutions, order):
+    kinds = command_map.kinds
+    attacked_order = command_map.destinations[order]
+    supporters = _move_supporters(command_map, order)
+    if kinds[attacked_order] is None:
+        return _count_bounds(command_map, resolutions, supporters)
+
+    low = high = None
+    if command_map.head_to_head[order] is None and kinds[attacked_order] == MOVE and \
+            resolutions[attacked_order] is not False:
+        # the attacked unit moves away, or might
+        low, high = _count_bounds(command_map, resolutions, supporters)
+        if resolutions[attacked_order]:
+            return low, high
+
+    attacked_owner = command_map.owners[attacked_order]
+    if attacked_owner == command_map.owners[order]:
+        staying_low = staying_high = 0
+    else:
+        staying_low, staying_high = _count_bounds(command_map, resolutions, supporters, attacked_owner)
+    if low is None:
+        return staying_low, staying_high
+    return min(low, staying_low), max(high, staying_high)
+
+
+def _prevent_bounds(command_map, resolutions, order):
+    low, high = _count_bounds(command_map, resolutions, _move_supporters(command_map, order))
+    head_to_head_combatant = command_map.head_to_head[order]
+    if head_to_head_combatant is not None and resolutions[head_to_head_combatant] is not False:
+        if resolutions[head_to_head_combatant]:
+            return 0, 0
+        return 0, high
+    return low, high
+
+
+def _hold_bounds(command_map, resolutions, province):
+    kind = command_map.kinds[province]
+    if kind is None:
+        return 0, 0
+    if kind == MOVE:
+        if resolutions[province] is None:
+            return 0, 1
+        return (0, 0) if resolutions[province] else (1, 1)
+    return _count_bounds(command_map, resolutions, command_map.supports.get((province, province), []))
+
+
+def _move_supporters(command_map, order):
+    return command_map.supports.get((order, command_map.destinations[order]), [])
+
+
+def _count_bounds(command_map, resolutions, supporters, excluded_owner=None):
+    """ Bounds on 1 plus the number of successful supporters, ignoring those of excluded_owner """
+    low = high = 1
+    for supporter in supporters:
+        if excluded_owner is not None and command_map.owners[supporter] == excluded_owner:
+            continue
+        resolution = resolutions[supporter]
+        if resolution is not False:
+            high += 1
+            if resolution:
+                low += 1
+    return low, high
+
+
+def _support_bounds(command_map, resolutions, order):
+    supported_order = command_map.sources[order]
+    if command_map.kinds[supported_order] == MOVE:
+        if command_map.destination_territories[supported_order] != command_map.destination_territories[order]:
+            return False
+    elif command_map.destination_territories[order] != command_map.source_territories[order]:
+        return False
+
+    destination = command_map.destination_territories[order]
+    owner = command_map.owners[order]
+    undecided = False
+    for attacker in command_map.attackers[order]:
+        if command_map.positions[attacker] != destination and command_map.owners[attacker] != owner:
+            # cut
+            return False
+        if resolutions[attacker]:
+            # dislodged
+            return False
+        undecided = undecided or resolutions[attacker] is None
+    return None if undecided else True
@@ -0,0 +1,127 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+
+from diplomacy.adjudication.pydip.turn.command_map import CONVOY_MOVE, CONVOY_TRANSPORT
+
+
+class ClusterCache:
+    """
+    Bounded least-recently-used cache of cluster resolutions (see
+    partition.partition_orders), keyed by cluster_key. Can be shared between
+    turns, and between maps.
+    """
+
+    """ int -- maximum number of clusters remembered """
+    max_size = None
+
+    """ int -- clusters whose resolutions were found in the cache """
+    hits = 0
+
+    """ int -- clusters that had to be resolved """
+    misses = 0
+
+    """ int -- clusters forgotten to make room for newer ones """
+    evictions = 0
+
+    def __init__(self, max_size=100000):
+        assert max_size > 0
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def get(self, key):
+        """ Returns the cached resolutions for key, or None """
+        resolutions = self._entries.get(key)
+        if resolutions is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return resolutions
+
+    def put(self, key, resolutions):
+        self._entries[key] = resolutions
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+def cluster_key(game_map, command_map, cluster):
+    """
+    Returns a hashable canonical form of a cluster of orders: for each order,
+    in order, its kind, unit type and owner, and the territories and provinces
+    it involves. Owners, territories and provinces are relabelled in order of
+    first appearance, so that the same fight between different players, or in
+    a different part of the map, has the same key.
+
+    Adjudicating a cluster only looks at how its orders relate to each other,
+    except for convoy routes, which depend on the geography of the map. So
+    clusters with convoys keep their actual territory and province ids, and
+    are keyed to the map as well.
+    """
+    kinds = command_map.kinds
+    owners = dict()
+    territories = dict()
+    provinces = dict()
+    convoys = False
+    form = list()
+    for order in cluster:
+        kind = kinds[order]
+        convoys = convoys or kind == CONVOY_MOVE or kind == CONVOY_TRANSPORT
+        source = command_map.sources[order]
+        form.append((
+            kind,
+            command_map.commands[order].unit.unit_type,
+            owners.setdefault(command_map.owners[order], len(owners)),
+            provinces.setdefault(order, len(provinces)),
+            territories.setdefault(command_map.positions[order], len(territories)),
+            provinces.setdefault(command_map.destinations[order], len(provinces)),
+            territories.setdefault(command_map.destination_territories[order], len(territories)),
+            None if source is None else provinces.setdefault(source, len(provinces)),
+            None if source is None else territories.setdefault(command_map.source_territories[order], len(territories)),
+        ))
+
+    if not convoys:
+        return tuple(form)
+    return (game_map.compiled,) + tuple(
+        (kinds[order], unit_type, owner, command_map.positions[order],
+         command_map.destination_territories[order], command_map.source_territories[order])
+        for order, (_, unit_type, owner, _, _, _, _, _, _) in zip(cluster, form)
+    )
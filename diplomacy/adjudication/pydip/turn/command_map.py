@@ -19,72 +19,274 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from collections import defaultdict
-
-from diplomacy.adjudication.pydip.player.command.command import ConvoyMoveCommand, ConvoyTransportCommand, MoveCommand, \
-    SupportCommand
+from diplomacy.adjudication.pydip.player.command.command import CONVOY_MOVE, CONVOY_TRANSPORT, MOVE, SUPPORT
 
 
 class CommandMap:
-    """ territory -> MoveCommand[], representing commands with destination at key territory """
-    _attacker_map = None
-    """ territory -> ConvoyMoveCommand[], representing commands with destination at key territory """
-    _convoy_attacker_map = None
-    """ (source, dest) -> ConvoyTransportCommand[], representing transport commands from source to dest territories """
-    _transport_map = None
-    """ (source, dest) -> SupportCommand[], representing supports of units attacking from source to dest territories """
-    _support_map = None
-    """ territory -> Command, representing command for unit originating at key territory """
-    _home_map = None
-
-    _game_map = None
+    """
+    Indexes a turn's commands by province id (see CompiledMap), so that the
+    adjudicator can work entirely with integers. Each command is identified by
+    the province id of the unit it was issued to, since a province can hold at
+    most one unit.
+    """
+
+    """ int[], province ids of each command's unit, in the order commands were provided """
+    orders = None
+
+    """ province -> Command, representing command for unit originating at province """
+    commands = None
+
+    """ province -> MOVE, CONVOY_MOVE, CONVOY_TRANSPORT or SUPPORT (None if no command) """
+    kinds = None
+
+    """ province -> String, name of the player issuing the command """
+    owners = None
+
+    """ province -> int, territory id of the commanded unit's position """
+    positions = None
+
+    """ province -> int, province id of the command's destination """
+    destinations = None
+
+    """ province -> int, territory id of the command's destination """
+    destination_territories = None
+
+    """ province -> int, province id of the supported or transported unit (Support and Transport only) """
+    sources = None
+
+    """ province -> int, territory id of the supported or transported unit (Support and Transport only) """
+    source_territories = None
+
+    """ province -> int[], representing MoveCommands with destination at key province """
+    attackers = None
+
+    """ province -> int[], representing ConvoyMoveCommands with destination at key province """
+    convoy_attackers = None
+
+    """ province -> tuple(int), representing MoveCommands and ConvoyMoveCommands with destination at key province """
+    combatants = None
+
+    """ province -> int, the MoveCommand moving into the province a MoveCommand left, or None (a hold is its own) """
+    head_to_head = None
+
+    """ (source, dest) -> int[], representing transport commands from source to dest provinces """
+    transports = None
+
+    """ (source, dest) -> int[], representing supports of units attacking from source to dest provinces """
+    supports = None
+
+    """ (source, dest) -> {String -> tuple(int)}, supports from source to dest provinces, split by owner """
+    owner_supports = None
+
+    _compiled = None
 
     """ Builds CommandMap from provided Command[] """
 
     def __init__(self, game_map, commands):
-        self._game_map = game_map
-        self._attacker_map = defaultdict(list)
-        self._convoy_attacker_map = defaultdict(list)
-        self._transport_map = defaultdict(list)
-        self._support_map = defaultdict(list)
-        self._home_map = dict()
+        compiled = game_map.compiled
+        province_count = compiled.province_count
+
+        self._compiled = compiled
+        self.orders = []
+        self.commands = [None] * province_count
+        self.kinds = [None] * province_count
+        self.owners = [None] * province_count
+        self.positions = [None] * province_count
+        self.destinations = [None] * province_count
+        self.destination_territories = [None] * province_count
+        self.sources = [None] * province_count
+        self.source_territories = [None] * province_count
+        self.attackers = [[] for _ in range(province_count)]
+        self.convoy_attackers = [[] for _ in range(province_count)]
+        self.combatants = [()] * province_count
+        self.head_to_head = [None] * province_count
+        self.transports = dict()
+        self.supports = dict()
+        self.owner_supports = dict()
+
+        for command in commands:
+            self._add_command(command)
+
+    def with_commands(self, commands, removed=()):
+        """
+        Returns a new CommandMap in which the provided Command[] replace the
+        commands of the same units (or are added, for units without one), and
+        the commands of the units at the removed territory names are dropped.
+        This map is left untouched, and the commands it already holds are
+        reused rather than indexed again.
+        """
+        command_map = CommandMap.__new__(CommandMap)
+        command_map._compiled = self._compiled
+        command_map.orders = list(self.orders)
+        command_map.commands = list(self.commands)
+        command_map.kinds = list(self.kinds)
+        command_map.owners = list(self.owners)
+        command_map.positions = list(self.positions)
+        command_map.destinations = list(self.destinations)
+        command_map.destination_territories = list(self.destination_territories)
+        command_map.sources = list(self.sources)
+        command_map.source_territories = list(self.source_territories)
+        command_map.attackers = list(self.attackers)
+        command_map.convoy_attackers = list(self.convoy_attackers)
+        command_map.combatants = list(self.combatants)
+        command_map.head_to_head = list(self.head_to_head)
+        command_map.transports = dict(self.transports)
+        command_map.supports = dict(self.supports)
+        command_map.owner_supports = dict(self.owner_supports)
 
         for command in commands:
-            home_name = self._game_map.relevant_name_for_territory(command.unit.position)
-            self._home_map[home_name] = command
-            if isinstance(command, MoveCommand):
-                destination_name = self._game_map.relevant_name_for_territory(command.destination)
-                self._attacker_map[destination_name].append(command)
-            elif isinstance(command, ConvoyMoveCommand):
-                destination_name = self._game_map.relevant_name_for_territory(command.destination)
-                self._convoy_attacker_map[destination_name].append(command)
-            elif isinstance(command, ConvoyTransportCommand):
-                source = self._game_map.relevant_name_for_territory(command.transported_unit.position)
-                dest = self._game_map.relevant_name_for_territory(command.destination)
-                self._transport_map[(source, dest)].append(command)
-            elif isinstance(command, SupportCommand):
-                source = self._game_map.relevant_name_for_territory(command.supported_unit.position)
-                dest = self._game_map.relevant_name_for_territory(command.destination)
-                self._support_map[(source, dest)].append(command)
+            home = self._compiled.province_id(command.unit.position)
+            if command_map.commands[home] is None:
+                command_map._add_command(command)
+                continue
+            command_map._remove_command(home)
+            command_map._add_command(command, appended=False)
+        for territory_name in removed:
+            home = self._compiled.province_id(territory_name)
+            assert command_map.commands[home] is not None
+            command_map._remove_command(home)
+            command_map.orders.remove(home)
+            command_map.commands[home] = None
+            command_map.kinds[home] = None
+            command_map.owners[home] = None
+            command_map.positions[home] = None
+            command_map.destinations[home] = None
+            command_map.destination_territories[home] = None
+        return command_map
+
+    @classmethod
+    def from_arrays(cls, game_map, owners, kinds, targets, sources):
+        """
+        Builds a CommandMap without Command objects (so commands are all None),
+        from territory id -> value arrays describing the unit at each territory:
+
+        owners: owner of the unit (e.g. a player index), None if there is no unit
+        kinds: MOVE, CONVOY_MOVE, CONVOY_TRANSPORT or SUPPORT; None is a hold
+        targets: territory id of the destination (ignored for a hold)
+        sources: territory id of the supported or transported unit (Support and Transport only)
+
+        Orders are assumed to be legal, as they are not validated.
+        """
+        command_map = cls(game_map, [])
+        for position, owner in enumerate(owners):
+            if owner is None:
+                continue
+            if kinds[position] is None:
+                command_map._add_order(position, owner, MOVE, position)
+            else:
+                command_map._add_order(position, owner, kinds[position], targets[position], sources[position])
+        return command_map
+
+    def _add_command(self, command, appended=True):
+        territory_ids = self._compiled.territory_ids
+        home = self._compiled.province_of[territory_ids[command.unit.position]]
+        self.commands[home] = command
+        kind = command.kind
+        if kind == MOVE or kind == CONVOY_MOVE:
+            source = None
+        elif kind == CONVOY_TRANSPORT:
+            source = territory_ids[command.transported_unit.position]
+        elif kind == SUPPORT:
+            source = territory_ids[command.supported_unit.position]
+        else:
+            raise ValueError("Command unexpected type")
+        self._add_order(territory_ids[command.unit.position], command.player.name, kind,
+                        territory_ids[command.destination], source, appended)
+
+    def _add_order(self, position, owner, kind, destination, source=None, appended=True):
+        """ Indexes an order, replacing (rather than mutating) any list it is added to, as with_commands shares them """
+        province_of = self._compiled.province_of
+        home = province_of[position]
+        if appended:
+            self.orders.append(home)
+        self.kinds[home] = kind
+        self.owners[home] = owner
+        self.positions[home] = position
+        destination_province = province_of[destination]
+        self.destinations[home] = destination_province
+        self.destination_territories[home] = destination
+
+        if kind == MOVE:
+            self.attackers[destination_province] = self.attackers[destination_province] + [home]
+            self.combatants[destination_province] = self.combatants[destination_province] + (home,)
+            if self.kinds[destination_province] == MOVE and self.destinations[destination_province] == home:
+                self.head_to_head[home] = destination_province
+                self.head_to_head[destination_province] = home
+        elif kind == CONVOY_MOVE:
+            self.convoy_attackers[destination_province] = self.convoy_attackers[destination_province] + [home]
+            self.combatants[destination_province] = self.combatants[destination_province] + (home,)
+        elif kind == CONVOY_TRANSPORT:
+            self._add_source(home, source, self.transports)
+        elif kind == SUPPORT:
+            self._add_source(home, source, self.supports)
+            key = (self.sources[home], destination_province)
+            owner_supports = dict(self.owner_supports.get(key, ()))
+            owner_supports[owner] = owner_supports.get(owner, ()) + (home,)
+            self.owner_supports[key] = owner_supports
+        else:
+            raise ValueError("Order unexpected kind")
+
+    def _remove_command(self, home):
+        kind = self.kinds[home]
+        destination = self.destinations[home]
+        if kind == MOVE:
+            self.attackers[destination] = [order for order in self.attackers[destination] if order != home]
+            self.combatants[destination] = tuple(order for order in self.combatants[destination] if order != home)
+            if self.head_to_head[home] is not None:
+                self.head_to_head[self.head_to_head[home]] = None
+                self.head_to_head[home] = None
+        elif kind == CONVOY_MOVE:
+            self.convoy_attackers[destination] = [
+                order for order in self.convoy_attackers[destination] if order != home
+            ]
+            self.combatants[destination] = tuple(order for order in self.combatants[destination] if order != home)
+        else:
+            source_map = self.transports if kind == CONVOY_TRANSPORT else self.supports
+            key = (self.sources[home], destination)
+            remaining = [order for order in source_map[key] if order != home]
+            if len(remaining) > 0:
+                source_map[key] = remaining
+            else:
+                del source_map[key]
+            if kind == SUPPORT:
+                self._remove_owner_support(home, key)
+        self.sources[home] = None
+        self.source_territories[home] = None
+
+    def _add_source(self, home, source, source_map):
+        self.sources[home] = self._compiled.province_of[source]
+        self.source_territories[home] = source
+        key = (self.sources[home], self.destinations[home])
+        source_map[key] = source_map.get(key, []) + [home]
+
+    def _remove_owner_support(self, home, key):
+        owner = self.owners[home]
+        owner_supports = dict(self.owner_supports[key])
+        remaining = tuple(order for order in owner_supports[owner] if order != home)
+        if len(remaining) > 0:
+            owner_supports[owner] = remaining
+        else:
+            del owner_supports[owner]
+        if len(owner_supports) > 0:
+            self.owner_supports[key] = owner_supports
+        else:
+            del self.owner_supports[key]
 
     def get_attackers(self, territory_name):
-        territory_name = self._game_map.relevant_name_for_territory(territory_name)
-        return self._attacker_map[territory_name]
+        province = self._compiled.province_id(territory_name)
+        return [self.commands[attacker] for attacker in self.attackers[province]]
 
     def get_convoy_attackers(self, territory_name):
-        territory_name = self._game_map.relevant_name_for_territory(territory_name)
-        return self._convoy_attacker_map[territory_name]
+        province = self._compiled.province_id(territory_name)
+        return [self.commands[attacker] for attacker in self.convoy_attackers[province]]
 
     def get_convoy_transports(self, source_name, destination_name):
-        source_name = self._game_map.relevant_name_for_territory(source_name)
-        destination_name = self._game_map.relevant_name_for_territory(destination_name)
-        return self._transport_map[(source_name, destination_name)]
+        key = (self._compiled.province_id(source_name), self._compiled.province_id(destination_name))
+        return [self.commands[transport] for transport in self.transports.get(key, [])]
 
     def get_supports(self, source_name, destination_name):
-        source_name = self._game_map.relevant_name_for_territory(source_name)
-        destination_name = self._game_map.relevant_name_for_territory(destination_name)
-        return self._support_map[(source_name, destination_name)]
+        key = (self._compiled.province_id(source_name), self._compiled.province_id(destination_name))
+        return [self.commands[support] for support in self.supports.get(key, [])]
 
     def get_home_command(self, territory_name):
-        territory_name = self._game_map.relevant_name_for_territory(territory_name)
-        return self._home_map.get(territory_name, None)
+        return self.commands[self._compiled.province_id(territory_name)]
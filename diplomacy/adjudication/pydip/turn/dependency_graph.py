@@ -0,0 +1,149 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from diplomacy.adjudication.pydip.turn.command_map import CONVOY_MOVE, CONVOY_TRANSPORT, MOVE, SUPPORT
+
+
+def build_dependency_graph(command_map):
+    """
+    Returns province -> int[], listing for each order (see CommandMap) every
+    other order whose resolution may be consulted while adjudicating it. The
+    graph over-approximates what the adjudicator actually looks at, since which
+    resolutions get consulted can depend on the outcome of earlier ones.
+    """
+    graph = [None] * len(command_map.kinds)
+    for order in command_map.orders:
+        graph[order] = order_dependencies(command_map, order)
+    return graph
+
+
+def order_dependencies(command_map, order):
+    """ Returns int[], the entry of a single order in build_dependency_graph """
+    kind = command_map.kinds[order]
+    if kind == MOVE or kind == CONVOY_MOVE:
+        return _move_dependencies(command_map, order)
+    if kind == SUPPORT:
+        return _support_dependencies(command_map, order)
+    if kind == CONVOY_TRANSPORT:
+        return list(command_map.attackers[order])
+    raise ValueError("Command unexpected type")
+
+
+def _move_dependencies(command_map, order):
+    kinds = command_map.kinds
+    supports = command_map.supports
+    transports = command_map.transports
+    destination = command_map.destinations[order]
+
+    # attack strength, and either the defend strength of a head to head combatant
+    # or the hold strength of the destination (a hold has no attack strength at all)
+    dependencies = list()
+    if destination != order:
+        dependencies.extend(supports.get((order, destination), []))
+        if kinds[order] == CONVOY_MOVE:
+            dependencies.extend(transports.get((order, destination), []))
+        destination_kind = kinds[destination]
+        if command_map.head_to_head[order] is not None:
+            dependencies.extend(supports.get((destination, order), []))
+        elif destination_kind == MOVE or destination_kind == CONVOY_MOVE:
+            dependencies.append(destination)
+        elif destination_kind is not None:
+            dependencies.extend(supports.get((destination, destination), []))
+
+    # prevent strength of every other unit moving to the same destination
+    for combatant in command_map.combatants[destination]:
+        if combatant == order:
+            continue
+        dependencies.extend(supports.get((combatant, destination), []))
+        if kinds[combatant] == CONVOY_MOVE:
+            dependencies.extend(transports.get((combatant, destination), []))
+        elif command_map.head_to_head[combatant] is not None:
+            dependencies.append(destination)
+    return dependencies
+
+
+def _support_dependencies(command_map, order):
+    # convoyed attacks only cut support if they have a path, and any move can dislodge the supporter
+    dependencies = list(command_map.attackers[order])
+    for attacker in command_map.convoy_attackers[order]:
+        dependencies.extend(command_map.transports.get((attacker, order), []))
+    return dependencies
+
+
+def strongly_connected_components(graph, orders):
+    """
+    Returns int[][], the strongly connected components of the dependency graph
+    reachable from the provided orders, using Tarjan's algorithm. Every
+    component is listed after all of the components it depends on, so
+    resolving them in the returned order only ever consults orders that are
+    already resolved, or that share a component with the one being resolved.
+    """
+    indices = [-1] * len(graph)
+    low_links = [0] * len(graph)
+    on_stack = [False] * len(graph)
+    stack = list()
+    components = list()
+    counter = 0
+
+    for root in orders:
+        if indices[root] >= 0:
+            continue
+        indices[root] = low_links[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        # explicit stack of (order, remaining dependencies), to avoid recursion limits
+        work = [(root, iter(graph[root]))]
+        while len(work) > 0:
+            order, dependencies = work[-1]
+            for dependency in dependencies:
+                if indices[dependency] < 0:
+                    indices[dependency] = low_links[dependency] = counter
+                    counter += 1
+                    stack.append(dependency)
+                    on_stack[dependency] = True
+                    work.append((dependency, iter(graph[dependency])))
+                    break
+                if on_stack[dependency] and indices[dependency] < low_links[order]:
+                    low_links[order] = indices[dependency]
+            else:
+                work.pop()
+                low_link = low_links[order]
+                if len(work) > 0:
+                    parent = work[-1][0]
+                    if low_link < low_links[parent]:
+                        low_links[parent] = low_link
+                if low_link == indices[order]:
+                    component = list()
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == order:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def is_cyclic(graph, component):
+    """ Whether resolving the component may require guessing """
+    return len(component) > 1 or component[0] in graph[component[0]]
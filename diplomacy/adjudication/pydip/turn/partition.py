@@ -0,0 +1,77 @@
+#  python-diplomacy is a tool for exploring the game diplomacy in python.
+#  Copyright (C) 2017 Aric Parkinson
+#  Copyright (C) 2019 Lukas Strobel
+#
+#  The following code is a derivative work of the code from Aric Parkinson's pydip,
+#  which is licensed MIT. This derivative is licensed under the terms
+#  of the GNU Affero General Public License, version 3.
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License as
+#  published by the Free Software Foundation, either version 3 of the
+#  License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Affero General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from diplomacy.adjudication.pydip.turn.command_map import CommandMap
+
+
+def partition_commands(game_map, commands):
+    """
+    Splits commands into clusters that never interact with each other while
+    being adjudicated, so that each cluster can be resolved on its own.
+
+    Returns Command[][], each cluster in the order its commands were provided,
+    and the clusters in the order their first command was provided.
+    """
+    command_map = CommandMap(game_map, commands)
+    return [
+        [command_map.commands[order] for order in cluster]
+        for cluster in partition_orders(command_map)
+    ]
+
+
+def partition_orders(command_map):
+    """
+    Returns int[][], the orders of the CommandMap grouped into clusters.
+
+    Every order is joined to the province it moves to, supports into or convoys
+    to, and supports and convoys are also joined to the unit they support or
+    transport. Everything adjudicating an order can look at (attackers of the
+    same province, supports, convoys, and head to head battles) is then in the
+    same cluster. Units that merely border each other stay apart, since that
+    only matters when computing retreats.
+    """
+    parents = list(range(len(command_map.kinds)))
+    for order in command_map.orders:
+        _union(parents, order, command_map.destinations[order])
+        if command_map.sources[order] is not None:
+            _union(parents, order, command_map.sources[order])
+
+    clusters = dict()
+    for order in command_map.orders:
+        root = _find(parents, order)
+        if root not in clusters:
+            clusters[root] = list()
+        clusters[root].append(order)
+    return list(clusters.values())
+
+
+def _find(parents, province):
+    while parents[province] != province:
+        parents[province] = parents[parents[province]]
+        province = parents[province]
+    return province
+
+
+def _union(parents, province, other):
+    root = _find(parents, province)
+    other_root = _find(parents, other)
+    if root != other_root:
+        parents[other_root] = root
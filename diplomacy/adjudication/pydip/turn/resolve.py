@@ -19,18 +19,22 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from enum import Enum
-from functools import reduce
+from itertools import repeat
+from time import perf_counter
 
-from diplomacy.adjudication.pydip.map.territory import CoastTerritory, LandTerritory, SeaTerritory
-from diplomacy.adjudication.pydip.player.command.command import ConvoyMoveCommand, ConvoyTransportCommand, MoveCommand, \
-    SupportCommand
-from diplomacy.adjudication.pydip.player.unit import Unit
-from diplomacy.adjudication.pydip.turn.command_map import CommandMap
+from diplomacy.adjudication.pydip.map.compiled_map import LAND, ids_of
+from diplomacy.adjudication.pydip.player.unit import Unit, UnitTypes
+from diplomacy.adjudication.pydip.turn.bounds import propagate_bounds
+from diplomacy.adjudication.pydip.turn.cluster_cache import cluster_key
+from diplomacy.adjudication.pydip.turn.command_map import CONVOY_MOVE, CONVOY_TRANSPORT, MOVE, SUPPORT, CommandMap
+from diplomacy.adjudication.pydip.turn.dependency_graph import build_dependency_graph, is_cyclic, \
+    order_dependencies, strongly_connected_components
+from diplomacy.adjudication.pydip.turn.partition import partition_orders
 
 
-def resolve_turn(game_map, commands):
+def resolve_turn(game_map, commands, stats=None, budget=None, outcomes=None):
     """
     Returns resulting positions of each unit by considering interactions
     of provided list of commands.
@@ -50,16 +54,403 @@ def resolve_turn(game_map, commands):
     If the territory set is not provided, no retreat is required. If the
     territory set is provided, a retreat is required. If it is empty, no
     retreat is possible.
+
+    stats: optional ResolutionStats, which the work done resolving the turn is
+           added to. Nothing is recorded if not provided.
+    budget: optional ResolutionBudget, limiting the work done resolving the turn.
+            ResolutionBudgetExceeded is raised if it runs out.
+    outcomes: optional list, which an OrderOutcome for each command is appended
+              to, in the order the commands were provided.
+    """
+    start = perf_counter()
+    context = ResolutionContext(game_map, CommandMap(game_map, commands), stats, budget)
+    for order in context.command_map.orders:
+        _resolve(context, order)
+    return _finish(context, start, outcomes)
+
+
+def _finish(context, start, outcomes=None):
+    """
+    Returns the results of a resolved context, appending the outcome of each
+    order to outcomes if provided, and recording the time since start in its
+    stats
+    """
+    stats = context.stats
+    results = compute_retreats(context)
+    if outcomes is not None:
+        # the turn is resolved, so looking back at it is neither charged to the budget nor counted in the stats
+        context.stats = None
+        context.budget = None
+        outcomes.extend(_order_outcome(context, order) for order in context.command_map.orders)
+    if stats is not None:
+        stats.wall_time += perf_counter() - start
+    return results
+
+
+def resolve_turn_by_components(game_map, commands, stats=None, budget=None, outcomes=None):
+    """
+    Same as resolve_turn, but first builds the dependency graph of the orders
+    (see dependency_graph) and resolves it one strongly connected component at
+    a time. Orders outside of any cycle are adjudicated directly, since
+    everything they depend on has already been resolved; only orders in cycles
+    go through the guessing (and, if need be, backup rules) of _resolve.
+
+    Note: resolve_turn only ever confirms a single guess for an order that is
+    not in a cycle, so it is already linear in the number of orders on acyclic
+    turns, and does not pay for building the graph. This is mostly useful when
+    the component structure of a turn is wanted anyway.
+    """
+    start = perf_counter()
+    context = ResolutionContext(game_map, CommandMap(game_map, commands), stats, budget)
+    _resolve_components(context)
+    return _finish(context, start, outcomes)
+
+
+def resolve_turn_by_bounds(game_map, commands, stats=None, budget=None, outcomes=None):
+    """
+    Same as resolve_turn, but turns without convoys are first resolved by
+    propagating bounds on strengths (see bounds), which decides every order
+    outside of a cycle without the bookkeeping of guessing. Only orders left
+    undecided go through _resolve. Turns with convoys are resolved as by
+    resolve_turn. Only the orders left to _resolve are counted in stats, or
+    charged to budget.
+    """
+    start = perf_counter()
+    context = ResolutionContext(game_map, CommandMap(game_map, commands), stats, budget)
+    _resolve_by_bounds(context)
+    return _finish(context, start, outcomes)
+
+
+def _resolve_by_bounds(context):
+    command_map = context.command_map
+    kinds = command_map.kinds
+    if all(kinds[order] != CONVOY_MOVE and kinds[order] != CONVOY_TRANSPORT for order in command_map.orders):
+        resolutions = propagate_bounds(command_map)
+        for order in command_map.orders:
+            if resolutions[order] is not None:
+                context.resolutions[order] = resolutions[order]
+                context.states[order] = _RESOLVED
+    for order in command_map.orders:
+        _resolve(context, order)
+
+
+def resolve_turn_partitioned(game_map, commands, executor=None, cache=None, budget=None):
+    """
+    Same as resolve_turn, but splits the commands into clusters that do not
+    interact (see partition) and resolves each cluster on its own. Retreats are
+    computed once every cluster is resolved, since a dislodged unit's retreat
+    options depend on what happened in neighbouring clusters.
+
+    executor: optional concurrent.futures.Executor used to resolve the clusters,
+              e.g. a ProcessPoolExecutor for large variant games. The map and
+              commands are sent to it, so they must be picklable for a process
+              pool. Clusters are resolved one after another if not provided.
+    cache: optional ClusterCache. Clusters found in it are not resolved again,
+           and the resolutions of the others are added to it.
+    budget: optional ResolutionBudget, limiting the work done resolving each
+            cluster on its own.
     """
     command_map = CommandMap(game_map, commands)
-    _init_resolution()
-    resolutions = {command.unit.position: _resolve(game_map, command_map, command) for command in commands}
-    return compute_retreats(game_map, command_map, commands, resolutions)
+    clusters = partition_orders(command_map)
+    cluster_resolutions = [None] * len(clusters)
+    # Clusters still to be resolved, grouped so that the same fight is only resolved once
+    pending = OrderedDict()
+    for index, cluster in enumerate(clusters):
+        if cache is None:
+            pending[index] = [index]
+            continue
+        key = cluster_key(game_map, command_map, cluster)
+        if key in pending:
+            pending[key].append(index)
+            continue
+        cluster_resolutions[index] = cache.get(key)
+        if cluster_resolutions[index] is None:
+            pending[key] = [index]
+
+    cluster_commands = [[command_map.commands[order] for order in clusters[indices[0]]]
+                        for indices in pending.values()]
+    if executor is None:
+        resolved = map(_resolve_cluster, repeat(game_map), cluster_commands, repeat(budget))
+    else:
+        resolved = executor.map(_resolve_cluster, repeat(game_map), cluster_commands, repeat(budget))
+    for (key, indices), resolutions in zip(pending.items(), resolved):
+        for index in indices:
+            cluster_resolutions[index] = resolutions
+        if cache is not None:
+            cache.put(key, resolutions)
+
+    context = ResolutionContext(game_map, command_map)
+    for cluster, resolutions in zip(clusters, cluster_resolutions):
+        for order, resolution in zip(cluster, resolutions):
+            context.resolutions[order] = resolution
+            context.states[order] = _RESOLVED
+    return compute_retreats(context)
+
+
+def resolve_turns_batch(game_map, base_commands, variants, executor=None, chunk_size=16, budget=None):
+    """
+    Resolves many variants of one turn, e.g. candidate order sets for a single
+    position. Returns a list with the result of each variant, in the same
+    format as resolve_turn.
+
+    base_commands: Command[] for every unit on the board, as for resolve_turn
+    variants: iterable of Command[], each replacing the base commands of the
+              same units (or adding commands for units without one). The base
+              turn is only indexed once, and the commands a variant does not
+              replace are reused as they are.
+    executor: optional concurrent.futures.Executor, e.g. a ProcessPoolExecutor.
+              Variants are sent to it chunk_size at a time, each chunk indexing
+              the base turn once, so the map and commands must be picklable for
+              a process pool. Variants are resolved one after another if not
+              provided.
+    budget: optional ResolutionBudget, limiting the work done resolving each
+            variant on its own.
+    """
+    return _resolve_in_chunks(_resolve_variants, game_map, variants, executor, chunk_size, base_commands, budget)
+
+
+def resolve_turns_lockstep(game_map, owners, unit_types, kinds, targets, sources, executor=None, chunk_size=64,
+                           budget=None):
+    """
+    Same as resolve_turns_batch, for a turn of each of a batch of games played
+    on the same map (e.g. games stepped in lockstep for training) that are
+    described by stacked arrays rather than Commands: each argument is indexed
+    by game, then by territory id (see CompiledMap).
+
+    This is a thin layer over the batch path, not a vectorised one: each game
+    is indexed straight from its arrays into a CommandMap, then resolved and
+    sent to the executor exactly like a variant of resolve_turns_batch. What it
+    saves is building (and validating) Command, Player and Unit objects, so it
+    is no faster than resolve_turn on commands that are already built.
+
+    owners: owner of the unit at each territory (e.g. a player index), None if there is no unit
+    unit_types: UnitTypes of the unit at each territory, None if there is no unit
+    kinds: MOVE, CONVOY_MOVE, CONVOY_TRANSPORT or SUPPORT (see command_map), None for a hold
+    targets: territory id of each order's destination (ignored for holds)
+    sources: territory id of the unit each support or transport is for (ignored otherwise)
+    executor, chunk_size and budget: as for resolve_turns_batch, per game
+
+    Orders are assumed to be legal, as they are not validated. Returns three
+    stacked arrays, indexed the same way:
+
+    destinations: territory id each unit ends the turn in (its own if it did not move), None if there is no unit
+    dislodged: whether each unit was dislodged
+    retreats: tuple of the territory ids each dislodged unit can retreat to, None for other units
+    """
+    compiled = game_map.compiled
+    for game_owners, game_unit_types in zip(owners, unit_types):
+        assert len(game_owners) == len(game_unit_types) == compiled.territory_count
+        for territory, unit_type in enumerate(game_unit_types):
+            if unit_type is not None:
+                assert (compiled.territory_kinds[territory] == LAND) == (unit_type == UnitTypes.TROOP)
+
+    games = zip(owners, kinds, targets, sources)
+    results = _resolve_in_chunks(_resolve_games, game_map, games, executor, chunk_size, budget)
+    destinations = [destination for destination, _, _ in results]
+    dislodged = [game_dislodged for _, game_dislodged, _ in results]
+    retreats = [game_retreats for _, _, game_retreats in results]
+    return destinations, dislodged, retreats
+
+
+def _resolve_in_chunks(resolve_chunk, game_map, turns, executor, chunk_size, *arguments):
+    """
+    Returns resolve_chunk(game_map, turns, *arguments), resolving the turns on
+    executor chunk_size at a time if one is given
+    """
+    if executor is None:
+        return resolve_chunk(game_map, turns, *arguments)
+
+    turns = list(turns)
+    chunks = [turns[start:start + chunk_size] for start in range(0, len(turns), chunk_size)]
+    arguments = [repeat(argument) for argument in arguments]
+    results = []
+    for chunk_results in executor.map(resolve_chunk, repeat(game_map), chunks, *arguments):
+        results.extend(chunk_results)
+    return results
+
+
+def _resolve_variants(game_map, variants, base_commands, budget):
+    base = CommandMap(game_map, base_commands)
+    return [compute_retreats(_resolved_context(game_map, base.with_commands(variant), budget))
+            for variant in variants]
+
+
+def _resolve_games(game_map, games, budget):
+    territory_count = game_map.compiled.territory_count
+    results = []
+    for game_owners, game_kinds, game_targets, game_sources in games:
+        command_map = CommandMap.from_arrays(game_map, game_owners, game_kinds, game_targets, game_sources)
+        context = _resolved_context(game_map, command_map, budget)
+
+        destinations = [None] * territory_count
+        dislodged = [False] * territory_count
+        retreats = [None] * territory_count
+        blocked_territories, dislodgers = _retreat_facts(game_map.compiled, command_map, context.resolutions)
+        for order in command_map.orders:
+            position = command_map.positions[order]
+            kind = command_map.kinds[order]
+            if context.resolutions[order]:
+                moved = kind == MOVE or kind == CONVOY_MOVE
+                destinations[position] = command_map.destination_territories[order] if moved else position
+                continue
+            destinations[position] = position
+            retreat_options = _retreat_options(context, order, blocked_territories, dislodgers)
+            if retreat_options is not None:
+                dislodged[position] = True
+                retreats[position] = tuple(retreat_options)
+        results.append((destinations, dislodged, retreats))
+    return results
+
+
+def _resolved_context(game_map, command_map, budget):
+    context = ResolutionContext(game_map, command_map, budget=budget)
+    for order in command_map.orders:
+        _resolve(context, order)
+    return context
+
+
+class ResolverSession:
+    """
+    Keeps a resolved turn around so that it can be re-resolved cheaply as
+    individual commands are added, changed or removed, e.g. to show provisional
+    results while players edit their orders.
+
+    After a change, only the orders whose dependencies changed (see
+    dependency_graph), and every order depending on them directly or
+    indirectly, are resolved again. Everything else keeps its resolution, since
+    nothing it depends on has changed. Results always match a full resolve_turn
+    of the current commands.
+
+    If a change can't be resolved within the session's budget, the
+    ResolutionBudgetExceeded is raised and the session is left as it was.
+    """
+
+    """ Map """
+    game_map = None
+
+    """ CommandMap, for the current commands """
+    command_map = None
+
+    """ int -- number of orders resolved by the most recent change """
+    last_resolved = 0
+
+    """ ResolutionBudget -- limits the work done by the initial resolution and each change, None if unlimited """
+    budget = None
+
+    def __init__(self, game_map, commands, budget=None):
+        self.game_map = game_map
+        self.budget = budget
+        self.command_map = CommandMap(game_map, commands)
+        self._graph = build_dependency_graph(self.command_map)
+        self._dependents = [[] for _ in self._graph]
+        for order in self.command_map.orders:
+            for dependency in self._graph[order]:
+                self._dependents[dependency].append(order)
+        self._context = ResolutionContext(game_map, self.command_map, budget=budget)
+        for order in self.command_map.orders:
+            _resolve(self._context, order)
+        self.last_resolved = len(self.command_map.orders)
+
+    @property
+    def commands(self):
+        return [self.command_map.commands[order] for order in self.command_map.orders]
+
+    def set_command(self, command):
+        """ Adds command, replacing the current command of its unit if there is one """
+        home = self.game_map.compiled.province_id(command.unit.position)
+        self._update(self.command_map.with_commands([command]), home)
+
+    def remove_command(self, territory_name):
+        """ Removes the command of the unit at territory_name """
+        home = self.game_map.compiled.province_id(territory_name)
+        self._update(self.command_map.with_commands([], removed=[territory_name]), home)
+
+    def resolve(self):
+        """ Returns the results of the current commands, in the same format as resolve_turn """
+        return compute_retreats(self._context)
+
+    def _update(self, command_map, changed):
+        # Orders that look at the changed command: the provinces it involves are
+        # their own, their destination or their source. These are the only orders
+        # whose dependencies can change, too.
+        touched = {changed}
+        for involved in (self.command_map, command_map):
+            if involved.commands[changed] is not None:
+                touched.add(involved.destinations[changed])
+                touched.add(involved.sources[changed])
+        touched.discard(None)
+        affected = {
+            order for order in command_map.orders
+            if order in touched or command_map.destinations[order] in touched or command_map.sources[order] in touched
+        }
+
+        updated = {
+            order: order_dependencies(command_map, order) if command_map.commands[order] is not None else None
+            for order in affected | {changed}
+        }
+
+        # and everything depending on them, directly or indirectly. The graph is
+        # only updated once the change is resolved, but the updated orders are
+        # affected already (or removed), so the dependents of the others will do.
+        to_visit = list(affected)
+        while len(to_visit) > 0:
+            for dependent in self._dependents[to_visit.pop()]:
+                if dependent not in affected and dependent not in updated:
+                    affected.add(dependent)
+                    to_visit.append(dependent)
+
+        # a fresh context, as strengths and paths memoized by the old one may be stale
+        context = ResolutionContext(self.game_map, command_map, budget=self.budget)
+        for order in command_map.orders:
+            if order not in affected:
+                context.resolutions[order] = self._context.resolutions[order]
+                context.states[order] = _RESOLVED
+        for order in command_map.orders:
+            if order in affected:
+                _resolve(context, order)
+
+        for order, dependencies in updated.items():
+            for dependency in self._graph[order] or []:
+                self._dependents[dependency].remove(order)
+            for dependency in dependencies or []:
+                self._dependents[dependency].append(order)
+            self._graph[order] = dependencies
+        self.command_map = command_map
+        self._context = context
+        self.last_resolved = len(affected)
+
+
+def _resolve_cluster(game_map, commands, budget=None):
+    """ Returns bool tuple, the resolution of each command """
+    context = ResolutionContext(game_map, CommandMap(game_map, commands), budget=budget)
+    for order in context.command_map.orders:
+        _resolve(context, order)
+    return tuple(context.resolutions[order] for order in context.command_map.orders)
+
+
+def _resolve_components(context):
+    command_map = context.command_map
+    graph = build_dependency_graph(command_map)
+    input_order = None
+    for component in strongly_connected_components(graph, command_map.orders):
+        if not is_cyclic(graph, component):
+            order = component[0]
+            context.resolutions[order] = _run(context, _adjudicate(context, order))
+            context.states[order] = _RESOLVED
+            continue
+
+        if input_order is None:
+            input_order = {order: index for index, order in enumerate(command_map.orders)}
+        for order in sorted(component, key=input_order.get):
+            _resolve(context, order)
 
 
 # ------------------------------------------------------------------------------
 # Below implementation is taken with minor modification from Lucas Kruijswijk:
 # http://www.diplom.org/Zine/S2009M/Kruijswijk/DipMath_Chp6.htm
+#
+# Orders are identified by the province id of the unit they were issued to (see
+# CommandMap), so all of the bookkeeping below is done on integers.
 # ------------------------------------------------------------------------------
 
 
@@ -69,186 +460,519 @@ class ResolutionState(Enum):
     RESOLVED = 2
 
 
-resolution_map = None
-state_map = None
-dependency_list = None
+_UNRESOLVED = ResolutionState.UNRESOLVED
+_GUESSING = ResolutionState.GUESSING
+_RESOLVED = ResolutionState.RESOLVED
+
+
+class ResolutionContext:
+    """
+    Holds all state for a single call to resolve_turn, so that separate
+    turns can be adjudicated concurrently without sharing anything.
+    """
+
+    """ Map """
+    game_map = None
+
+    """ CommandMap """
+    command_map = None
 
+    """ province -> bool, current (possibly guessed) resolution of the order at each province """
+    resolutions = None
 
-def _init_resolution():
-    global resolution_map
-    global state_map
-    global dependency_list
-    resolution_map = defaultdict(bool)
-    state_map = defaultdict(lambda: ResolutionState.UNRESOLVED)
-    dependency_list = list()
+    """ province -> ResolutionState """
+    states = None
 
+    """ int[], provinces whose guessed resolutions have been depended upon """
+    dependency_list = None
+
+    """ StrengthCache """
+    strength_cache = None
+
+    """ province -> (bool, int), memoized _has_path result of each convoyed move, and the generation it holds for """
+    paths = None
+
+    """ int -- incremented whenever a resolution that may have been depended upon changes """
+    generation = 0
+
+    """ ResolutionStats, or None if not recording """
+    stats = None
+
+    """ ResolutionBudget, or None if unlimited """
+    budget = None
+
+    """ int -- resolutions consulted and convoy paths searched for, as charged to the budget """
+    budget_calls = 0
+
+    """ float -- perf_counter() value past which the budget is exceeded, None if there is no time limit """
+    deadline = None
+
+    def __init__(self, game_map, command_map, stats=None, budget=None):
+        province_count = game_map.compiled.province_count
+        self.game_map = game_map
+        self.command_map = command_map
+        self.resolutions = [False] * province_count
+        self.states = [_UNRESOLVED] * province_count
+        self.dependency_list = list()
+        self.strength_cache = StrengthCache()
+        self.paths = dict()
+        self.generation = 0
+        self.stats = stats
+        self.budget = budget
+        self.budget_calls = 0
+        self.deadline = None
+        if budget is not None and budget.time_limit is not None:
+            self.deadline = perf_counter() + budget.time_limit
+
+
+_ATTACK = 0
+_PREVENT = 1
+_DEFEND = 2
+_HOLD = 3
+
+
+class StrengthCache:
+    """
+    Memoizes attack, prevent, defend and hold strengths for a single resolution.
+
+    Moves are only re-adjudicated while guessing through a cycle, so the cache
+    is only consulted while the dependency list is non-empty. A strength
+    computed without consulting any guess is final. One that did consult a
+    guess is only reused until the context changes a resolution that may have
+    been depended upon, which is tracked by ResolutionContext.generation.
+    """
+
+    """ int -- lookups answered from the cache """
+    hits = 0
+
+    """ int -- lookups that had to compute the strength """
+    misses = 0
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries = dict()
+
+    def get(self, key, generation):
+        """
+        Returns the strength cached for key, or None if there is none that is
+        still valid at the given ResolutionContext.generation
+        """
+        entry = self._entries.get(key)
+        if entry is not None and (entry[1] is None or entry[1] == generation):
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def put(self, key, strength, generation):
+        """
+        Caches strength for key. A generation of None marks a final strength,
+        computed without consulting any guess; otherwise the strength is only
+        valid while the context stays at that generation.
+        """
+        self._entries[key] = (strength, generation)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class ResolutionStats:
+    """
+    Counts the work done by the resolver, to find pathological turns and catch
+    regressions. Passed to resolve_turn (or a variant sharing its
+    ResolutionContext), which adds to it, so one instance can also total many
+    turns.
+    """
+
+    """ int -- resolutions consulted, whether already resolved, guessed or yet to be resolved """
+    resolve_calls = 0
+
+    """ int -- searches for the path of a convoyed move, i.e. those not answered from memory """
+    path_searches = 0
+
+    """ int[] -- adjudications, indexed by MOVE, CONVOY_MOVE, CONVOY_TRANSPORT and SUPPORT (see command_map) """
+    adjudications = None
+
+    """ int -- guesses made, i.e. orders adjudicated assuming they fail, or assuming they succeed """
+    guesses = 0
+
+    """ int -- greatest number of guessed orders depended upon at once """
+    max_dependency_depth = 0
+
+    """ int -- paradoxes resolved by the Szykman rule """
+    szykman_rules = 0
+
+    """ int -- paradoxes resolved by the circular movement rule """
+    circular_movement_rules = 0
+
+    """ String[][] -- sorted names of the provinces involved in each paradox, in the order they were resolved """
+    paradoxes = None
+
+    """ float -- seconds spent resolving, including retreats """
+    wall_time = 0.0
+
+    def __init__(self):
+        self.resolve_calls = 0
+        self.path_searches = 0
+        self.adjudications = [0, 0, 0, 0]
+        self.guesses = 0
+        self.max_dependency_depth = 0
+        self.szykman_rules = 0
+        self.circular_movement_rules = 0
+        self.paradoxes = list()
+        self.wall_time = 0.0
+
+    def record_dependency_depth(self, depth):
+        if depth > self.max_dependency_depth:
+            self.max_dependency_depth = depth
+
+    def record_paradox(self, context, dependency_set, szykman):
+        if szykman:
+            self.szykman_rules += 1
+        else:
+            self.circular_movement_rules += 1
+        province_names = context.game_map.compiled.province_names
+        self.paradoxes.append(sorted(province_names[order] for order in dependency_set))
+
+
+class ResolutionBudget:
+    """
+    Limits the work done resolving a single turn, so that a pathological set of
+    orders (e.g. a large web of mutually dependent convoys and supports) can't
+    stall whoever is adjudicating it. Either limit may be left as None.
+
+    The budget only holds the limits: the work done so far is counted by the
+    ResolutionContext of each resolution it is passed to, so one budget can
+    limit many resolutions, including ones running at the same time on other
+    threads. Once either limit is passed, ResolutionBudgetExceeded is raised.
+
+    A resolution is charged for every resolution it consults and every convoy
+    path it searches for, i.e. the resolve_calls plus the path_searches of its
+    ResolutionStats.
+    """
 
-def _resolve(game_map, command_map, command):
-    global resolution_map
-    global state_map
-    global dependency_list
-    command_territory = command.unit.position
+    """ int -- most resolutions that may be consulted, or convoy paths searched for """
+    max_resolve_calls = None
 
-    if state_map[command_territory] == ResolutionState.RESOLVED:
-        return resolution_map[command_territory]
+    """ float -- most seconds that may be spent resolving """
+    time_limit = None
 
-    if state_map[command_territory] == ResolutionState.GUESSING:
-        if command_territory not in dependency_list:
-            dependency_list.append(command_territory)
-        return resolution_map[command_territory]
+    def __init__(self, max_resolve_calls=None, time_limit=None):
+        assert max_resolve_calls is None or max_resolve_calls >= 0
+        assert time_limit is None or time_limit >= 0
+        self.max_resolve_calls = max_resolve_calls
+        self.time_limit = time_limit
 
+    def charge(self, context):
+        """ Counts one call against the context, raising ResolutionBudgetExceeded if it is over budget """
+        context.budget_calls += 1
+        calls = context.budget_calls
+        if self.max_resolve_calls is not None and calls > self.max_resolve_calls:
+            raise ResolutionBudgetExceeded(_offending_cycle(context), calls)
+        # reading the clock costs more than the rest of the charge, so it is only checked now and then
+        if context.deadline is not None and calls % _CLOCK_INTERVAL == 1 and perf_counter() > context.deadline:
+            raise ResolutionBudgetExceeded(_offending_cycle(context), calls)
+
+
+_CLOCK_INTERVAL = 64
+
+
+class ResolutionBudgetExceeded(Exception):
+    """
+    Raised when a turn can't be resolved within its ResolutionBudget. Names the
+    dependency cycle the resolver was working through, if any, so the orders
+    that caused it can be singled out.
+    """
+
+    """ String[] -- sorted names of the provinces whose orders form the cycle being resolved, None if there is none """
+    cycle = None
+
+    """ int -- resolutions consulted before giving up """
+    resolve_calls = 0
+
+    def __init__(self, cycle, resolve_calls):
+        if cycle is None:
+            message = "Resolution budget exceeded after {} resolve calls, outside of any dependency cycle".format(
+                resolve_calls)
+        else:
+            message = "Resolution budget exceeded after {} resolve calls, resolving the cycle {}".format(
+                resolve_calls, ", ".join(cycle))
+        super().__init__(message)
+        self.cycle = cycle
+        self.resolve_calls = resolve_calls
+
+    def __reduce__(self):
+        # so that it can be raised from a process pool
+        return ResolutionBudgetExceeded, (self.cycle, self.resolve_calls)
+
+
+def _offending_cycle(context):
+    """
+    Returns the names of the provinces in the largest dependency cycle that
+    contains an order currently being guessed, or None if there is none.
+    """
+    command_map = context.command_map
+    guessing = [order for order in command_map.orders if context.states[order] is _GUESSING]
+    graph = build_dependency_graph(command_map)
+    if len(guessing) == 0:
+        return None
+    guessing_set = set(guessing)
+    cycle = None
+    for component in strongly_connected_components(graph, guessing):
+        if cycle is not None and len(component) <= len(cycle):
+            continue
+        if is_cyclic(graph, component) and not guessing_set.isdisjoint(component):
+            cycle = component
+    if cycle is None:
+        return None
+    province_names = context.game_map.compiled.province_names
+    return sorted(province_names[order] for order in cycle)
+
+
+def _resolve(context, order):
+    if context.states[order] is _RESOLVED:
+        if context.stats is not None:
+            context.stats.resolve_calls += 1
+        if context.budget is not None:
+            context.budget.charge(context)
+        return context.resolutions[order]
+    return _run(context, _consult(order))
+
+
+def _consult(order):
+    return (yield order)
+
+
+def _run(context, steps):
+    """
+    Runs steps, a generator from one of the functions below, to completion and
+    returns its result.
+
+    Adjudication consults the resolutions of other orders, which may need to be
+    adjudicated in turn. Rather than recursing, every function that consults a
+    resolution is a generator that yields the order it needs and is sent back
+    its resolution. This keeps an explicit stack of the orders being resolved,
+    so long chains of moves and supports are limited only by memory, not by
+    the interpreter's recursion limit.
+    """
+    resolutions = context.resolutions
+    states = context.states
+    dependency_list = context.dependency_list
+    stats = context.stats
+    budget = context.budget
+    stack = [steps]
+    value = None
+    while True:
+        try:
+            order = stack[-1].send(value)
+        except StopIteration as finished:
+            stack.pop()
+            if len(stack) == 0:
+                return finished.value
+            value = finished.value
+            continue
+
+        if stats is not None:
+            stats.resolve_calls += 1
+        if budget is not None:
+            budget.charge(context)
+        state = states[order]
+        if state is _RESOLVED:
+            value = resolutions[order]
+        elif state is _GUESSING:
+            if order not in dependency_list:
+                dependency_list.append(order)
+                if stats is not None:
+                    stats.record_dependency_depth(len(dependency_list))
+            value = resolutions[order]
+        else:
+            stack.append(_resolution_steps(context, order))
+            value = None
+
+
+def _resolution_steps(context, order):
+    """ Resolves an unresolved order, guessing through any cycle it is part of """
+    resolutions = context.resolutions
+    states = context.states
+    dependency_list = context.dependency_list
     old_dependency_length = len(dependency_list)
 
     # Initially, guess that we fail
-    resolution_map[command_territory] = False
-    state_map[command_territory] = ResolutionState.GUESSING
-    fail_guess_result = _adjudicate(game_map, command_map, command)
+    resolutions[order] = False
+    states[order] = _GUESSING
+    if context.stats is not None:
+        context.stats.guesses += 1
+    fail_guess_result = yield from _adjudicate(context, order)
 
     # If the dependency graph didn't change as a consequence, our result doesn't
     # depend on the guess and we can return right away
     if old_dependency_length == len(dependency_list):
         # This is possible because of the backup rule in paradox resolutions
-        if state_map[command_territory] != ResolutionState.RESOLVED:
-            resolution_map[command_territory] = fail_guess_result
-            state_map[command_territory] = ResolutionState.RESOLVED
+        if states[order] is not _RESOLVED:
+            resolutions[order] = fail_guess_result
+            states[order] = _RESOLVED
 
         return fail_guess_result
 
     dependency_sub_set = set(dependency_list[old_dependency_length:])
     # If we don't depend on ourselves yet, we add ourselves in to complete the
     # cycle, and let our caller sort out the details
-    if command_territory not in dependency_sub_set:
-        dependency_list.append(command_territory)
-        resolution_map[command_territory] = fail_guess_result
+    if order not in dependency_sub_set:
+        dependency_list.append(order)
+        if context.stats is not None:
+            context.stats.record_dependency_depth(len(dependency_list))
+        # strengths computed from our initial guess no longer hold if it was wrong
+        if fail_guess_result:
+            context.generation += 1
+        resolutions[order] = fail_guess_result
         return fail_guess_result
 
     # Otherwise, we depend on our own guess, so we need to clear out dependencies
     # to check the other guess for consistency
-    for dependent_territory in dependency_sub_set:
-        state_map[dependent_territory] = ResolutionState.UNRESOLVED
-    dependency_list = dependency_list[:old_dependency_length]
+    for dependency in dependency_sub_set:
+        states[dependency] = _UNRESOLVED
+    del dependency_list[old_dependency_length:]
+    context.generation += 1
 
-    resolution_map[command_territory] = True
-    state_map[command_territory] = ResolutionState.GUESSING
-    success_guess_result = _adjudicate(game_map, command_map, command)
+    resolutions[order] = True
+    states[order] = _GUESSING
+    if context.stats is not None:
+        context.stats.guesses += 1
+    success_guess_result = yield from _adjudicate(context, order)
 
     # If results are consistent, no need for further checking
     if fail_guess_result == success_guess_result:
-        for dependent_territory in dependency_sub_set:
-            state_map[dependent_territory] = ResolutionState.UNRESOLVED
-        dependency_list = dependency_list[:old_dependency_length]
+        for dependency in dependency_sub_set:
+            states[dependency] = _UNRESOLVED
+        del dependency_list[old_dependency_length:]
+        context.generation += 1
 
-        resolution_map[command_territory] = fail_guess_result
-        state_map[command_territory] = ResolutionState.RESOLVED
+        resolutions[order] = fail_guess_result
+        states[order] = _RESOLVED
         return fail_guess_result
 
     # If we got to this point, that means we encountered a paradox that has two
     # consistent outcomes, and we need a backup rule to fully resolve it
-    _backup_rule(command_map, dependency_sub_set)
-    dependency_list = dependency_list[:old_dependency_length]
+    _backup_rule(context, dependency_sub_set)
+    del dependency_list[old_dependency_length:]
+    context.generation += 1
 
     # And because the backup rule may not resolve our own command, we'll need to
     # start fresh just to be sure
-    return _resolve(game_map, command_map, command)
-
-
-def _adjudicate(game_map, command_map, command):
-    if isinstance(command, MoveCommand):
-        return _adjudicate_move(game_map, command_map, command)
-    elif isinstance(command, ConvoyMoveCommand):
-        return _adjudicate_convoy_move(game_map, command_map, command)
-    elif isinstance(command, ConvoyTransportCommand):
-        return _adjudicate_convoy_transport(game_map, command_map, command)
-    elif isinstance(command, SupportCommand):
-        return _adjudicate_support(game_map, command_map, command)
-    else:
-        raise ValueError("Command unexpected type")
+    return (yield order)
 
 
-def _backup_rule(command_map, dependency_set):
-    global resolution_map
-    global state_map
-    for dependency_territory in dependency_set:
-        dependency = command_map.get_home_command(dependency_territory)
-        if isinstance(dependency, MoveCommand) and isinstance(command_map.get_home_command(dependency.destination),
-                                                              ConvoyTransportCommand):
-            _apply_szykman(command_map, dependency_set)
+def _adjudicate(context, order):
+    kind = context.command_map.kinds[order]
+    if kind is None:
+        raise ValueError("Command unexpected type")
+    if context.stats is not None:
+        context.stats.adjudications[kind] += 1
+    return (yield from _ADJUDICATORS[kind](context, order))
+
+
+def _backup_rule(context, dependency_set):
+    kinds = context.command_map.kinds
+    destinations = context.command_map.destinations
+    for dependency in dependency_set:
+        if kinds[dependency] == MOVE and kinds[destinations[dependency]] == CONVOY_TRANSPORT:
+            if context.stats is not None:
+                context.stats.record_paradox(context, dependency_set, szykman=True)
+            _apply_szykman(context, dependency_set)
             return
-    _apply_circular_movement(command_map, dependency_set)
+    if context.stats is not None:
+        context.stats.record_paradox(context, dependency_set, szykman=False)
+    _apply_circular_movement(context, dependency_set)
 
 
-def _apply_szykman(command_map, dependency_set):
-    for dependency_territory in dependency_set:
-        dependency = command_map.get_home_command(dependency_territory)
-        if isinstance(dependency, ConvoyMoveCommand) or isinstance(dependency, ConvoyTransportCommand):
-            resolution_map[dependency_territory] = False
-            state_map[dependency_territory] = ResolutionState.RESOLVED
+def _apply_szykman(context, dependency_set):
+    kinds = context.command_map.kinds
+    for dependency in dependency_set:
+        if kinds[dependency] == CONVOY_MOVE or kinds[dependency] == CONVOY_TRANSPORT:
+            context.resolutions[dependency] = False
+            context.states[dependency] = _RESOLVED
         else:
-            state_map[dependency_territory] = ResolutionState.UNRESOLVED
+            context.states[dependency] = _UNRESOLVED
 
 
-def _apply_circular_movement(command_map, dependency_set):
-    for dependency_territory in dependency_set:
-        dependency = command_map.get_home_command(dependency_territory)
-        if isinstance(dependency, MoveCommand) or isinstance(dependency, ConvoyMoveCommand):
-            resolution_map[dependency_territory] = True
-            state_map[dependency_territory] = ResolutionState.RESOLVED
+def _apply_circular_movement(context, dependency_set):
+    kinds = context.command_map.kinds
+    for dependency in dependency_set:
+        if kinds[dependency] == MOVE or kinds[dependency] == CONVOY_MOVE:
+            context.resolutions[dependency] = True
+            context.states[dependency] = _RESOLVED
         else:
-            state_map[dependency_territory] = ResolutionState.UNRESOLVED
+            context.states[dependency] = _UNRESOLVED
 
 
 # ----------------------
 # convoys
 # ----------------------
-def _adjudicate_convoy_move(game_map, command_map, command):
-    assert isinstance(command, ConvoyMoveCommand)
-    if not _has_path(game_map, command_map, command):
+def _adjudicate_convoy_move(context, order):
+    assert context.command_map.kinds[order] == CONVOY_MOVE
+    if not (yield from _has_path(context, order)):
         return False
-    return _adjudicate_move(game_map, command_map, command)
+    return (yield from _adjudicate_move(context, order))
 
 
-def _adjudicate_convoy_transport(game_map, command_map, command):
-    assert isinstance(command, ConvoyTransportCommand)
-    return not _is_dislodged(game_map, command_map, command.unit)
+def _adjudicate_convoy_transport(context, order):
+    assert context.command_map.kinds[order] == CONVOY_TRANSPORT
+    return not (yield from _is_dislodged(context, order))
 
 
-def _has_path(game_map, command_map, command):
-    assert isinstance(command, ConvoyMoveCommand)
+def _has_path(context, order):
+    """
+    Memoized like the strengths (see StrengthCache): a path found without
+    consulting any guessed convoy is final, otherwise it holds until the
+    generation changes.
+    """
+    entry = context.paths.get(order)
+    if entry is not None and (entry[1] is None or entry[1] == context.generation):
+        return entry[0]
+
+    if context.stats is not None:
+        context.stats.path_searches += 1
+    if context.budget is not None:
+        context.budget.charge(context)
+    dependency_list = context.dependency_list
+    settled = len(dependency_list) == 0
+    generation = context.generation
+    has_path = yield from _find_path(context, order)
+    if settled and len(dependency_list) == 0:
+        context.paths[order] = (has_path, None)
+    elif generation == context.generation:
+        context.paths[order] = (has_path, generation)
+    return has_path
+
+
+def _find_path(context, order):
+    compiled = context.game_map.compiled
+    command_map = context.command_map
+    assert command_map.kinds[order] == CONVOY_MOVE
+    possible_transports = command_map.transports.get((order, command_map.destinations[order]), [])
+    landings = compiled.coastal_seas[command_map.destinations[order]]
     visited = set()
-    source = command.unit.position
-    destination = command.destination
-    possible_transports = command_map.get_convoy_transports(source, destination)
-    possible_transport_territories = {transport.unit.position for transport in possible_transports}
-
-    starting_territory = game_map.name_map[source]
-    coastal_adjacencies = reduce(set.__or__, [game_map.adjacency[coast.name] for coast in starting_territory.coasts])
-    coastal_adjacencies = list(filter(lambda t: isinstance(game_map.name_map[t], SeaTerritory), coastal_adjacencies))
     to_visit = [
-        possible_transport_territory
-        for possible_transport_territory in possible_transport_territories
-        if any(possible_transport_territory in coastal_adjacency for coastal_adjacency in coastal_adjacencies)
+        possible_transport
+        for possible_transport in possible_transports
+        if possible_transport in compiled.coastal_seas[order]
     ]
 
     while len(to_visit) > 0:
         visiting = to_visit.pop()
         visited.add(visiting)
         # if the convoy was disrupted, we can't use it as part of our chain
-        if not _resolve(game_map, command_map, command_map.get_home_command(visiting)):
+        if not (yield visiting):
             continue
 
-        adjacent = [game_map.name_map[adj] for adj in game_map.adjacency[visiting]]
-
-        adjacent_land = {
-            coast.parent.name for coast in adjacent
-            if isinstance(coast, CoastTerritory)
-        }
-        if destination in adjacent_land:
+        if visiting in landings:
             return True
 
         to_visit = [
-                       territory.name for territory in adjacent
-                       if (territory.name not in visited and
-                           territory.name in possible_transport_territories)
+                       adjacent for adjacent in compiled.sea_adjacency[visiting]
+                       if (adjacent not in visited and
+                           adjacent in possible_transports)
                    ] + to_visit
 
     return False
@@ -257,229 +981,387 @@ def _has_path(game_map, command_map, command):
 # ----------------------
 # move
 # ----------------------
-def _adjudicate_move(game_map, command_map, command):
-    assert isinstance(command, MoveCommand) or isinstance(command, ConvoyMoveCommand)
+def _adjudicate_move(context, order):
+    command_map = context.command_map
+    assert command_map.kinds[order] == MOVE or command_map.kinds[order] == CONVOY_MOVE
+
+    # Strengths are only computed more than once when a guess forces moves to be re-adjudicated
+    if context.dependency_list:
+        attack, prevent, defend, hold = _CACHED_STRENGTHS
+    else:
+        attack, prevent, defend, hold = _STRENGTHS
 
-    attack_strength = _attack_strength(game_map, command_map, command)
+    attack_strength = yield from attack(context, order)
 
-    prevent_combatants = _get_prevent_combatants(command_map, command)
-    high_prevent_strength = max(
-        [_prevent_strength(game_map, command_map, prevent_combatant) for prevent_combatant in prevent_combatants] + [0])
+    high_prevent_strength = 0
+    for prevent_combatant in command_map.combatants[command_map.destinations[order]]:
+        if prevent_combatant == order:
+            continue
+        prevent_strength = yield from prevent(context, prevent_combatant)
+        if prevent_strength > high_prevent_strength:
+            high_prevent_strength = prevent_strength
     if attack_strength <= high_prevent_strength:
         return False
 
-    head_to_head_combatant = _get_head_to_head_combatant(game_map, command_map, command)
+    head_to_head_combatant = command_map.head_to_head[order]
     if head_to_head_combatant is not None:
-        return attack_strength > _defend_strength(game_map, command_map, head_to_head_combatant)
-    return attack_strength > _hold_strength(game_map, command_map, command.destination)
+        return attack_strength > (yield from defend(context, head_to_head_combatant))
+    return attack_strength > (yield from hold(context, command_map.destinations[order]))
 
 
-def _get_prevent_combatants(command_map, command):
-    direct_combatants = command_map.get_attackers(command.destination)
-    convoy_combatants = command_map.get_convoy_attackers(command.destination)
-    combatants = direct_combatants + convoy_combatants
-    combatants = filter(lambda c: c != command, combatants)
-    return combatants
+def _get_prevent_combatants(command_map, order):
+    return [combatant for combatant in command_map.combatants[command_map.destinations[order]] if combatant != order]
 
 
-def _get_head_to_head_combatant(game_map, command_map, command):
-    if isinstance(command, ConvoyMoveCommand):
-        return None
-    potential_attacker = command_map.get_home_command(command.destination)
-    if (potential_attacker is not None) and isinstance(potential_attacker, MoveCommand):
-        attacked_territory = game_map.name_map[potential_attacker.destination]
-        position_territory = game_map.name_map[command.unit.position]
-        if position_territory.same_territory(attacked_territory):
-            return potential_attacker
-    return None
+def _cached_attack_strength(context, order):
+    return (yield from _cached_strength(context, _ATTACK, order, _attack_strength))
+
+
+def _cached_prevent_strength(context, order):
+    return (yield from _cached_strength(context, _PREVENT, order, _prevent_strength))
+
 
+def _cached_defend_strength(context, order):
+    return (yield from _cached_strength(context, _DEFEND, order, _defend_strength))
 
-def _attack_strength(game_map, command_map, command):
-    if isinstance(command, ConvoyMoveCommand) and (not _has_path(game_map, command_map, command)):
+
+def _cached_hold_strength(context, province):
+    if context.command_map.kinds[province] is None:
+        return 0
+    return (yield from _cached_strength(context, _HOLD, province, _hold_strength))
+
+
+def _cached_strength(context, strength_type, province, compute):
+    cache = context.strength_cache
+    key = province * 4 + strength_type
+    strength = cache.get(key, context.generation)
+    if strength is not None:
+        return strength
+
+    dependency_list = context.dependency_list
+    settled = len(dependency_list) == 0
+    generation = context.generation
+    strength = yield from compute(context, province)
+    if settled and len(dependency_list) == 0:
+        # no guess was consulted, so the strength is final
+        cache.put(key, strength, None)
+    elif generation == context.generation:
+        # any guesses consulted are still in the dependency list, so a hit needs no further bookkeeping
+        cache.put(key, strength, generation)
+    return strength
+
+
+def _attack_strength(context, order):
+    command_map = context.command_map
+    kinds = command_map.kinds
+    if kinds[order] == CONVOY_MOVE and (not (yield from _has_path(context, order))):
         return 0
-    attacked_command = command_map.get_home_command(command.destination)
-    supporters = command_map.get_supports(command.unit.position, command.destination)
-    supporters = filter(lambda c: _resolve(game_map, command_map, c), supporters)
-
-    if attacked_command is None:
-        return 1 + len(list(supporters))
-    if (_get_head_to_head_combatant(game_map, command_map, command) is None) and \
-            (isinstance(attacked_command, MoveCommand) or isinstance(attacked_command, ConvoyMoveCommand)) and \
-            _resolve(game_map, command_map, attacked_command):
-        return 1 + len(list(supporters))
-    if attacked_command.player.name == command.player.name:
+    attacked_order = command_map.destinations[order]
+    supporters = command_map.supports.get((order, attacked_order), [])
+
+    if kinds[attacked_order] is None:
+        return 1 + (yield from _successful_count(context, supporters))
+    if (command_map.head_to_head[order] is None) and \
+            (kinds[attacked_order] == MOVE or kinds[attacked_order] == CONVOY_MOVE) and \
+            (yield attacked_order):
+        return 1 + (yield from _successful_count(context, supporters))
+    attacked_owner = command_map.owners[attacked_order]
+    if attacked_owner == command_map.owners[order]:
         return 0
-    supporters = filter(lambda c: c.player.name != attacked_command.player.name, supporters)
-    return 1 + len(list(supporters))
+    strength = 1
+    # support from the owner of the attacked unit can't be used to dislodge it
+    for owner, owner_supporters in command_map.owner_supports.get((order, attacked_order), _NO_SUPPORTS).items():
+        if owner != attacked_owner:
+            strength += yield from _successful_count(context, owner_supporters)
+    return strength
 
 
-def _prevent_strength(game_map, command_map, command):
-    if isinstance(command, ConvoyMoveCommand) and not _has_path(game_map, command_map, command):
+def _prevent_strength(context, order):
+    command_map = context.command_map
+    if command_map.kinds[order] == CONVOY_MOVE and not (yield from _has_path(context, order)):
         return 0
-    head_to_head_combatant = _get_head_to_head_combatant(game_map, command_map, command)
-    if head_to_head_combatant is not None and _resolve(game_map, command_map, head_to_head_combatant):
+    head_to_head_combatant = command_map.head_to_head[order]
+    if head_to_head_combatant is not None and (yield head_to_head_combatant):
         return 0
 
-    supporters = command_map.get_supports(command.unit.position, command.destination)
-    supporters = filter(lambda c: _resolve(game_map, command_map, c), supporters)
-    return 1 + len(list(supporters))
+    supporters = command_map.supports.get((order, command_map.destinations[order]), [])
+    return 1 + (yield from _successful_count(context, supporters))
 
 
-def _defend_strength(game_map, command_map, command):
-    supporters = command_map.get_supports(command.unit.position, command.destination)
-    supporters = filter(lambda c: _resolve(game_map, command_map, c), supporters)
-    return 1 + len(list(supporters))
+def _defend_strength(context, order):
+    command_map = context.command_map
+    supporters = command_map.supports.get((order, command_map.destinations[order]), [])
+    return 1 + (yield from _successful_count(context, supporters))
 
 
-def _hold_strength(game_map, command_map, territory):
-    home_command = command_map.get_home_command(territory)
-    if home_command is None:
+def _hold_strength(context, province):
+    kind = context.command_map.kinds[province]
+    if kind is None:
         return 0
-    if isinstance(home_command, MoveCommand) or isinstance(home_command, ConvoyMoveCommand):
-        return 0 if _resolve(game_map, command_map, home_command) else 1
-    supporters = command_map.get_supports(territory, territory)
-    supporters = filter(lambda c: _resolve(game_map, command_map, c), supporters)
-    return 1 + len(list(supporters))
+    if kind == MOVE or kind == CONVOY_MOVE:
+        return 0 if (yield province) else 1
+    supporters = context.command_map.supports.get((province, province), [])
+    return 1 + (yield from _successful_count(context, supporters))
+
+
+def _successful_count(context, orders):
+    count = 0
+    for order in orders:
+        if (yield order):
+            count += 1
+    return count
+
+
+_NO_SUPPORTS = dict()
+
+_STRENGTHS = (_attack_strength, _prevent_strength, _defend_strength, _hold_strength)
+_CACHED_STRENGTHS = (_cached_attack_strength, _cached_prevent_strength, _cached_defend_strength, _cached_hold_strength)
 
 
 # ----------------------
 # support
 # ----------------------
-def _adjudicate_support(game_map, command_map, command):
-    assert isinstance(command, SupportCommand)
-    if _invalid_support(command_map, command):
+def _adjudicate_support(context, order):
+    command_map = context.command_map
+    assert command_map.kinds[order] == SUPPORT
+    if _invalid_support(command_map, order):
         return False
-    if len(_indirect_non_convoy_attackers(command_map, command)) > 0:
+    if len(_indirect_non_convoy_attackers(command_map, order)) > 0:
         return False
-    for convoy_attacker in _indirect_convoy_attackers(command_map, command):
-        if _has_path(game_map, command_map, convoy_attacker):
+    for convoy_attacker in _indirect_convoy_attackers(command_map, order):
+        if (yield from _has_path(context, convoy_attacker)):
             return False
-    return not _is_dislodged(game_map, command_map, command.unit)
+    return not (yield from _is_dislodged(context, order))
+
 
+def _invalid_support(command_map, order):
+    supported_order = command_map.sources[order]
+    supported_kind = command_map.kinds[supported_order]
+    if supported_kind == MOVE or supported_kind == CONVOY_MOVE:
+        return command_map.destination_territories[supported_order] != command_map.destination_territories[order]
+    return command_map.destination_territories[order] != command_map.source_territories[order]
 
-def _invalid_support(command_map, command):
-    supported_command = command_map.get_home_command(command.supported_unit.position)
-    if isinstance(supported_command, MoveCommand) or isinstance(supported_command, ConvoyMoveCommand):
-        return supported_command.destination != command.destination
-    return command.destination != command.supported_unit.position
 
+def _indirect_non_convoy_attackers(command_map, order):
+    return _indirect_attackers(command_map, order, command_map.attackers[order])
 
-def _indirect_non_convoy_attackers(command_map, command):
-    filtered = command_map.get_attackers(command.unit.position)
-    filtered = filter(lambda c: c.unit.position != command.destination, filtered)
-    filtered = filter(lambda c: c.player != command.player, filtered)
-    return list(filtered)
 
+def _indirect_convoy_attackers(command_map, order):
+    return _indirect_attackers(command_map, order, command_map.convoy_attackers[order])
 
-def _indirect_convoy_attackers(command_map, command):
-    filtered = command_map.get_convoy_attackers(command.unit.position)
-    filtered = filter(lambda c: c.unit.position != command.destination, filtered)
-    filtered = filter(lambda c: c.player.name != command.player.name, filtered)
-    return list(filtered)
+
+def _indirect_attackers(command_map, order, attackers):
+    destination = command_map.destination_territories[order]
+    owner = command_map.owners[order]
+    return [
+        attacker for attacker in attackers
+        if command_map.positions[attacker] != destination and command_map.owners[attacker] != owner
+    ]
 
 
-def _is_dislodged(game_map, command_map, unit):
+def _is_dislodged(context, order):
     """
     Determines if the unit will be dislodged by a different move, assuming it stays in place.
     Please note that this function does not indicate whether the unit _will_ stay in place.
     """
-    return any((_resolve(game_map, command_map, attack) for attack in _attackers(game_map, command_map, unit)))
+    for attack in context.command_map.attackers[order]:
+        if (yield attack):
+            return True
+    return False
 
 
-def _attackers(game_map, command_map, unit):
-    filtered = command_map.get_attackers(unit.position)
-    filtered = filter(
-        lambda c: isinstance(c, MoveCommand) or isinstance(c, ConvoyMoveCommand),
-        filtered,
-    )
-    filtered = filter(
-        lambda c: game_map.name_map[c.destination].same_territory(game_map.name_map[unit.position]),
-        filtered,
+# indexed by command kind
+_ADJUDICATORS = (_adjudicate_move, _adjudicate_convoy_move, _adjudicate_convoy_transport, _adjudicate_support)
+
+
+# ----------------------
+# Outcomes
+# ----------------------
+class OrderOutcome:
+    """
+    What happened to a single order, as collected by resolve_turn. Everything
+    is derived from the final resolutions, so no order is adjudicated again.
+
+    territory -- String, name of the territory of the ordered unit
+    succeeded -- bool, whether the order succeeded. A hold succeeds if the unit isn't dislodged
+    strength -- int, attack strength of a move, or hold strength of the unit's province for any other order
+    cut_by -- String, territory of the unit whose attack cut a support, or None
+    dislodged_by -- String, territory the unit that dislodged the ordered unit moved from, or None
+    bounced_with -- String[], territories of the units a failed move bounced against: moves to the same
+                    province, and the unit holding or moving from its destination
+    """
+
+    __slots__ = ('territory', 'succeeded', 'strength', 'cut_by', 'dislodged_by', 'bounced_with')
+
+    def __init__(self, territory, succeeded, strength, cut_by=None, dislodged_by=None, bounced_with=()):
+        self.territory = territory
+        self.succeeded = succeeded
+        self.strength = strength
+        self.cut_by = cut_by
+        self.dislodged_by = dislodged_by
+        self.bounced_with = bounced_with
+
+    def __repr__(self):
+        return 'OrderOutcome({}, succeeded={}, strength={}, cut_by={}, dislodged_by={}, bounced_with={})'.format(
+            self.territory, self.succeeded, self.strength, self.cut_by, self.dislodged_by, self.bounced_with)
+
+
+def _order_outcome(context, order):
+    command_map = context.command_map
+    resolutions = context.resolutions
+    territory_names = context.game_map.compiled.territory_names
+    kind = command_map.kinds[order]
+    is_hold = kind == MOVE and command_map.destinations[order] == order
+    is_move = (kind == MOVE or kind == CONVOY_MOVE) and not is_hold
+    dislodger = None
+    if not (is_move and resolutions[order]):
+        dislodger = next((attacker for attacker in command_map.combatants[order] if resolutions[attacker]), None)
+
+    cutter = None
+    bounced_with = ()
+    if is_move:
+        strength = _run(context, _attack_strength(context, order))
+        succeeded = resolutions[order]
+        # a convoyed move without a path never reached its destination
+        if not succeeded and (kind == MOVE or _run(context, _has_path(context, order))):
+            bounced_with = _bounced_with(context, order, strength)
+    elif is_hold:
+        # supports of a hold are counted by its prevent strength (see HoldCommand)
+        strength = _run(context, _prevent_strength(context, order))
+        succeeded = dislodger is None
+    else:
+        strength = _run(context, _hold_strength(context, order))
+        succeeded = resolutions[order]
+        if kind == SUPPORT and not succeeded and not _invalid_support(command_map, order):
+            cutter = _support_cutter(context, order, dislodger)
+
+    return OrderOutcome(
+        territory_names[command_map.positions[order]],
+        succeeded,
+        strength,
+        None if cutter is None else territory_names[command_map.positions[cutter]],
+        None if dislodger is None else territory_names[command_map.positions[dislodger]],
+        tuple(territory_names[command_map.positions[combatant]] for combatant in bounced_with),
     )
 
-    return list(filtered)
+
+def _bounced_with(context, order, attack_strength):
+    """ Returns int[], the orders that a failed move with the given attack strength bounced against """
+    command_map = context.command_map
+    bounced_with = [
+        combatant for combatant in _get_prevent_combatants(command_map, order)
+        if _run(context, _prevent_strength(context, combatant)) >= attack_strength
+    ]
+    head_to_head_combatant = command_map.head_to_head[order]
+    destination = command_map.destinations[order]
+    if head_to_head_combatant is not None:
+        if _run(context, _defend_strength(context, head_to_head_combatant)) >= attack_strength:
+            bounced_with.append(head_to_head_combatant)
+    elif command_map.kinds[destination] is not None and destination not in bounced_with and \
+            _run(context, _hold_strength(context, destination)) >= attack_strength:
+        bounced_with.append(destination)
+    return bounced_with
+
+
+def _support_cutter(context, order, dislodger):
+    """ Returns the order whose attack cut a valid support that failed """
+    command_map = context.command_map
+    direct_attackers = _indirect_non_convoy_attackers(command_map, order)
+    if len(direct_attackers) > 0:
+        return direct_attackers[0]
+    for convoy_attacker in _indirect_convoy_attackers(command_map, order):
+        if _run(context, _has_path(context, convoy_attacker)):
+            return convoy_attacker
+    return dislodger
 
 
 # ----------------------
 # Retreats
 # ----------------------
-def compute_retreats(game_map, command_map, commands, resolutions):
+def compute_retreats(context):
+    command_map = context.command_map
+    resolutions = context.resolutions
+    territory_names = context.game_map.compiled.territory_names
     player_results = defaultdict(dict)
-    occupied_territories = _get_occupations(game_map, commands, resolutions)
+    blocked_territories, dislodgers = _retreat_facts(context.game_map.compiled, command_map, resolutions)
 
-    for command in commands:
-        current_position = command.unit.position
-        if resolutions[current_position]:
-            if isinstance(command, MoveCommand) or isinstance(command, ConvoyMoveCommand):
+    for order in command_map.orders:
+        command = command_map.commands[order]
+        kind = command_map.kinds[order]
+        if resolutions[order]:
+            if kind == MOVE or kind == CONVOY_MOVE:
                 moved_unit = Unit(command.unit.unit_type, command.destination)
                 player_results[command.player.name][moved_unit] = None
             else:
                 player_results[command.player.name][command.unit] = None
         else:
-            direct_attackers = list(filter(
-                lambda c: resolutions[c.unit.position],
-                command_map.get_attackers(current_position),
-            ))
-            convoy_attackers = list(filter(
-                lambda c: resolutions[c.unit.position],
-                command_map.get_convoy_attackers(current_position),
-            ))
-            attackers = direct_attackers + convoy_attackers
-            if len(attackers) == 0:
+            retreat_options = _retreat_options(context, order, blocked_territories, dislodgers)
+            if retreat_options is None:
                 player_results[command.player.name][command.unit] = None
             else:
-                retreat_options = game_map.adjacency[current_position]
-                retreat_options = filter(
-                    lambda t: t not in occupied_territories,
-                    retreat_options,
-                )
-                retreat_options = filter(
-                    lambda t: all(t not in _applicable_territories(game_map, attacker.unit.position)
-                                  for attacker in direct_attackers),
-                    retreat_options,
-                )
-                retreat_options = filter(
-                    lambda t: _hold_strength(game_map, command_map, t) == 0,
-                    retreat_options,
-                )
-                retreat_options = filter(
-                    lambda t: all(_prevent_strength(game_map, command_map, attacker) == 0
-                                  for attacker in command_map.get_attackers(t)),
-                    retreat_options,
-                )
-
-                player_results[command.player.name][command.unit] = set(retreat_options)
+                player_results[command.player.name][command.unit] = {
+                    territory_names[t] for t in retreat_options
+                }
 
     return player_results
 
 
-def _applicable_territories(game_map, territory_name):
-    territory = game_map.name_map[territory_name]
-    applicable = {territory_name}
-    if isinstance(territory, LandTerritory):
-        applicable |= {coast.name for coast in territory.coasts}
-    elif isinstance(territory, CoastTerritory):
-        applicable.add(territory.parent.name)
-        applicable |= {coast.name for coast in territory.parent.coasts}
-
-    return applicable
-
+def _retreat_facts(compiled, command_map, resolutions):
+    """
+    Returns (int, dict(int -> int)), what every retreat of the turn is
+    checked against: the bitset of territory ids no unit can retreat to, and
+    the successful move into each province, by which any unit that stayed
+    there was dislodged.
+
+    A unit can't retreat to a province that is occupied, or that was left
+    empty by a standoff. The latter are the destinations of the moves with a
+    non-zero prevent strength, i.e. all of them but those that lost a head to
+    head battle.
+    """
+    dislodgers = dict()
+    for order in command_map.orders:
+        kind = command_map.kinds[order]
+        if (kind == MOVE or kind == CONVOY_MOVE) and resolutions[order]:
+            dislodgers[command_map.destinations[order]] = order
+    if len(dislodgers) == 0:
+        return 0, dislodgers
+
+    blocked_territories = _get_occupations(compiled, command_map, resolutions)
+    province_bits = compiled.province_bits
+    head_to_head = command_map.head_to_head
+    for order in command_map.orders:
+        if command_map.kinds[order] == MOVE and (head_to_head[order] is None or not resolutions[head_to_head[order]]):
+            blocked_territories |= province_bits[command_map.destinations[order]]
+    return blocked_territories, dislodgers
+
+
+def _retreat_options(context, order, blocked_territories, dislodgers):
+    """
+    Returns int[], the territory ids the unit of an order that did not succeed
+    can retreat to, or None if it was not dislodged.
+    """
+    dislodger = dislodgers.get(order)
+    if dislodger is None:
+        return None
 
-def _get_occupations(game_map, commands, resolutions):
-    occupations = set()
-    for command in commands:
-        if isinstance(command, MoveCommand) or isinstance(command, ConvoyMoveCommand):
-            if resolutions[command.unit.position]:
-                occupations |= _applicable_territories(game_map, command.destination)
-            else:
-                occupations |= _applicable_territories(game_map, command.unit.position)
+    compiled = context.game_map.compiled
+    command_map = context.command_map
+    options = compiled.adjacency_bits[command_map.positions[order]] & ~blocked_territories
+    # a unit can't retreat to where it was attacked from, unless the attack was convoyed
+    if command_map.kinds[dislodger] == MOVE:
+        options &= ~compiled.province_bits[dislodger]
+    return ids_of(options)
+
+
+def _get_occupations(compiled, command_map, resolutions):
+    """ Returns int, the bitset of the territory ids in provinces holding a unit once the turn's moves are made """
+    province_bits = compiled.province_bits
+    occupations = 0
+    for order in command_map.orders:
+        kind = command_map.kinds[order]
+        if (kind == MOVE or kind == CONVOY_MOVE) and resolutions[order]:
+            occupations |= province_bits[command_map.destinations[order]]
         else:
-            occupations |= _applicable_territories(game_map, command.unit.position)
+            occupations |= province_bits[order]
 
     return occupations
-
-
-def _attacked_by_other_unit(command_map, command, territory):
-    attackers = command_map.get_attackers(territory) + command_map.get_convoy_attackers(territory)
-    attackers = filter(lambda c: c != command, attackers)
-    return len(list(attackers)) > 0
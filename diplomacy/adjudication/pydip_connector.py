@@ -1,12 +1,13 @@
 import copy
 
-from diplomacy.adjudication.pydip.map import Map, OwnershipMap, SupplyCenterMap
+from diplomacy.adjudication.pydip.map import FrozenSupplyCenterMap, OwnershipMap, shared_map
 from diplomacy.adjudication.pydip.player import Unit, UnitTypes
 from diplomacy.adjudication.pydip.test.command_helper import *
 
 
-def create_pydip_map(tiles):
-    """Create an ownership map for pydip to use"""
+def create_pydip_map(tiles, artifact_dir=None):
+    """Create an ownership map for pydip to use. The underlying map only depends on the tiles' layout, so it is
+    built once per layout and shared, optionally through an artifact file in artifact_dir"""
     territory_descriptors = []
     visited = set()
     adjacencies = []
@@ -43,8 +44,8 @@ def create_pydip_map(tiles):
                 home_territories[tile.home_center_for] = set()
             home_territories[tile.home_center_for].add(str(tile.id))
 
-    generate_map = Map(territory_descriptors, adjacencies)
-    generate_supply_center_map = SupplyCenterMap(generate_map, supply_centers)
+    generate_map = shared_map(territory_descriptors, adjacencies, artifact_dir)
+    generate_supply_center_map = FrozenSupplyCenterMap(generate_map, supply_centers)
 
     return OwnershipMap(generate_supply_center_map, owned_sc_territories, home_territories)
 
@@ -13,8 +13,8 @@
 #
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
-from collections import deque
 
+from diplomacy.adjudication.pydip.map import ReachMap
 from diplomacy.adjudication.pydip.test import PlayerHelper, TurnHelper
 from diplomacy.adjudication.pydip.test.adjustment_helper import AdjustmentHelper
 from diplomacy.adjudication.pydip.test.command_helper import AdjustmentCommandType
@@ -60,6 +60,7 @@ class Board:
         self.previous_orders = None
         self._previous_results = None
         self.orders = []
+        self._pydip_map = None
 
     @property
     def sc_counts(self):
@@ -185,6 +186,19 @@ class Board:
         out_dict['tiles'] = tile_dict
         return out_dict
 
+    def reachability(self, steps=2, convoys=False):
+        """For every tile and player, how many units of other players (threat) and of that player (defence) could
+        be on the tile's province within k moves, for k = 1..steps. A unit counts for the province it is on.
+        Returns {tile id: {player: (threat, defence)}}, threat and defence being lists indexed by k - 1"""
+        reach_map = ReachMap(self._pydip_game_map(), get_player_units(self.tiles), steps, convoys)
+        return {
+            tile_id: {
+                player: (reach_map.threat(player, str(tile_id)), reach_map.defence(player, str(tile_id)))
+                for player in self.players
+            }
+            for tile_id in self.tiles
+        }
+
     def resolve_orders(self):
         """Parse all orders and resolve the board accordingly. If no orders exist for a unit, it adds a hold order"""
         pydip_map = create_pydip_map(self.tiles)
@@ -290,22 +304,19 @@ class Board:
 
     def _distance_to_home_center(self, tile, player):
         """Finds the distance between the given tile and a home center for the given player"""
-        # Currently implemented using BFS
-        queue = deque()
-        visited = {tile: 0}
-        queue.append(tile)
-        while len(queue):
-            next_tile = queue.popleft()
-            if next_tile.home_center_for == player:
-                return visited[next_tile]
-            for equivalent_tile in next_tile.equivalencies:
-                if equivalent_tile not in visited:
-                    visited[equivalent_tile] = visited[next_tile]
-                    queue.append(equivalent_tile)
-            for adjacent_tile in next_tile.adjacencies:
-                if adjacent_tile not in visited:
-                    visited[adjacent_tile] = visited[next_tile] + 1
-                    queue.append(adjacent_tile)
+        # Looked up in the map's precomputed province distances, where any unit may cross any border
+        compiled_map = self._pydip_game_map().compiled
+        distances = compiled_map.province_distances[compiled_map.province_id(str(tile.id))]
+        home_distances = [distances[compiled_map.province_id(str(home_tile.id))]
+                          for home_tile in self.tiles.values() if home_tile.home_center_for == player]
+        home_distances = [distance for distance in home_distances if distance is not None]
+        return min(home_distances) if home_distances else None
+
+    def _pydip_game_map(self):
+        """The pydip Map of this board's tiles, which never change layout once the board is built"""
+        if self._pydip_map is None:
+            self._pydip_map = create_pydip_map(self.tiles).supply_map.game_map
+        return self._pydip_map
 
     def _increment_diplomacy(self):
         # TODO: Once everything is ready, see if you can make this able to be called safely (not private)